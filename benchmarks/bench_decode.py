@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Time the loading of a large member list in the calling process and with
+:class:`pynami.decode.ProcessDecoder` for several numbers of processes.
+With one process the decoder loads in the calling thread as well.
+
+Usage::
+
+    python benchmarks/bench_decode.py --rows 100000 --workers 1 2 4 8
+
+The rows are the synthetic search results of ``tests/synthetic.py``, so no
+|NAMI| access is needed.
+"""
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+
+from pynami.decode import ProcessDecoder  # noqa: E402
+from pynami.schemas.mgl import SearchMitgliedSchema  # noqa: E402
+from synthetic import search_rows  # noqa: E402
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--workers', type=int, nargs='*',
+                        default=sorted({1, 2, os.cpu_count() or 1}))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    data = search_rows(args.rows)
+    base = best_of(args.repeat, lambda: SearchMitgliedSchema().load(
+        [dict(x) for x in data], many=True))
+    print(f'{os.cpu_count()} CPUs, {args.rows} rows')
+    print(f'in-process     {base:8.3f} s')
+    for workers in args.workers:
+        with ProcessDecoder(max_workers=workers, threshold=0) as decoder:
+            decoder.load(SearchMitgliedSchema, data[:1000])  # start the pool
+            elapsed = best_of(args.repeat, lambda: decoder.load(
+                SearchMitgliedSchema, data))
+        print(f'{workers:2d} processes   {elapsed:8.3f} s  '
+              f'(x{base / elapsed:.2f})')
+
+
+if __name__ == '__main__':
+    main()
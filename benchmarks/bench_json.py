@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Time :func:`pynami.util.json_loads` and :func:`pynami.util.json_dumps` with
+the standard library and with every installed fast backend.
+
+Usage::
+
+    python benchmarks/bench_json.py --rows 10000
+
+The envelope holds the synthetic search results of ``tests/synthetic.py``,
+so no |NAMI| access is needed. Backends which are not installed are skipped.
+"""
+import os
+import sys
+import time
+import argparse
+import importlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, 'tests')]
+
+from pynami import util  # noqa: E402
+from synthetic import search_rows, envelope  # noqa: E402
+
+BACKENDS = ['json', 'orjson', 'ujson']
+
+
+def best_of(repeat, func):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def use_backend(name):
+    """Make :mod:`pynami.util` use only one backend"""
+    for backend in BACKENDS[1:]:
+        setattr(util, backend, None)
+    if name != 'json':
+        setattr(util, name, importlib.import_module(name))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    body = envelope(search_rows(args.rows))
+    data = util.json_loads(body)
+    print(f'{args.rows} rows, {len(body) / 1e6:.1f} MB')
+    base = None
+    for name in BACKENDS:
+        try:
+            use_backend(name)
+        except ImportError:
+            print(f'{name:8s} not installed')
+            continue
+        loads = best_of(args.repeat, lambda: util.json_loads(body))
+        dumps = best_of(args.repeat, lambda: util.json_dumps(data))
+        base = base or (loads, dumps)
+        print(f'{name:8s} loads {loads:7.3f} s (x{base[0] / loads:.2f})  '
+              f'dumps {dumps:7.3f} s (x{base[1] / dumps:.2f})')
+
+
+if __name__ == '__main__':
+    main()
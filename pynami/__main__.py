@@ -0,0 +1,8 @@
+"""
+Run the command line interface with ``python -m pynami``
+"""
+import sys
+
+from .cli import main
+
+sys.exit(main())
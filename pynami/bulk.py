@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for running many |NAMI| requests concurrently.
+
+The |NAMI| answers each request rather slowly, so operations on many objects
+(e.g. updating all members of a tier) are dominated by waiting. The functions
+in this module spread such operations over a thread pool while keeping the
+order of the input and collecting errors per item instead of aborting.
+"""
+import copy
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter for the number of requests per second
+
+    Args:
+        rate (:obj:`float`, optional): Maximum number of calls per second. If
+            this is :data:`None` or zero there is no limit.
+    """
+    def __init__(self, rate=None):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        """
+        Block until the next call is allowed.
+
+        Returns:
+            :data:`None`
+        """
+        if not self.rate:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + 1 / self.rate
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SingleFlight:
+    """
+    Coalesce identical calls which are running at the same time.
+
+    While a call for a key is in progress all other threads asking for the
+    same key wait for its outcome instead of doing the work again. Each
+    waiting thread receives a deep copy of the result, so callers may modify
+    what they get (e.g. through the :func:`~marshmallow.decorators.pre_load`
+    hooks of the schemas).
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Call ``func`` unless a call for ``key`` is already running.
+
+        Args:
+            key: Hashable identifier of the call
+            func (callable): Function without arguments
+
+        Raises:
+            Exception: Whatever ``func`` raised. All waiting threads receive
+                the same exception.
+
+        Returns:
+            The result of ``func``
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = func()
+        except Exception as ex:
+            call.error = ex
+        with self._lock:
+            del self._calls[key]
+            shared = call.waiters > 0
+        call.done.set()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result) if shared else call.result
+
+
+class _Call:
+    """State of a call inside of :class:`SingleFlight`"""
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class BulkResult:
+    """
+    Outcome of a single item of a bulk operation
+
+    Args:
+        item: The input item (e.g. a :class:`~.schemas.mgl.Mitglied`)
+        result: Whatever the operation returned for this item
+        error (Exception): The exception raised for this item, if any
+        diff (dict): Changes which were (or would have been) sent. See
+            :meth:`~.schemas.base.TrackedModel.diff`.
+        skipped (bool): If the item was not sent to the |NAMI| at all
+    """
+    def __init__(self, item, result=None, error=None, diff=None,
+                 skipped=False):
+        self.item = item
+        self.result = result
+        self.error = error
+        self.diff = diff
+        self.skipped = skipped
+
+    def __repr__(self):
+        if self.error is not None:
+            state = f'failed: {self.error!r}'
+        elif self.skipped:
+            state = 'skipped'
+        else:
+            state = 'ok'
+        return f'<BulkResult({self.item!r}, {state})>'
+
+    @property
+    def ok(self):
+        """bool: If no error occured for this item"""
+        return self.error is None
+
+
+class BulkReport(list):
+    """
+    List of :class:`BulkResult` in the same order as the input items
+    """
+    def __repr__(self):
+        return f'<BulkReport({len(self.succeeded)} ok, ' + \
+            f'{len(self.failed)} failed, {len(self.skipped)} skipped)>'
+
+    @property
+    def succeeded(self):
+        """:obj:`list` of :class:`BulkResult`: Items that were processed
+        without error (including skipped ones)"""
+        return [x for x in self if x.ok]
+
+    @property
+    def failed(self):
+        """:obj:`list` of :class:`BulkResult`: Items with an error"""
+        return [x for x in self if not x.ok]
+
+    @property
+    def skipped(self):
+        """:obj:`list` of :class:`BulkResult`: Items that were not sent"""
+        return [x for x in self if x.skipped]
+
+    @property
+    def results(self):
+        """:obj:`list`: Returned values of all items. Failed items are
+        represented by :data:`None`."""
+        return [x.result for x in self]
+
+
+def run_concurrently(func, items, max_workers=4, progress=None):
+    """
+    Call a function for each item within a thread pool.
+
+    Exceptions do not abort the whole operation. They are stored in the
+    corresponding :class:`BulkResult` instead.
+
+    Args:
+        func (callable): Function which takes one item as its only argument
+        items (iterable): The items to process
+        max_workers (:obj:`int`, optional): Number of threads. Defaults to 4.
+        progress (:obj:`callable`, optional): Called with the number of
+            finished items and the total number after each item
+
+    Returns:
+        BulkReport: One result per item in the order of ``items``
+    """
+    items = list(items)
+    report = BulkReport(BulkResult(item) for item in items)
+    if not items:
+        return report
+
+    lock = threading.Lock()
+    done = [0]
+
+    def call(entry):
+        try:
+            entry.result = func(entry.item)
+        except Exception as ex:
+            entry.error = ex
+        if progress is not None:
+            with lock:
+                done[0] += 1
+                progress(done[0], len(items))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers,
+                                                   len(items)))) as ex:
+        list(ex.map(call, report))
+    return report
@@ -0,0 +1,445 @@
+# -*- coding: utf-8 -*-
+"""
+Caches for data sets received from the |NAMI|.
+"""
+import os
+import copy
+import time
+import pickle
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+class MitgliedCache:
+    """
+    Bounded cache for :class:`~.schemas.mgl.Mitglied` objects
+
+    Entries are dropped when the cache is full (least recently used first) and
+    when they are older than ``ttl`` seconds. The age of an entry is reset if
+    :meth:`validate` confirms that its version is still up to date, which is
+    much cheaper than fetching each member again.
+
+    The cache is used by :meth:`~pynami.nami.NaMi.mitglied` if it is passed
+    to :class:`~pynami.nami.NaMi`. Updating a member through the |NAMI|
+    replaces the cached entry automatically.
+
+    Example:
+        .. code-block:: python
+            :caption: Keep members for ten minutes and validate them against
+                      the member list before a dashboard refresh
+
+            cache = MitgliedCache(ttl=600, filename='mitglieder.cache')
+            with NaMi(config, mgl_cache=cache) as nami:
+                nami.validate_mgl_cache()
+                mitglieder = [nami.mitglied(x) for x in ids]
+                print(cache.stats())
+                cache.save()
+
+    Args:
+        maxsize (:obj:`int`, optional): Maximum number of members. Defaults
+            to 1000.
+        ttl (:obj:`float`, optional): Maximum age of an entry in seconds.
+            Defaults to no limit.
+        filename (:obj:`str`, optional): File for persisting the cache with
+            :meth:`save`. If it exists it is loaded immediately.
+    """
+    def __init__(self, maxsize=1000, ttl=None, filename=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.filename = filename
+        self.hits = 0
+        """int: Number of successful lookups"""
+        self.misses = 0
+        """int: Number of failed lookups"""
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        if filename and os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                self._entries.update(pickle.load(f))
+
+    def __repr__(self):
+        return f'<MitgliedCache({len(self)} Mitglieder, ' + \
+            f'hit ratio {self.hit_ratio:.0%})>'
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, mglId):
+        """Member ids are given as :obj:`int` or :obj:`str`"""
+        return int(mglId)
+
+    def _expired(self, stored):
+        return self.ttl is not None and time.time() - stored > self.ttl
+
+    def get(self, mglId):
+        """
+        Look up a member
+
+        Args:
+            mglId (:obj:`int` or :obj:`str`): Member id (not |DPSG|
+                Mitgliedsnummer)
+
+        Returns:
+            :class:`~.schemas.mgl.Mitglied`: A copy of the cached member or
+            :data:`None`
+        """
+        key = self._key(mglId)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry[1])
+
+    def put(self, mitglied):
+        """
+        Store a member
+
+        Args:
+            mitglied (:class:`~.schemas.mgl.Mitglied`): The member as it was
+                received from the |NAMI|
+
+        Returns:
+            :data:`None`
+        """
+        key = self._key(mitglied.id)
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(mitglied))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, mglId=None):
+        """
+        Drop a member or the whole cache
+
+        Args:
+            mglId (:obj:`int` or :obj:`str`, optional): Member id (not |DPSG|
+                Mitgliedsnummer). If :data:`None` all entries are dropped.
+
+        Returns:
+            :data:`None`
+        """
+        with self._lock:
+            if mglId is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(mglId), None)
+
+    def validate(self, listing):
+        """
+        Compare the cached members with a member list.
+
+        Entries whose ``version`` or ``lastUpdated`` differ from the list are
+        dropped. Entries which match get their age reset.
+
+        Args:
+            listing (:obj:`list` of :class:`~.schemas.mgl.SearchMitglied`):
+                Search results, e.g. from
+                :meth:`~pynami.nami.NaMi.search_all`. Only the attributes
+                ``id``, ``version`` and ``lastUpdated`` are used.
+
+        Returns:
+            int: Number of dropped entries
+        """
+        dropped = 0
+        now = time.time()
+        with self._lock:
+            for item in listing:
+                key = self._key(item.id)
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                cached = entry[1]
+                updated = getattr(cached, 'lastUpdated', None)
+                if getattr(item, 'version', None) != cached.version or \
+                        getattr(item, 'lastUpdated', updated) != updated:
+                    del self._entries[key]
+                    dropped += 1
+                else:
+                    self._entries[key] = (now, cached)
+        return dropped
+
+    @property
+    def hit_ratio(self):
+        """float: Share of successful lookups"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """
+        Cache statistics
+
+        Returns:
+            dict: Number of ``entries``, ``hits``, ``misses`` and the
+            ``hit_ratio``
+        """
+        return {'entries': len(self), 'hits': self.hits,
+                'misses': self.misses, 'hit_ratio': self.hit_ratio}
+
+    def save(self, filename=None):
+        """
+        Write the cache to disk
+
+        Args:
+            filename (:obj:`str`, optional): Target file. Defaults to the file
+                given when creating the cache.
+
+        Returns:
+            :data:`None`
+        """
+        filename = filename or self.filename
+        with self._lock:
+            entries = dict(self._entries)
+        with open(filename, 'wb') as f:
+            pickle.dump(entries, f)
+
+
+class MemoryBackend:
+    """
+    Storage backend for :class:`HTTPCache` which keeps the entries in memory
+
+    When the backend is full the least recently used entry is dropped.
+
+    Args:
+        maxsize (:obj:`int`, optional): Maximum number of entries. Defaults
+            to 256.
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Args:
+            key (str): Cache key
+
+        Returns:
+            dict: The stored entry or :data:`None`
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        """
+        Args:
+            key (str): Cache key
+            entry (dict): Entry to store
+
+        Returns:
+            :data:`None`
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskBackend:
+    """
+    Storage backend for :class:`HTTPCache` which stores each entry as a
+    :mod:`pickle` file in a directory. This way the cache survives the end of
+    the program.
+
+    Args:
+        directory (str): Cache directory. It is created if necessary.
+    """
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        name = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, name + '.pickle')
+
+    def get(self, key):
+        """
+        Args:
+            key (str): Cache key
+
+        Returns:
+            dict: The stored entry or :data:`None`
+        """
+        try:
+            with open(self._path(key), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def set(self, key, entry):
+        """
+        Args:
+            key (str): Cache key
+            entry (dict): Entry to store
+
+        Returns:
+            :data:`None`
+        """
+        path = self._path(key)
+        tmppath = f'{path}.{threading.get_ident()}.part'
+        with open(tmppath, 'wb') as f:
+            pickle.dump(entry, f)
+        os.replace(tmppath, path)
+
+    def clear(self):
+        """Drop all entries"""
+        for name in os.listdir(self.directory):
+            if name.endswith('.pickle'):
+                os.remove(os.path.join(self.directory, name))
+
+
+STATIC_POLICIES = {'BAUSTEIN': 86400,
+                   'ALLE_TAETIGKEITEN': 86400,
+                   'UNTERGLIEDERUNG': 86400,
+                   'EBENE': 86400,
+                   'STAAT': 86400,
+                   'KONFESSION': 86400,
+                   'LAND': 86400,
+                   'REGION': 86400,
+                   'GESCHLECHT': 86400,
+                   'MGLTYPE': 86400,
+                   'ZAHLUNGSKONDITION': 86400,
+                   'STATUS_LIST': 86400}
+"""dict: Default freshness in seconds for :class:`~.constants.URLS` keys
+whose data almost never changes"""
+
+
+class HTTPCache:
+    """
+    Cache for the responses of |HTTP| GET requests to the |NAMI|
+
+    Only responses for :class:`~.constants.URLS` keys with a freshness
+    policy are stored, so member data or |PDF| files do not fill the cache
+    by default. A response is reused without asking the server as long as it
+    is younger than its policy. After that the request is sent with the
+    ``If-None-Match`` and ``If-Modified-Since`` headers if the server sent an
+    ``ETag`` or ``Last-Modified`` header before. If the server answers with
+    ``304 Not Modified`` the stored data is used. A policy of ``0`` therefore
+    means that the response is revalidated on every request.
+
+    Example:
+        .. code-block:: python
+            :caption: Keep all lookup tables on disk for a week
+
+            policies = {k: 7 * 86400 for k in STATIC_POLICIES}
+            cache = HTTPCache(DiskBackend('.nami-cache'), policies)
+            with NaMi(config, http_cache=cache) as nami:
+                print(nami.bausteine)
+                print(cache.stats())
+
+    Args:
+        backend (:obj:`optional`): Storage backend. Defaults to a new
+            :class:`MemoryBackend`.
+        policies (:obj:`dict`, optional): Freshness in seconds per
+            :class:`~.constants.URLS` key. Defaults to
+            :data:`STATIC_POLICIES`.
+    """
+    def __init__(self, backend=None, policies=None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.policies = dict(STATIC_POLICIES if policies is None else
+                             policies)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'revalidated': 0, 'misses': 0,
+                       'stores': 0}
+
+    def __repr__(self):
+        return f'<HTTPCache({self.stats()})>'
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def _lookup(self, key, urlkey):
+        """Stored entry (or :data:`None`) and if it is still fresh"""
+        entry = self.backend.get(key)
+        if entry is None:
+            return None, False
+        ttl = self.policies.get(urlkey)
+        return entry, ttl is not None and time.time() - entry['stored'] <= ttl
+
+    def _conditional_headers(self, entry):
+        """Headers for revalidating a stored entry"""
+        headers = {}
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def _store(self, key, urlkey, headers, data):
+        """Store a response if its |URL| key has a policy"""
+        if urlkey not in self.policies:
+            return
+        self._count('stores')
+        self.backend.set(key, {'stored': time.time(),
+                               'etag': headers.get('ETag'),
+                               'last_modified': headers.get('Last-Modified'),
+                               'data': copy.deepcopy(data)})
+
+    def fetch(self, key, send, check, urlkey=None):
+        """
+        Answer a request from the cache or send it
+
+        Args:
+            key (str): Cache key of the request, e.g. the full |URL|
+            send (callable): Sends the request. It takes a :obj:`dict` of
+                additional headers and returns a :class:`requests.Response`.
+            check (callable): Extracts the data from a response. See
+                :meth:`~pynami.nami.NaMi._check_response`.
+            urlkey (:obj:`str`, optional): :class:`~.constants.URLS` key of
+                the request. This selects the freshness policy.
+
+        Returns:
+            A copy of the stored or received data
+        """
+        entry, fresh = self._lookup(key, urlkey)
+        if fresh:
+            self._count('hits')
+            return copy.deepcopy(entry['data'])
+        response = send(self._conditional_headers(entry))
+        if response.status_code == 304 and entry is not None:
+            self._count('revalidated')
+            entry = dict(entry, stored=time.time())
+            self.backend.set(key, entry)
+            return copy.deepcopy(entry['data'])
+        # also stale entries which the server did not confirm
+        self._count('misses')
+        data = check(response)
+        self._store(key, urlkey, response.headers, data)
+        return data
+
+    def clear(self):
+        """Drop all stored responses"""
+        self.backend.clear()
+
+    def stats(self):
+        """
+        Cache statistics
+
+        Returns:
+            dict: Number of ``hits`` (fresh responses used without request),
+            ``revalidated`` (``304 Not Modified`` answers), ``misses``
+            (full responses, also for stale entries) and ``stores``
+        """
+        with self._lock:
+            return dict(self._stats)
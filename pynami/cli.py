@@ -0,0 +1,437 @@
+# -*- coding: utf-8 -*-
+"""
+Command line interface for exporting data from the |NAMI|.
+
+After installation the interface is available as ``pynami`` (or
+``python -m pynami``). The credentials are read from the section ``[nami]``
+of a configuration file (``~/.pynami.conf`` by default) or from the
+environment variables ``NAMI_USERNAME`` and ``NAMI_PASSWORD``.
+
+Example:
+    .. code-block:: bash
+
+        # All members of the group with all attributes as CSV
+        pynami member --all --workers 8 -o mitglieder.csv
+
+        # Active members with a few attributes as JSON lines on stdout
+        pynami search --filter mglStatusId=AKTIV \\
+            --fields id,vorname,nachname --format jsonl
+
+        # All invoices as PDF files
+        pynami invoices download rechnungen/
+
+The options ``--config``, ``--workers``, ``--rate-limit`` and ``--quiet``
+are accepted before and after the command. Output is written to stdout
+unless a file is given with ``-o``. The format
+is guessed from the file extension if ``--format`` is missing. Progress
+messages are written to stderr.
+"""
+import os
+import sys
+import csv
+import json
+import time
+import getpass
+import argparse
+from configparser import ConfigParser
+
+from .nami import NaMi, NamiHTTPError, NamiResponseSuccessError, \
+    NamiResponseTypeError
+from .bulk import run_concurrently
+from .export import LOOKUPS, plain, record
+from .util import json_dumps
+
+FORMATS = ('csv', 'jsonl', 'xlsx', 'parquet')
+""":obj:`tuple` of :obj:`str`: Supported output formats"""
+
+
+class Progress:
+    """
+    Progress messages on stderr
+
+    Messages are only shown if stderr is a terminal and at most ten times per
+    second.
+
+    Args:
+        label (str): Name of the running operation
+        enabled (:obj:`bool`, optional): Show messages at all. Defaults to
+            :data:`True`.
+    """
+    def __init__(self, label, enabled=True):
+        self.label = label
+        self.enabled = enabled and sys.stderr.isatty()
+        self._last = 0.0
+
+    def __call__(self, done, total=None):
+        now = time.monotonic()
+        if not self.enabled or (now - self._last < 0.1 and done != total):
+            return
+        self._last = now
+        total = f'/{total}' if total is not None else ''
+        sys.stderr.write(f'\r{self.label}: {done}{total}')
+        sys.stderr.flush()
+
+    def close(self):
+        """Finish the message line"""
+        if self.enabled and self._last:
+            sys.stderr.write('\n')
+
+
+def write_records(objs, fmt='csv', output=None, fields=None, progress=None):
+    """
+    Write data sets one by one in a tabular format
+
+    Args:
+        objs (iterable): Data sets, e.g. search results
+        fmt (:obj:`str`, optional): One of :data:`FORMATS`. Defaults to
+            ``'csv'``.
+        output (:obj:`str`, optional): Output file. Defaults to stdout.
+            ``xlsx`` and ``parquet`` need a file.
+        fields (:obj:`list` of :obj:`str`, optional): Columns. Defaults to
+            all attributes of the first data set.
+        progress (:obj:`callable`, optional): Called with the number of
+            written rows
+
+    Raises:
+        ValueError: For unknown formats or binary formats without output file
+        ImportError: For ``parquet`` if :mod:`pyarrow` is not installed
+
+    Returns:
+        int: Number of written rows
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown format: {fmt}')
+    if fmt in ('xlsx', 'parquet') and not output:
+        raise ValueError(f'Format {fmt} needs an output file')
+    rows = (record(x, fields, iso=fmt != 'xlsx') for x in objs)
+    count = 0
+
+    if fmt == 'parquet':
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as ex:
+            raise ImportError('The parquet format needs pyarrow. Install it '
+                              'with: pip install pynami[parquet]') from ex
+
+        rows = list(rows)
+        pyarrow.parquet.write_table(pyarrow.Table.from_pylist(rows), output)
+        return len(rows)
+
+    if fmt == 'xlsx':
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Data')
+        columns = None
+        for row in rows:
+            if columns is None:
+                columns = list(fields or row)
+                ws.append(columns)
+            ws.append([_cell(row.get(c)) for c in columns])
+            count += 1
+            if progress is not None:
+                progress(count)
+        wb.save(output)
+        return count
+
+    f = open(output, 'w', newline='', encoding='utf-8') if output else \
+        sys.stdout
+    try:
+        writer = None
+        for row in rows:
+            if fmt == 'jsonl':
+                f.write(json_dumps(row) + '\n')
+            else:
+                if writer is None:
+                    writer = csv.DictWriter(f, list(fields or row),
+                                            restval='', extrasaction='ignore')
+                    writer.writeheader()
+                writer.writerow({k: json_dumps(v) if isinstance(
+                    v, (list, dict)) else v for k, v in row.items()})
+            count += 1
+            if progress is not None:
+                progress(count)
+    finally:
+        if output:
+            f.close()
+    return count
+
+
+def _cell(value):
+    """Excel cells cannot hold lists or dictionaries"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, default=str)
+    return value
+
+
+def _guess_format(args):
+    if args.format:
+        return args.format
+    if args.output:
+        ext = os.path.splitext(args.output)[1].lstrip('.').lower()
+        if ext in FORMATS:
+            return ext
+    return 'csv'
+
+
+def _split(value):
+    return [x for x in value.split(',') if x] if value else None
+
+
+def _filters(values):
+    """Parse ``KEY=VALUE`` pairs. Values are |JSON| if possible."""
+    filters = {}
+    for item in values or []:
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f'Filter must be KEY=VALUE: {item}')
+        try:
+            filters[key] = json.loads(value)
+        except ValueError:
+            filters[key] = value
+    return filters
+
+
+def _export(objs, args, label):
+    progress = Progress(label, not args.quiet)
+    try:
+        count = write_records(objs, _guess_format(args), args.output,
+                              _split(args.fields), progress)
+    finally:
+        progress.close()
+    if not args.quiet:
+        print(f'{count} rows written', file=sys.stderr)
+
+
+def cmd_search(nami, args):
+    """Export search results"""
+    fields = _split(args.fields)
+    filters = _filters(args.filter)
+    if filters:
+        results = nami.search(lazy=True, fields=fields, **filters)
+    else:
+        results = nami.search_all(grpId=args.grpId, lazy=True, fields=fields)
+    _export(results, args, 'search')
+
+
+def cmd_member(nami, args):
+    """Export full member data sets which are fetched concurrently"""
+    ids = list(args.ids)
+    if args.all:
+        ids += nami.search_all(grpId=args.grpId, lazy=True).ids()
+    progress = Progress('member', not args.quiet)
+    try:
+        report = run_concurrently(
+            lambda x: nami.mitglied(x, grpId=args.grpId), ids, args.workers,
+            progress)
+    finally:
+        progress.close()
+    for entry in report.failed:
+        print(f'Mitglied {entry.item}: {entry.error}', file=sys.stderr)
+    _export((x.result for x in report.succeeded), args, 'write')
+    return 1 if report.failed else 0
+
+
+def cmd_history(nami, args):
+    """Export the revision history"""
+    _export(nami.history(fields=_split(args.fields)), args, 'history')
+
+
+def cmd_invoices(nami, args):
+    """List or download invoices"""
+    if args.action == 'list':
+        _export(nami.invoices(groupId=args.grpId,
+                              fields=_split(args.fields)), args, 'invoices')
+        return 0
+    invoices = nami.invoices(groupId=args.grpId)
+    report = nami.download_invoices(invoices, args.directory, args.workers,
+                                    args.overwrite)
+    for entry in report:
+        if entry.ok:
+            print(f"{entry.result['status']}: {entry.result['filename']}",
+                  file=sys.stderr)
+        else:
+            print(f'failed: {entry.item.reNr}: {entry.error}',
+                  file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def cmd_lookups(nami, args):
+    """Fetch lookup tables concurrently and export them"""
+    names = args.names or LOOKUPS
+    unknown = set(names) - set(LOOKUPS)
+    if unknown:
+        raise ValueError(f'Unknown lookup tables: {sorted(unknown)}')
+
+    def fetch(name):
+        value = getattr(nami, name)
+        return value(grpId=args.grpId) if callable(value) else value
+
+    report = run_concurrently(fetch, names, args.workers)
+    fmt = _guess_format(args)
+    for entry in report:
+        if not entry.ok:
+            print(f'{entry.item}: {entry.error}', file=sys.stderr)
+        elif args.directory:
+            os.makedirs(args.directory, exist_ok=True)
+            write_records(entry.result, fmt, os.path.join(
+                args.directory, f'{entry.item}.{fmt}'), _split(args.fields))
+        else:
+            write_records(entry.result, fmt, fields=_split(args.fields))
+    return 1 if report.failed else 0
+
+
+def cmd_serve(nami, args):
+    """Run the caching service of :mod:`pynami.server`"""
+    from .server import serve
+
+    serve(nami, args.host, args.port, args.ttl, args.refresh)
+
+
+def common_options(defaults=True):
+    """
+    Parser with the options which are accepted before and after a command
+
+    Args:
+        defaults (:obj:`bool`, optional): Set the default values. The parsers
+            of the commands must not have defaults because they would replace
+            the values given before the command.
+
+    Returns:
+        argparse.ArgumentParser
+    """
+    def default(value):
+        return value if defaults else argparse.SUPPRESS
+
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument('-c', '--config', default=default(os.environ.get(
+        'PYNAMI_CONFIG', os.path.expanduser('~/.pynami.conf'))),
+        help='configuration file with a [nami] section')
+    parser.add_argument('-w', '--workers', type=int, default=default(4),
+                        help='number of concurrent requests')
+    parser.add_argument('--rate-limit', type=float, default=default(None),
+                        help='maximum number of requests per second')
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        default=default(False), help='no progress messages')
+    return parser
+
+
+def build_parser():
+    """
+    Create the argument parser
+
+    Returns:
+        argparse.ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog='pynami', description='Export data from the DPSG NaMi',
+        parents=[common_options()])
+    common = common_options(defaults=False)
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    def exporting(p):
+        p.add_argument('-f', '--format', choices=FORMATS,
+                       help='output format (default: from file name or csv)')
+        p.add_argument('--fields', help='comma separated attribute names')
+        p.add_argument('-o', '--output', help='output file (default: stdout)')
+        p.add_argument('-g', '--grpId', help='group id')
+        return p
+
+    p = exporting(sub.add_parser('search', parents=[common],
+                                 help='export search results'))
+    p.add_argument('--filter', action='append', metavar='KEY=VALUE',
+                   help='search key, see SearchSchema (repeatable)')
+    p.set_defaults(func=cmd_search)
+
+    p = exporting(sub.add_parser('member', parents=[common],
+                                 help='export full member data'))
+    p.add_argument('ids', nargs='*', type=int, help='member ids')
+    p.add_argument('-a', '--all', action='store_true',
+                   help='all members of the group')
+    p.set_defaults(func=cmd_member)
+
+    p = exporting(sub.add_parser('history', parents=[common],
+                                 help='export the history'))
+    p.set_defaults(func=cmd_history)
+
+    p = sub.add_parser('invoices', parents=[common],
+                       help='list or download invoices')
+    inv = p.add_subparsers(dest='action', required=True)
+    exporting(inv.add_parser('list', parents=[common],
+                             help='export the invoice list'))
+    p = inv.add_parser('download', parents=[common],
+                       help='download all invoices as PDF')
+    p.add_argument('directory', help='target directory')
+    p.add_argument('-g', '--grpId', help='group id')
+    p.add_argument('--overwrite', action='store_true',
+                   help='download existing files again')
+    sub.choices['invoices'].set_defaults(func=cmd_invoices)
+
+    p = exporting(sub.add_parser('lookups', parents=[common],
+                                 help='export lookup tables'))
+    p.add_argument('names', nargs='*', help=f"any of {', '.join(LOOKUPS)}")
+    p.add_argument('-d', '--directory',
+                   help='write one file per table into this directory')
+    p.set_defaults(func=cmd_lookups)
+
+    p = sub.add_parser('serve', parents=[common],
+                       help='run a local caching service')
+    p.add_argument('--host', default='127.0.0.1', help='address to bind to')
+    p.add_argument('-p', '--port', type=int, default=8080, help='port')
+    p.add_argument('--ttl', type=float, default=300,
+                   help='maximum age of cached answers in seconds')
+    p.add_argument('--refresh', type=float,
+                   help='refresh cached answers older than this in seconds')
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def read_config(filename):
+    """
+    Read the credentials
+
+    Args:
+        filename (str): Configuration file with a ``[nami]`` section. It is
+            ignored if it does not exist.
+
+    Returns:
+        dict: Configuration for :class:`~pynami.nami.NaMi`
+    """
+    config = {}
+    if filename and os.path.exists(filename):
+        parser = ConfigParser()
+        parser.read(filename)
+        if parser.has_section('nami'):
+            config.update(parser['nami'])
+    for key in ('username', 'password'):
+        value = os.environ.get(f'NAMI_{key.upper()}')
+        if value:
+            config[key] = value
+    if 'username' not in config:
+        config['username'] = input('Mitgliedsnummer: ')
+    if 'password' not in config:
+        config['password'] = getpass.getpass('Passwort: ')
+    return config
+
+
+def main(argv=None):
+    """
+    Entry point of the ``pynami`` command
+
+    Args:
+        argv (:obj:`list` of :obj:`str`, optional): Command line arguments.
+            Defaults to :data:`sys.argv`.
+
+    Returns:
+        int: Exit code
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        with NaMi(read_config(args.config),
+                  rate_limit=args.rate_limit) as nami:
+            return args.func(nami, args) or 0
+    except (ValueError, OSError, ImportError, NamiHTTPError,
+            NamiResponseSuccessError, NamiResponseTypeError) as ex:
+        print(f'Error: {ex}', file=sys.stderr)
+        return 1
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Load large lists of data sets in several processes.
+
+Loading thousands of search results or history entries with :mod:`marshmallow`
+is CPU bound and holds the global interpreter lock, so threads do not help.
+A :class:`ProcessDecoder` splits such lists into chunks and loads them in a
+:class:`~concurrent.futures.ProcessPoolExecutor`. The created objects are
+sent back with :mod:`pickle` (see
+:meth:`~.schemas.base.BaseModel.__getstate__`).
+Small lists are loaded in the calling thread because starting the work in
+other processes would take longer than the work itself.
+
+Example:
+    .. code-block:: python
+        :caption: Load a large member list on all cores
+
+        with ProcessDecoder(threshold=2000) as decoder:
+            with NaMi(config, decoder=decoder) as nami:
+                mitglieder = nami.search_all()
+"""
+import threading
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+def _load_chunk(schema_cls, attrs, rows):
+    """Worker function. Only the schema class is sent to the processes."""
+    return schema_cls.projected(attrs).load(rows, many=True)
+
+
+class ProcessDecoder:
+    """
+    Load lists of data sets in worker processes
+
+    Args:
+        max_workers (:obj:`int`, optional): Number of processes. Defaults to
+            the number of processors.
+        threshold (:obj:`int`, optional): Lists with fewer entries are loaded
+            in the calling thread. Defaults to 5000.
+        chunksize (:obj:`int`, optional): Number of entries per chunk.
+            Defaults to 1000.
+    """
+    def __init__(self, max_workers=None, threshold=5000, chunksize=1000):
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self.chunksize = chunksize
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __repr__(self):
+        return f'<ProcessDecoder(max_workers={self.max_workers}, ' + \
+            f'threshold={self.threshold})>'
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            return self._executor
+
+    def load(self, schema_cls, data, fields=None):
+        """
+        Load a list of data sets
+
+        Args:
+            schema_cls (type): Subclass of :class:`~.schemas.base.BaseSchema`
+            data (list): Raw data sets as received from the |NAMI|
+            fields (:obj:`list` of :obj:`str`, optional): Only load these
+                attributes. See :meth:`~.schemas.base.BaseSchema.projected`.
+
+        Returns:
+            list: The loaded objects in the order of ``data``
+        """
+        if self.max_workers == 1 or len(data) < self.threshold:
+            return schema_cls.projected(fields).load(data, many=True)
+        attrs = tuple(sorted(fields)) if fields else None
+        chunks = [data[i:i + self.chunksize]
+                  for i in range(0, len(data), self.chunksize)]
+        try:
+            parts = list(self._pool().map(
+                partial(_load_chunk, schema_cls, attrs), chunks))
+        except BrokenProcessPool:
+            self.close()
+            return schema_cls.projected(fields).load(data, many=True)
+        return [obj for part in parts for obj in part]
+
+    def close(self):
+        """
+        Stop the worker processes. They are started again when needed.
+
+        Returns:
+            :data:`None`
+        """
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
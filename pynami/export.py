@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Conversion of data sets to builtin types for exporting.
+
+These helpers are shared by the command line interface (:mod:`.cli`) and the
+local service (:mod:`.server`).
+"""
+import datetime
+from enum import Enum
+
+from .schemas.base import BaseModel
+
+LOOKUPS = ('countries', 'regionen', 'zahlungskonditionen',
+           'beitragsarten_mgl', 'beitragsarten', 'geschlechter', 'staaten',
+           'konfessionen', 'mgltypes', 'status_list', 'tagList',
+           'bausteine', 'subdivision', 'activities', 'ebenen', 'ebene1',
+           'gruppierungen')
+""":obj:`tuple` of :obj:`str`: Lookup tables of :class:`~pynami.nami.NaMi`
+which can be exported by the command line interface and the
+:mod:`~pynami.server`"""
+
+
+def plain(value, iso=True):
+    """
+    Convert a value to builtin types for exporting
+
+    Args:
+        value: Attribute value of a data set
+        iso (:obj:`bool`, optional): Convert dates to ISO 8601 strings.
+            Defaults to :data:`True`.
+
+    Returns:
+        The converted value
+    """
+    if isinstance(value, BaseModel):
+        return record(value, iso=iso)
+    if isinstance(value, (list, tuple)):
+        return [plain(x, iso) for x in value]
+    if isinstance(value, dict):
+        return {k: plain(v, iso) for k, v in value.items()}
+    if isinstance(value, Enum):
+        return value.value
+    if iso and isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def record(obj, fields=None, iso=True):
+    """
+    Convert a data set to a flat :obj:`dict`
+
+    Args:
+        obj (:class:`~.schemas.base.BaseModel`): The data set
+        fields (:obj:`list` of :obj:`str`, optional): Attribute names.
+            Defaults to all attributes.
+        iso (:obj:`bool`, optional): See :func:`plain`
+
+    Returns:
+        dict
+    """
+    if fields:
+        return {f: plain(getattr(obj, f, None), iso) for f in fields}
+    return {k: plain(v, iso) for k, v in vars(obj).items()
+            if not k.startswith('_')}
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+In-memory tree of the |DPSG| organisational structure (Diözese, Bezirk,
+Stamm).
+
+The tree is built by :meth:`~pynami.nami.NaMi.hierarchy` and can be stored on
+disk with the :mod:`pickle` module to avoid crawling the |NAMI| at every
+startup.
+"""
+import pickle
+
+
+class HierarchyNode:
+    """
+    A single group in the organisational tree
+
+    Args:
+        item (:class:`~.schemas.default.Baseadmin`): The group as returned by
+            :attr:`~pynami.nami.NaMi.ebene1`, :meth:`~pynami.nami.NaMi.ebene2`
+            or :meth:`~pynami.nami.NaMi.ebene3`
+        level (int): Structural level. 1 is a Diözese, 2 a Bezirk and 3 a
+            Stamm.
+        parent (:obj:`HierarchyNode`, optional): Next higher group
+    """
+    def __init__(self, item, level, parent=None):
+        self.id = item.id
+        """int: Group id"""
+        self.descriptor = item.descriptor
+        """str: Group name including its id"""
+        self.level = level
+        """int: Structural level"""
+        self.parent = parent
+        """HierarchyNode: Next higher group. :data:`None` for a Diözese."""
+        self.children = []
+        """:obj:`list` of :class:`HierarchyNode`: Next lower groups"""
+
+    def __repr__(self):
+        return f'<HierarchyNode({self.descriptor}, Ebene {self.level})>'
+
+    def __str__(self):
+        return f'{self.descriptor}'
+
+    @property
+    def path(self):
+        """:obj:`list` of :class:`HierarchyNode`: All groups from the Diözese
+        down to this one"""
+        node, path = self, []
+        while node is not None:
+            path.insert(0, node)
+            node = node.parent
+        return path
+
+    def walk(self):
+        """
+        Iterate over this group and all groups below it (depth first).
+
+        Yields:
+            HierarchyNode
+        """
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+
+class Hierarchy:
+    """
+    Tree of all groups which are visible for the user
+
+    Args:
+        roots (:obj:`list` of :class:`HierarchyNode`): All Diözesen
+    """
+    def __init__(self, roots):
+        self.roots = roots
+        """:obj:`list` of :class:`HierarchyNode`: All Diözesen"""
+        self._by_id = {}
+        self._by_name = {}
+        for node in self.walk():
+            self._by_id[node.id] = node
+            self._by_name.setdefault(node.descriptor.lower(), []).append(node)
+
+    def __repr__(self):
+        return f'<Hierarchy({len(self)} Gruppierungen)>'
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __contains__(self, grpId):
+        return self._by_key(grpId) in self._by_id
+
+    def __getitem__(self, grpId):
+        return self._by_id[self._by_key(grpId)]
+
+    def _by_key(self, grpId):
+        """Group ids are given as :obj:`int` or :obj:`str`"""
+        try:
+            return int(grpId)
+        except (TypeError, ValueError):
+            return grpId
+
+    def walk(self):
+        """
+        Iterate over all groups (depth first).
+
+        Yields:
+            HierarchyNode
+        """
+        for root in self.roots:
+            yield from root.walk()
+
+    def level(self, level):
+        """
+        All groups of a structural level
+
+        Args:
+            level (int): 1 for Diözesen, 2 for Bezirke and 3 for Stämme
+
+        Returns:
+            :obj:`list` of :class:`HierarchyNode`
+        """
+        return [x for x in self.walk() if x.level == level]
+
+    def get(self, grpId, default=None):
+        """
+        Look up a group by its id
+
+        Args:
+            grpId (:obj:`int` or :obj:`str`): Group id
+            default: Returned if there is no such group
+
+        Returns:
+            HierarchyNode
+        """
+        return self._by_id.get(self._by_key(grpId), default)
+
+    def parent(self, grpId):
+        """
+        Next higher group
+
+        Args:
+            grpId (:obj:`int` or :obj:`str`): Group id
+
+        Returns:
+            HierarchyNode: :data:`None` for a Diözese
+        """
+        return self[grpId].parent
+
+    def children(self, grpId):
+        """
+        Next lower groups
+
+        Args:
+            grpId (:obj:`int` or :obj:`str`): Group id
+
+        Returns:
+            :obj:`list` of :class:`HierarchyNode`
+        """
+        return self[grpId].children
+
+    def find(self, name):
+        """
+        Search groups by name
+
+        An exact (case insensitive) match of the descriptor is preferred.
+        Otherwise all groups containing ``name`` are returned.
+
+        Args:
+            name (str): (Part of) the group name
+
+        Returns:
+            :obj:`list` of :class:`HierarchyNode`
+        """
+        name = name.lower()
+        if name in self._by_name:
+            return list(self._by_name[name])
+        return [node for key, nodes in self._by_name.items() if name in key
+                for node in nodes]
+
+    def save(self, filename):
+        """
+        Store the tree on disk
+
+        Args:
+            filename (str): Path of the cache file
+
+        Returns:
+            :data:`None`
+        """
+        with open(filename, 'wb') as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load a tree which was saved with :meth:`save`
+
+        Args:
+            filename (str): Path of the cache file
+
+        Returns:
+            Hierarchy
+        """
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
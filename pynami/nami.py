@@ -4,8 +4,13 @@ NAMI library in python
 This module contains the main class :class:`NaMi` and a few simple exception
 definitions.
 """
+import os
+import copy
 import json
+import time
+import threading
 import requests
+from collections import OrderedDict
 
 from .constants import URLS, DEFAULT_PARAMS
 from .schemas.activity import SearchActivitySchema, ActivitySchema
@@ -16,10 +21,20 @@ from .schemas.grpadmin import SearchInvoiceSchema, InvoiceSchema
 from .schemas.history import HistoryEntrySchema, MitgliedHistorySchema
 from .schemas.mgl import SearchMitgliedSchema, MitgliedSchema
 from .schemas.search import SearchSchema
+from .schemas.base import LazyList
 from .schemas.training import SearchAusbildungSchema, AusbildungSchema
 from .schemas.tags import TagSchema, SearchTagSchema
-from .util import open_download_pdf
-from .tools import tabulate2x
+from .util import open_download_pdf, safe_filename, save_stream, \
+    json_loads, json_dumps, iter_envelope
+from .bulk import RateLimiter, BulkResult, BulkReport, run_concurrently, \
+    SingleFlight
+from .hierarchy import Hierarchy, HierarchyNode
+from .profile import Profile, DETAIL_PARTS, check_include
+from .stufenwechsel import ALTERSGRENZEN, plan_stufenwechsel
+from .statistics import STAT_FIELDS, GroupStatistics
+from .timeline import ActivityTimeline
+from .reports import LEITER_TAETIGKEITEN, GUELTIGKEIT, AusbildungsMatrix, \
+    fz_report
 
 
 class NamiResponseTypeError(Exception):
@@ -43,6 +58,32 @@ class NamiHTTPError(Exception):
     pass
 
 
+class NamiVersionError(Exception):
+    """
+    Raised when the |NAMI| did not increase the version number of an updated
+    data set.
+    """
+    pass
+
+
+class NamiSession(requests.Session):
+    """
+    :class:`requests.Session` which waits for a :class:`~.bulk.RateLimiter`
+    before each request.
+
+    Args:
+        rate_limit (:obj:`float`, optional): Maximum number of requests per
+            second. Defaults to no limit.
+    """
+    def __init__(self, rate_limit=None):
+        super().__init__()
+        self.limiter = RateLimiter(rate_limit)
+
+    def request(self, *args, **kwargs):
+        self.limiter.wait()
+        return super().request(*args, **kwargs)
+
+
 class NaMi(object):
     """
     Main class for communication with the |DPSG| |NAMI|
@@ -60,9 +101,38 @@ class NaMi(object):
 
     Args:
         config (:obj:`dict`, optional): Authorization configuration
+        rate_limit (:obj:`float`, optional): Maximum number of requests per
+            second. This is shared by all threads using this instance, e.g.
+            in :meth:`update_many`. Defaults to no limit.
+        mgl_cache (:class:`~.cache.MitgliedCache`, optional): Cache for
+            :meth:`mitglied`. Defaults to no caching.
+        http_cache (:class:`~.cache.HTTPCache`, optional): Cache for the
+            responses of GET requests. Defaults to no caching.
+        adapter (:class:`requests.adapters.BaseAdapter`, optional): Transport
+            adapter for all requests, e.g. a
+            :class:`~.transport.RecordingAdapter` or
+            :class:`~.transport.ReplayAdapter`
+        decoder (:class:`~.decode.ProcessDecoder`, optional): Loads large
+            lists (e.g. from :meth:`search_all`) in several processes.
+            Defaults to loading in the calling thread.
     """
-    def __init__(self, config={}, **kwargs):
-        self.s = requests.Session()
+    MAX_REPORTS = 16
+    """int: Number of reports kept by :meth:`fz_status`"""
+
+    def __init__(self, config={}, rate_limit=None, mgl_cache=None,
+                 http_cache=None, adapter=None, decoder=None, **kwargs):
+        self.s = NamiSession(rate_limit)
+        if adapter is not None:
+            self.s.mount('https://', adapter)
+        self.decoder = decoder
+        """:class:`~.decode.ProcessDecoder`: Loader for large lists"""
+        self._inflight = SingleFlight()
+        self._reports = OrderedDict()
+        self._reports_lock = threading.Lock()
+        self.mgl_cache = mgl_cache
+        """:class:`~.cache.MitgliedCache`: Cache for :meth:`mitglied`"""
+        self.http_cache = http_cache
+        """:class:`~.cache.HTTPCache`: Cache for GET responses"""
         self.__config = config
         """dict: Contains authorization information and after that a few ids"""
         self.__config.update(kwargs)
@@ -81,7 +151,19 @@ class NaMi(object):
                                 f'{response.status_code}')
         if response.headers['Content-Type'] == 'application/pdf':
             return response.content
-        rjson = response.json()
+        return self._check_envelope(json_loads(response.content))
+
+    def _check_envelope(self, rjson):
+        """
+        Check the decoded |JSON| envelope of a |NAMI| response.
+
+        Raises:
+            NamiResponseSuccessError: When the |NAMI| returns an error
+            NamiResponseTypeError: For unexpected response types
+
+        Returns:
+            The ``data`` part of the response
+        """
         if not rjson['success']:
             raise NamiResponseSuccessError(f"success state from NAMI was "
                                            f"{rjson['message']} {rjson}")
@@ -92,6 +174,139 @@ class NaMi(object):
                                         f"{rjson['message']}")
         return rjson['data']
 
+    def _get(self, url, params=None, urlkey=None):
+        """
+        Send a |HTTP| GET request and return the checked response data.
+
+        Identical requests that are sent at the same time from different
+        threads are coalesced into a single request (see
+        :class:`~.bulk.SingleFlight`). Every caller receives its own copy of
+        the data. If there is a :attr:`http_cache` it is asked first.
+
+        Args:
+            url (str): Request |URL|
+            params (:obj:`dict`, optional): Request parameters
+            urlkey (:obj:`str`, optional): :class:`~.constants.URLS` key of
+                the request for the freshness policy of the :attr:`http_cache`
+
+        Returns:
+            The ``data`` part of the response. See :meth:`_check_response`.
+        """
+        key = (url, tuple(sorted((k, f'{v}') for k, v in
+                                 (params or {}).items())))
+
+        def fetch():
+            if self.http_cache is None:
+                return self._check_response(self.s.get(url, params=params))
+            return self.http_cache.fetch(
+                f'{url}?{key[1]}',
+                lambda headers: self.s.get(url, params=params,
+                                           headers=headers),
+                self._check_response, urlkey)
+
+        return self._inflight.do(key, fetch)
+
+    def _iter_get(self, url, params=None):
+        """
+        Send a |HTTP| GET request and yield the entries of the ``data`` list
+        while the response is still being received.
+
+        Neither the whole response body nor the whole decoded list is kept in
+        memory (see :func:`~pynami.util.iter_envelope`). Entries are only
+        yielded after a positive ``success`` flag. The response type follows
+        the data in the |NAMI| responses, so an error response type is
+        raised after the last entry. These requests bypass
+        the :attr:`http_cache` and are not coalesced.
+
+        Args:
+            url (str): Request |URL|
+            params (:obj:`dict`, optional): Request parameters
+
+        Raises:
+            NamiHTTPError: When |HTTP| communication failes
+            NamiResponseSuccessError: When the |NAMI| returns an error
+            NamiResponseTypeError: For unexpected response types
+
+        Yields:
+            dict: The raw data sets
+        """
+        with self.s.get(url, params=params, stream=True) as r:
+            if r.status_code != requests.codes.ok:
+                raise NamiHTTPError(f'HTTP Error. Status Code: '
+                                    f'{r.status_code}')
+            envelope = {'success': False, 'message': None,
+                        'responseType': None, 'data': None}
+            pending = []
+            # iter_content also works if a transport adapter has already
+            # read the body (see :mod:`.transport`)
+            for event, key, value in iter_envelope(r.iter_content(65536)):
+                if event == 'member':
+                    envelope[key] = value
+                    if key == 'success' and value:
+                        yield from pending
+                        pending = []
+                elif envelope['success']:
+                    yield value
+                else:
+                    pending.append(value)
+            self._check_envelope(envelope)
+            yield from pending
+
+    def _iter_load(self, schema_cls, url, params=None, fields=None):
+        """
+        Load the data sets of a streamed response one by one
+
+        Args:
+            schema_cls (type): Subclass of :class:`~.schemas.base.BaseSchema`
+            url (str): Request |URL|
+            params (:obj:`dict`, optional): Request parameters
+            fields (:obj:`list` of :obj:`str`, optional): See
+                :meth:`~.schemas.base.BaseSchema.projected`
+
+        Yields:
+            The loaded objects
+        """
+        schema = schema_cls.projected(fields)
+        for row in self._iter_get(url, params):
+            yield schema.load(row)
+
+    def _load_many(self, schema_cls, data, fields=None):
+        """
+        Load a list of data sets, in several processes if there is a
+        :attr:`decoder`.
+
+        Args:
+            schema_cls (type): Subclass of :class:`~.schemas.base.BaseSchema`
+            data (list): Raw data sets
+            fields (:obj:`list` of :obj:`str`, optional): See
+                :meth:`~.schemas.base.BaseSchema.projected`
+
+        Returns:
+            list: The loaded objects
+        """
+        if self.decoder is not None:
+            return self.decoder.load(schema_cls, data, fields)
+        return schema_cls.projected(fields).load(data, many=True)
+
+    def _encode_json(self, kwargs):
+        """
+        Replace a ``json`` keyword argument for :mod:`requests` with the
+        already encoded body so that the fast |JSON| backend of
+        :func:`~pynami.util.json_dumps` is used.
+
+        Args:
+            kwargs (dict): Keyword arguments of a request. They are modified
+                in place.
+
+        Returns:
+            dict: The updated keyword arguments
+        """
+        if kwargs.get('json') is not None:
+            kwargs['data'] = json_dumps(kwargs.pop('json')).encode('utf-8')
+            headers = dict(kwargs.get('headers') or {})
+            headers.setdefault('Content-Type', 'application/json')
+            kwargs['headers'] = headers
+        return kwargs
 
     def auth(self, username=None, password=None):
         """
@@ -193,13 +408,14 @@ class NaMi(object):
                   'start': 0,
                   'limit': 1000}
         params.update(kwargs)
-        r = self.s.get(url, params=params)
-        return BaseadminSchema().load(self._check_response(r), many=True)
+        data = self._get(url, params=params, urlkey=key.upper())
+        return BaseadminSchema().load(data, many=True)
 
     @property
     def grpId(self):
         """
-        Group id of the user
+        Group id of the user. This is the default group of all requests. It
+        can be changed to work with another group the user has access to.
 
         Returns:
             int
@@ -207,6 +423,10 @@ class NaMi(object):
         """
         return self.__config['stammesnummer']
 
+    @grpId.setter
+    def grpId(self, value):
+        self.__config['stammesnummer'] = value
+
     @property
     def myId(self):
         """
@@ -413,42 +633,58 @@ class NaMi(object):
         attribute.
         """
         url = URLS['STATS']
-        r = self.s.get(url)
-        return StatsSchema().load(self._check_response(r))
+        data = self._get(url)
+        return StatsSchema().load(data)
 
-    def notifications(self, sortproperty=None, sortdirection='ASC', **kwargs):
+    def notifications(self, sortproperty=None, sortdirection='ASC',
+                      fields=None, **kwargs):
         """
         Dashboard function
 
+        Args:
+            fields (:obj:`list` of :obj:`str`, optional): Only load these
+                attributes of the results. All other fields are skipped which
+                saves time and memory. Defaults to all attributes.
+
         Returns:
             :obj:`list` of :class:`~.schemas.dashboard.Notification`: All
             current notifications (like tier changes of members). In the |NAMI|
             these are displayed in the dashboard.
         """
         url = URLS['NOTIFICATIONS']
-        params = DEFAULT_PARAMS
+        params = dict(DEFAULT_PARAMS)
         if sortproperty:
             params['sort'] = json.dumps([{'property': sortproperty,
                                           'direction': sortdirection}],
                                         separators=(',', ':'))
         params.update(kwargs)
-        r = self.s.get(url, params=params)
-        return NotificationSchema().load(self._check_response(r), many=True)
+        data = self._get(url, params=params)
+        return self._load_many(NotificationSchema, data, fields)
 
-    def history(self, **kwargs):
+    def history(self, fields=None, stream=False, **kwargs):
         """
         Dashboard function
 
+        Args:
+            fields (:obj:`list` of :obj:`str`, optional): Only load these
+                attributes of the results. All other fields are skipped which
+                saves time and memory. Defaults to all attributes.
+            stream (:obj:`bool`, optional): Return a generator which loads
+                the results while the response is still being received. See
+                :meth:`_iter_get`. Defaults to :data:`False`.
+
         Returns:
             :obj:`list` of :class:`~.schemas.history.HistoryEntry`: Last
             editing events like updating and creating members.In the |NAMI|
             these are displayed in the dashboard.
         """
         url = URLS['HISTORY']
-        params = DEFAULT_PARAMS
+        params = dict(DEFAULT_PARAMS)
         params.update(kwargs)
-        r = self.s.get(url, params=params)
-        return HistoryEntrySchema().load(self._check_response(r), many=True)
+        if stream:
+            return self._iter_load(HistoryEntrySchema, url, params, fields)
+        data = self._get(url, params=params)
+        return self._load_many(HistoryEntrySchema, data, fields)
 
     def ebene2(self, ebene1):
         """
@@ -476,12 +712,54 @@ class NaMi(object):
         return self._get_baseadmin('Ebene3', ebene2,
                                    gruppierung=self.__config['stammesnummer'])
 
-    def invoices(self, groupId=None, **kwargs):
+    def hierarchy(self, max_workers=8, cachefile=None, refresh=False):
+        """
+        Get the whole organisational tree of Diözesen, Bezirke and Stämme.
+
+        The levels are crawled one after another but all requests within a
+        level are sent concurrently.
+
+        Args:
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 8.
+            cachefile (:obj:`str`, optional): If given the tree is loaded from
+                this file if it exists. Otherwise it is crawled and saved to
+                this file.
+            refresh (:obj:`bool`, optional): Crawl the tree even if the cache
+                file exists. Defaults to :data:`False`.
+
+        Returns:
+            :class:`~.hierarchy.Hierarchy`: The organisational tree
+        """
+        if cachefile and not refresh and os.path.exists(cachefile):
+            return Hierarchy.load(cachefile)
+
+        roots = [HierarchyNode(x, 1) for x in self.ebene1]
+        level = roots
+        for depth, func in [(2, self.ebene2), (3, self.ebene3)]:
+            report = run_concurrently(lambda node: func(node.id), level,
+                                      max_workers)
+            if report.failed:
+                raise report.failed[0].error
+            for entry in report:
+                entry.item.children = [HierarchyNode(x, depth, entry.item)
+                                       for x in entry.result]
+            level = [child for node in level for child in node.children]
+
+        tree = Hierarchy(roots)
+        if cachefile:
+            tree.save(cachefile)
+        return tree
+
+    def invoices(self, groupId=None, fields=None, **kwargs):
         """
         List of all invoices of a group
 
         Args:
             groupId (:obj:`int`, optional): Group id
+            fields (:obj:`list` of :obj:`str`, optional): Only load these
+                attributes of the results. All other fields are skipped which
+                saves time and memory. Defaults to all attributes.
 
         Returns:
             :obj:`list` of :class:`~.grpadmin.SearchInvoice`: All invoices of
@@ -490,10 +768,10 @@ class NaMi(object):
         if not groupId:
             groupId = self.__config['stammesnummer']
         url = f"{URLS['INVOICE']}{groupId}/flist"
-        params = DEFAULT_PARAMS
+        params = dict(DEFAULT_PARAMS)
         params.update(kwargs)
-        r = self.s.get(url, params=params)
-        return SearchInvoiceSchema().load(self._check_response(r), many=True)
+        data = self._get(url, params=params)
+        return self._load_many(SearchInvoiceSchema, data, fields)
 
     def invoice(self, groupId, invId):
         """
@@ -509,8 +787,8 @@ class NaMi(object):
             details.
         """
         url = f"{URLS['INVOICE']}{groupId}/{invId}"
-        r = self.s.get(url)
-        return InvoiceSchema().load(self._check_response(r))
+        data = self._get(url)
+        return InvoiceSchema().load(data)
 
     def download_invoice(self, id_, **kwargs):
         """
@@ -522,8 +800,8 @@ class NaMi(object):
         """
         url = URLS['INVOICE_PDF']
         params = {'id': id_}
-        r = self.s.get(url, params=params)
-        open_download_pdf(self._check_response(r), **kwargs)
+        data = self._get(url, params=params)
+        open_download_pdf(data, **kwargs)
 
     def tk_auf_grp(self, grpId, mglId, **kwargs):
         """
@@ -605,9 +883,9 @@ class NaMi(object):
             the member (even those which have already ended)
         """
         url = f"{URLS['MGL_TAETIGKEITEN']}{mgl}/flist"
-        params = DEFAULT_PARAMS
-        r = self.s.get(url, params=params)
-        return SearchActivitySchema().load(self._check_response(r), many=True)
+        params = dict(DEFAULT_PARAMS)
+        data = self._get(url, params=params)
+        return SearchActivitySchema().load(data, many=True)
 
     def get_activity(self, mgl, id_):
         """
@@ -623,10 +901,10 @@ class NaMi(object):
             details.
         """
         url = f"{URLS['MGL_TAETIGKEITEN']}{mgl}/{id_}"
-        r = self.s.get(url)
-        return ActivitySchema().load(self._check_response(r))
+        data = self._get(url)
+        return ActivitySchema().load(data)
 
-    def update_activity(self, mgl, act):
+    def update_activity(self, mgl, act, force=False):
         """
         Update an activity
 
@@ -634,13 +912,18 @@ class NaMi(object):
             mgl (int): Member id (not |DPSG| Mitgliedsnummer)
             act (:class:`~.activity.Activity`): Updated data set. The activity
                 id is taken form this data set.
+            force (:obj:`bool`, optional): Send the data set even if nothing
+                has changed. Defaults to :data:`False`.
 
         Returns:
-            :class:`~.activity.Activity`: A new updated object
+            :class:`~.activity.Activity`: A new updated object or ``act``
+            itself if there was nothing to update
 
         Warning:
             This has not been tested yet!
         """
+        if not force and not act.is_dirty:
+            return act
         url = f"{URLS['MGL_TAETIGKEITEN']}{mgl}/{act.id}"
         userjson = ActivitySchema().dumps(act)
         # print(userjson)
@@ -648,9 +931,135 @@ class NaMi(object):
         #                        json=userjson)
         # prereq = self.s.prepare_request(req)
         # print(prereq.body)
-        r = self.s.put(url, json=userjson)
+        r = self.s.put(url, **self._encode_json({'json': userjson}))
         return ActivitySchema().load(self._check_response(r))
 
+    def _update_bulk(self, items, update, max_workers, dry_run):
+        """
+        Base function for all bulk updates
+
+        Args:
+            items (list): Objects derived from
+                :class:`~.schemas.base.TrackedModel`. The diff of each object
+                is computed before anything is sent.
+            update (callable): Function that sends one item
+            max_workers (int): Number of concurrent requests
+            dry_run (bool): Only compute the diffs
+
+        Returns:
+            :class:`~.bulk.BulkReport`: Report in the order of ``items``
+        """
+        items = list(items)
+        report = BulkReport()
+        pending = []
+        for item in items:
+            tracked = item[-1] if isinstance(item, tuple) else item
+            entry = BulkResult(item, diff=tracked.diff())
+            if dry_run or not entry.diff:
+                entry.skipped = True
+                entry.result = tracked
+            else:
+                pending.append(entry)
+            report.append(entry)
+        done = run_concurrently(update, [x.item for x in pending],
+                                max_workers)
+        for entry, res in zip(pending, done):
+            entry.result = res.result
+            entry.error = res.error
+        return report
+
+    def update_many(self, mitglieder, max_workers=4, verify_version=False,
+                    dry_run=False):
+        """
+        Update many members concurrently.
+
+        Only members which have actually been modified are sent to the
+        |NAMI|. Errors are collected per member instead of aborting the whole
+        operation.
+
+        Example:
+            .. code-block:: python
+                :caption: Stop sending the newspaper to all Rover
+
+                mitglieder = [x.get_mitglied(nami) for x in
+                              nami.search(untergliederungId=4)]
+                for mgl in mitglieder:
+                    mgl.zeitschriftenversand = False
+                report = nami.update_many(mitglieder, max_workers=8)
+                for entry in report.failed:
+                    print(entry.item, entry.error)
+
+        Args:
+            mitglieder (:obj:`list` of :class:`~.mgl.Mitglied`): Modified
+                members
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Use the ``rate_limit`` argument of this class to limit the
+                number of requests per second. Defaults to 4.
+            verify_version (:obj:`bool`, optional): Check that the version
+                number returned by the |NAMI| is higher than the one that was
+                sent. Otherwise the update is reported as failed with a
+                :class:`NamiVersionError`. Defaults to :data:`False`.
+            dry_run (:obj:`bool`, optional): Do not send anything but only
+                report the diffs. Defaults to :data:`False`.
+
+        Returns:
+            :class:`~.bulk.BulkReport`: One :class:`~.bulk.BulkResult` per
+            member in the given order. The ``result`` attribute holds the
+            updated :class:`~.mgl.Mitglied`.
+        """
+        def update(mgl):
+            new = mgl.update(self)
+            if verify_version and mgl.version is not None and \
+                    (new.version is None or new.version <= mgl.version):
+                raise NamiVersionError(f'Version of {mgl!r} was not '
+                                       f'increased ({mgl.version} -> '
+                                       f'{new.version})')
+            return new
+
+        return self._update_bulk(mitglieder, update, max_workers, dry_run)
+
+    def update_activities(self, activities, max_workers=4, dry_run=False):
+        """
+        Update many activities concurrently. See :meth:`update_many`.
+
+        Args:
+            activities (:obj:`list` of :obj:`tuple`): Pairs of the member id
+                (not |DPSG| Mitgliedsnummer) and the modified
+                :class:`~.activity.Activity`
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 4.
+            dry_run (:obj:`bool`, optional): Do not send anything but only
+                report the diffs. Defaults to :data:`False`.
+
+        Returns:
+            :class:`~.bulk.BulkReport`: One :class:`~.bulk.BulkResult` per
+            activity in the given order
+        """
+        return self._update_bulk(activities,
+                                 lambda x: self.update_activity(*x),
+                                 max_workers, dry_run)
+
+    def update_ausbildungen(self, ausbildungen, max_workers=4, dry_run=False):
+        """
+        Update many trainings concurrently. See :meth:`update_many`.
+
+        Args:
+            ausbildungen (:obj:`list` of :obj:`tuple`): Pairs of the member id
+                (not |DPSG| Mitgliedsnummer) and the modified
+                :class:`~.training.Ausbildung`
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 4.
+            dry_run (:obj:`bool`, optional): Do not send anything but only
+                report the diffs. Defaults to :data:`False`.
+
+        Returns:
+            :class:`~.bulk.BulkReport`: One :class:`~.bulk.BulkResult` per
+            training in the given order
+        """
+        return self._update_bulk(ausbildungen,
+                                 lambda x: self.update_ausbildung(*x),
+                                 max_workers, dry_run)
+
     def mgl_ausbildungen(self, mglId):
         """
         Get all trainings from a Mitglied.
@@ -663,9 +1072,8 @@ class NaMi(object):
             of the member
         """
         url = f"{URLS['AUSBILDUNG']}{mglId}/flist"
-        params = DEFAULT_PARAMS
-        r = self.s.get(url, params=params)
-        data = self._check_response(r)
+        params = dict(DEFAULT_PARAMS)
+        data = self._get(url, params=params)
         return SearchAusbildungSchema().load(data, many=True)
 
     def get_ausbildung(self, mglId, id_):
@@ -683,10 +1091,10 @@ class NaMi(object):
             all details about the training.
         """
         url = f"{URLS['AUSBILDUNG']}{mglId}/{id_}"
-        r = self.s.get(url)
-        return AusbildungSchema().load(self._check_response(r))
+        data = self._get(url)
+        return AusbildungSchema().load(data)
 
-    def update_ausbildung(self, mglId, ausbildung):
+    def update_ausbildung(self, mglId, ausbildung, force=False):
         """
         Update a training
 
@@ -694,15 +1102,21 @@ class NaMi(object):
             mgl (int): Member id (not |DPSG| Mitgliedsnummer)
             ausbildung (:class:`~.training.Ausbildung`): Updated data set. The
                 training id is taken form this data set.
+            force (:obj:`bool`, optional): Send the data set even if nothing
+                has changed. Defaults to :data:`False`.
 
         Returns:
-            :class:`~.training.Ausbildung`: A new updated object
+            :class:`~.training.Ausbildung`: A new updated object or
+            ``ausbildung`` itself if there was nothing to update
 
         Warning:
             This has not been tested yet!
         """
+        if not force and not ausbildung.is_dirty:
+            return ausbildung
         url = f"{URLS['AUSBILDUNG']}{mglId}/{ausbildung.id}"
-        r = self.s.put(url, json=AusbildungSchema().dumps(ausbildung))
+        r = self.s.put(url, **self._encode_json(
+            {'json': AusbildungSchema().dumps(ausbildung)}))
         return AusbildungSchema().load(self._check_response(r))
 
     def mgl_history(self, mglId, ext=True):
@@ -720,9 +1134,9 @@ class NaMi(object):
         """
         key = 'MGL_HISTORY_EXT' if ext else 'MGL_HISTORY'
         url = f"{URLS[key]}{mglId}/flist"
-        params = DEFAULT_PARAMS
-        r = self.s.get(url, params=params)
-        return HistoryEntrySchema().load(self._check_response(r), many=True)
+        params = dict(DEFAULT_PARAMS)
+        data = self._get(url, params=params)
+        return HistoryEntrySchema().load(data, many=True)
 
     def get_mgl_history(self, mglId, id_, ext=True):
         """
@@ -741,8 +1155,89 @@ class NaMi(object):
         """
         key = 'MGL_HISTORY_EXT' if ext else 'MGL_HISTORY'
         url = f"{URLS[key]}{mglId}/{id_}"
-        r = self.s.get(url)
-        return MitgliedHistorySchema().load(self._check_response(r))
+        data = self._get(url)
+        return MitgliedHistorySchema().load(data)
+
+    def profile(self, mglId=None, include=None, max_workers=8):
+        """
+        Get a member together with all its activities, trainings, tags and
+        history entries. All requests are sent concurrently.
+
+        Args:
+            mglId (:obj:`int`, optional): Member id (not |DPSG|
+                Mitgliedsnummer). Defaults to the user.
+            include (:obj:`list` of :obj:`str`, optional): Parts of the
+                profile that should be fetched. Defaults to all parts in
+                :data:`~.profile.PROFILE_PARTS`. Add ``'activity_details'``
+                and/or ``'ausbildung_details'`` to also get the full
+                :class:`~.activity.Activity` and
+                :class:`~.training.Ausbildung` objects.
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 8.
+
+        Returns:
+            :class:`~.profile.Profile`: All requested data sets of the member
+        """
+        if not mglId:
+            mglId = self.__config['id']
+        entry = self.profiles([mglId], include, max_workers)[0]
+        if not entry.ok:
+            raise entry.error
+        return entry.result
+
+    def profiles(self, mglIds, include=None, max_workers=8):
+        """
+        Get the profiles of many members. See :meth:`profile`.
+
+        The requests for all members share a single thread pool.
+
+        Args:
+            mglIds (:obj:`list` of :obj:`int`): Member ids (not |DPSG|
+                Mitgliedsnummer)
+            include (:obj:`list` of :obj:`str`, optional): Parts of the
+                profiles that should be fetched
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 8.
+
+        Returns:
+            :class:`~.bulk.BulkReport`: One :class:`~.bulk.BulkResult` per
+            member in the given order. The ``result`` attribute holds the
+            :class:`~.profile.Profile`. If any request of a member failed the
+            first error is stored in the ``error`` attribute.
+        """
+        parts, details = check_include(include)
+        fetch = {'mitglied': self.mitglied,
+                 'activities': self.mgl_activities,
+                 'ausbildungen': self.mgl_ausbildungen,
+                 'tags': self.tags,
+                 'history': self.mgl_history,
+                 'activity_details': self.get_activity,
+                 'ausbildung_details': self.get_ausbildung}
+        report = BulkReport(BulkResult(x, result=Profile(x)) for x in mglIds)
+
+        def collect(tasks):
+            done = run_concurrently(lambda t: fetch[t[1]](*t[2:]), tasks,
+                                    max_workers)
+            for res in done:
+                entry = res.item[0]
+                if res.error is not None and entry.error is None:
+                    entry.error = res.error
+            return done
+
+        tasks = [(entry, part, entry.item) for entry in report
+                 for part in parts]
+        for res in collect(tasks):
+            setattr(res.item[0].result, res.item[1], res.result)
+
+        tasks = [(entry, part, entry.item, row.id) for entry in report
+                 for part in details
+                 for row in getattr(entry.result, DETAIL_PARTS[part]) or []]
+        for entry in report:
+            for part in details:
+                setattr(entry.result, part, [])
+        for res in collect(tasks):
+            getattr(res.item[0].result, res.item[1]).append(res.result)
+        return report
 
     def tags(self, mglId, **kwargs):
         """
@@ -756,10 +1251,10 @@ class NaMi(object):
             results
         """
         url = URLS['TAGS'].format(mglId=mglId)
-        params = DEFAULT_PARAMS
+        params = dict(DEFAULT_PARAMS)
         params.update(kwargs)
-        r = self.s.get(url, params=params)
-        return SearchTagSchema().load(self._check_response(r), many=True)
+        data = self._get(url, params=params)
+        return SearchTagSchema().load(data, many=True)
 
     def get_tag(self, mglId, tagId):
         """
@@ -773,7 +1268,7 @@ class NaMi(object):
             :class:`~.tags.Tag`: The tag object with all important details
         """
         url = URLS['GET_TAG'].format(mglId=mglId, tagId=tagId)
-        return TagSchema().load(self._check_response(self.s.get(url)))
+        return TagSchema().load(self._get(url))
 
     def bescheinigungen(self, **kwargs):
         """
@@ -784,10 +1279,9 @@ class NaMi(object):
             of all your certificates of inspection
         """
         url = f"{URLS['FZ']}flist"
-        params = DEFAULT_PARAMS
+        params = dict(DEFAULT_PARAMS)
         params.update(kwargs)
-        r = self.s.get(url, params=params)
-        data = self._check_response(r)
+        data = self._get(url, params=params)
         return SearchBescheinigungSchema().load(data, many=True)
 
     def get_bescheinigung(self, id_):
@@ -802,8 +1296,8 @@ class NaMi(object):
             important details about the inspection
         """
         url = f"{URLS['FZ']}{id_}"
-        r = self.s.get(url)
-        return BescheinigungSchema().load(self._check_response(r))
+        data = self._get(url)
+        return BescheinigungSchema().load(data)
 
     def download_bescheinigung(self, id_, **kwargs):
         """
@@ -815,8 +1309,8 @@ class NaMi(object):
         """
         url = f"{URLS['FZ']}download-pdf-eigene-bescheinigung"
         params = {'id': id_}
-        r = self.s.get(url, params=params)
-        open_download_pdf(self._check_response(r), **kwargs)
+        data = self._get(url, params=params)
+        open_download_pdf(data, **kwargs)
 
     def download_beantragung(self, **kwargs):
         """
@@ -827,11 +1321,128 @@ class NaMi(object):
             **kwargs: See :meth:`~pynami.util.open_download_pdf`.
         """
         url = URLS['BEANTRAGUNG']
-        r = self.s.get(url)
-        open_download_pdf(self._check_response(r), **kwargs)
+        data = self._get(url)
+        open_download_pdf(data, **kwargs)
+
+    def _download_file(self, url, params, filename, overwrite=False):
+        """
+        Stream a |PDF| file directly to disk.
+
+        Args:
+            url (str): Download |URL|
+            params (dict): Request parameters
+            filename (str): Full path of the target file
+            overwrite (:obj:`bool`, optional): Download the file even if it
+                already exists
+
+        Returns:
+            dict: Manifest entry with the keys ``filename``, ``size`` and
+            ``status`` (``'downloaded'`` or ``'skipped'``)
+        """
+        # save_stream only creates complete files, so no request is needed
+        if not overwrite and os.path.isfile(filename):
+            return {'filename': filename, 'size': os.path.getsize(filename),
+                    'status': 'skipped'}
+        with self.s.get(url, params=params, stream=True) as r:
+            if r.status_code != requests.codes.ok or \
+                    r.headers.get('Content-Type') != 'application/pdf':
+                self._check_response(r)
+                raise NamiResponseTypeError(f"Expected a PDF file but got "
+                                            f"{r.headers.get('Content-Type')}")
+            size = save_stream(r, filename)
+        return {'filename': filename, 'size': size, 'status': 'downloaded'}
+
+    def _download_many(self, items, url, name, directory, max_workers,
+                       overwrite):
+        """
+        Base function for the batch downloads
+
+        Args:
+            items (list): Objects which have an ``id`` attribute
+            url (str): Download |URL|
+            name (callable): Returns the file name (without extension) for an
+                item
+            directory (str): Target directory. It is created if necessary.
+            max_workers (int): Number of concurrent downloads
+            overwrite (bool): Download files even if they already exist
+
+        Returns:
+            :class:`~.bulk.BulkReport`: The manifest
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        def download(item):
+            filename = os.path.join(directory,
+                                    safe_filename(name(item)) + '.pdf')
+            return self._download_file(url, {'id': item.id}, filename,
+                                       overwrite)
+
+        report = run_concurrently(download, items, max_workers)
+        for entry in report:
+            entry.skipped = entry.ok and entry.result['status'] == 'skipped'
+        return report
+
+    def download_invoices(self, invoices, directory, max_workers=4,
+                          overwrite=False):
+        """
+        Download many invoices as |PDF| files into a directory.
+
+        In contrast to :meth:`download_invoice` nothing is opened and there
+        are no dialogues, so this also works on headless systems. The files
+        are named after the official invoice number (``reNr``). Files which
+        already exist are not downloaded again.
+
+        Args:
+            invoices (:obj:`list` of :class:`~.grpadmin.SearchInvoice`):
+                Invoices, e.g. from :meth:`invoices`.
+                :class:`~.grpadmin.Invoice` objects work as well.
+            directory (str): Target directory
+            max_workers (:obj:`int`, optional): Number of concurrent
+                downloads. Defaults to 4.
+            overwrite (:obj:`bool`, optional): Download all files even if
+                they already exist. Defaults to :data:`False`.
+
+        Returns:
+            :class:`~.bulk.BulkReport`: Manifest with one
+            :class:`~.bulk.BulkResult` per invoice. The ``result`` attribute
+            is a :obj:`dict` with the ``filename``, ``size`` and ``status``
+            of the file.
+        """
+        return self._download_many(invoices, URLS['INVOICE_PDF'],
+                                   lambda x: x.reNr or x.id, directory,
+                                   max_workers, overwrite)
+
+    def download_bescheinigungen(self, bescheinigungen, directory,
+                                 max_workers=4, overwrite=False):
+        """
+        Download many certificates of inspection as |PDF| files into a
+        directory. See :meth:`download_invoices`.
+
+        The files are named after the number of the certificate of good
+        conduct (``fzNummer``).
+
+        Args:
+            bescheinigungen (:obj:`list` of
+                :class:`~.schemas.cogc.SearchBescheinigung`): Certificates,
+                e.g. from :meth:`bescheinigungen`
+            directory (str): Target directory
+            max_workers (:obj:`int`, optional): Number of concurrent
+                downloads. Defaults to 4.
+            overwrite (:obj:`bool`, optional): Download all files even if
+                they already exist. Defaults to :data:`False`.
+
+        Returns:
+            :class:`~.bulk.BulkReport`: Manifest with one
+            :class:`~.bulk.BulkResult` per certificate
+        """
+        url = f"{URLS['FZ']}download-pdf-eigene-bescheinigung"
+        return self._download_many(bescheinigungen, url,
+                                   lambda x: x.fzNummer or x.id, directory,
+                                   max_workers, overwrite)
 
     def search_all(self, grpId=None, filterString=None, searchString='',
-                   sortproperty=None, sortdirection='ASC', **kwargs):
+                   sortproperty=None, sortdirection='ASC', lazy=False,
+                   fields=None, stream=False, **kwargs):
         """
         Search function for filtering the whole member list with limited
         filter options.
@@ -847,13 +1458,22 @@ class NaMi(object):
                 shall be sorted.
             sortdirection (:obj:`str`, optional): Direction of sorting. Can
                 take the values ``ASC`` (wich is the default) and ``DESC``.
+            lazy (:obj:`bool`, optional): Return a
+                :class:`~.schemas.base.LazyList` which only loads the results
+                on access. Defaults to :data:`False`.
+            fields (:obj:`list` of :obj:`str`, optional): Only load these
+                attributes of the results. All other fields are skipped which
+                saves time and memory. Defaults to all attributes.
+            stream (:obj:`bool`, optional): Return a generator which loads
+                the results while the response is still being received. See
+                :meth:`_iter_get`. Defaults to :data:`False`.
 
         Returns:
             :obj:`list` of :class:`~.mgl.SearchMitglied`: The search
             results
         """
         assert sortdirection in ['ASC', 'DESC']
-        params = DEFAULT_PARAMS
+        params = dict(DEFAULT_PARAMS)
         if sortproperty:
             keys = SearchMitgliedSchema.__dict__['_declared_fields'].keys()
             assert sortproperty in keys
@@ -867,10 +1487,14 @@ class NaMi(object):
             params.update({'filterString': filterString,
                            'searchString': searchString})
         params.update(kwargs)
-        r = self.s.get(url, params=params)
-        return SearchMitgliedSchema().load(self._check_response(r), many=True)
+        if stream:
+            return self._iter_load(SearchMitgliedSchema, url, params, fields)
+        data = self._get(url, params=params)
+        if lazy:
+            return LazyList(SearchMitgliedSchema.projected(fields), data)
+        return self._load_many(SearchMitgliedSchema, data, fields)
 
-    def search(self, **kwargs):
+    def search(self, lazy=False, fields=None, stream=False, **kwargs):
         """
         Run a search for members
 
@@ -879,6 +1503,15 @@ class NaMi(object):
               be used mutually exclusive.
 
         Args:
+            lazy (:obj:`bool`, optional): Return a
+                :class:`~.schemas.base.LazyList` which only loads the results
+                on access. Defaults to :data:`False`.
+            fields (:obj:`list` of :obj:`str`, optional): Only load these
+                attributes of the results. All other fields are skipped which
+                saves time and memory. Defaults to all attributes.
+            stream (:obj:`bool`, optional): Return a generator which loads
+                the results while the response is still being received. See
+                :meth:`_iter_get`. Defaults to :data:`False`.
             **kwargs: Search keys and words. Be advised that some search words
                 must  have a certain formatting or can only take a limited
                 amount of values.
@@ -894,11 +1527,16 @@ class NaMi(object):
         # this is just a default search
         if not kwargs:
             kwargs.update({})
-        params = DEFAULT_PARAMS
+        params = dict(DEFAULT_PARAMS)
         params['searchedValues'] = SearchSchema().dumps(kwargs,
                                                         separators=(',', ':'))
-        r = self.s.get(URLS['SEARCH'], params=params)
-        return SearchMitgliedSchema().load(self._check_response(r), many=True)
+        if stream:
+            return self._iter_load(SearchMitgliedSchema, URLS['SEARCH'],
+                                   params, fields)
+        data = self._get(URLS['SEARCH'], params=params)
+        if lazy:
+            return LazyList(SearchMitgliedSchema.projected(fields), data)
+        return self._load_many(SearchMitgliedSchema, data, fields)
 
     def mitglied(self, mglId=None, method='GET', grpId=None, **kwargs):
         """
@@ -920,19 +1558,261 @@ class NaMi(object):
             Mitglied. Note that the
             :attr:`~.mgl.MitgliedSchema.austrittsDatum` attribute is not part
             of the returned data set.
+
+        Note:
+            If a :attr:`mgl_cache` is set, plain ``'GET'`` requests are served
+            from the cache when possible. Every other request replaces the
+            cached member with the returned one.
         """
         if not mglId:
             mglId = self.__config['id']
         if not grpId:
             grpId = self.__config['stammesnummer']
         url = URLS['GETMGL'].format(gruppierung=grpId, mitglied=mglId)
-        r = self.s.request(method, url, **kwargs)
-        return MitgliedSchema().load(self._check_response(r))
+        cache = self.mgl_cache
+        if method.upper() == 'GET' and not kwargs:
+            mgl = cache.get(mglId) if cache is not None else None
+            if mgl is None:
+                mgl = MitgliedSchema().load(self._get(url))
+                if cache is not None:
+                    cache.put(mgl)
+            return mgl
+        if cache is not None:
+            cache.invalidate(mglId)
+        r = self.s.request(method, url, **self._encode_json(kwargs))
+        mgl = MitgliedSchema().load(self._check_response(r))
+        if cache is not None:
+            cache.put(mgl)
+        return mgl
+
+    def validate_mgl_cache(self, grpId=None):
+        """
+        Drop all members from the :attr:`mgl_cache` that have been changed in
+        the |NAMI| since they were cached.
+
+        This only needs a single :meth:`search_all` request which loads just
+        the version information of the members.
+
+        Args:
+            grpId (:obj:`int`, optional): Group id. Defaults to the group of
+                the user.
+
+        Returns:
+            int: Number of dropped members
+        """
+        if self.mgl_cache is None:
+            return 0
+        listing = self.search_all(grpId, fields=['version', 'lastUpdated'])
+        return self.mgl_cache.validate(listing)
+
+    def stufenwechsel(self, stichtag=None, altersgrenzen=None,
+                      activities=False, max_workers=8, **kwargs):
+        """
+        Candidates for the change of tiers (Stufenwechsel)
+
+        All active members of the four tiers are loaded with a single search
+        and their ages at the cut-off date are compared with the age limits
+        of their tier. See :func:`~.stufenwechsel.plan_stufenwechsel`.
+
+        Args:
+            stichtag (:class:`~datetime.date`, optional): Cut-off date.
+                Defaults to today.
+            altersgrenzen (:obj:`dict`, optional): Age limits per
+                :class:`~.constants.UgId`. Defaults to
+                :data:`~.stufenwechsel.ALTERSGRENZEN`.
+            activities (:obj:`bool`, optional): Determine the current tier
+                from the active activities of each member (fetched
+                concurrently) instead of the first tier in the member list.
+                Defaults to :data:`False`.
+            max_workers (:obj:`int`, optional): Number of concurrent requests
+                for the activities. Defaults to 8.
+            **kwargs: Further search keys, e.g. ``grpNummer``. See
+                :class:`~.search.SearchSchema`.
+
+        Returns:
+            :class:`~.stufenwechsel.StufenwechselPlan`: The candidates grouped
+            by current and next tier
+        """
+        search = {'mglStatusId': 'AKTIV', 'taetigkeitId': [1],
+                  'untergliederungId': [x.value for x in ALTERSGRENZEN]}
+        search.update(kwargs)
+        mitglieder = self.search(
+            fields=['vorname', 'nachname', 'geburtsDatum',
+                    'ersteUntergliederungId'], **search)
+        acts = None
+        if activities:
+            report = run_concurrently(lambda x: self.mgl_activities(x.id),
+                                      mitglieder, max_workers)
+            acts = {x.item.id: x.result for x in report if x.ok}
+        return plan_stufenwechsel(mitglieder, stichtag, altersgrenzen, acts)
+
+    def statistics(self, stichtag=None, grpId=None):
+        """
+        Detailed statistics of a group computed from a single member list
+
+        Unchanged member lists reuse the figures computed before. See
+        :meth:`~.statistics.GroupStatistics.for_snapshot`.
+
+        Args:
+            stichtag (:class:`~datetime.date`, optional): Reference date for
+                ages and durations. Defaults to today.
+            grpId (:obj:`int`, optional): Group id. Defaults to the group of
+                the user.
+
+        Returns:
+            :class:`~.statistics.GroupStatistics`
+        """
+        mitglieder = self.search_all(grpId, fields=STAT_FIELDS)
+        return GroupStatistics.for_snapshot(mitglieder, stichtag)
+
+    def activity_timeline(self, mitglieder=None, max_workers=8,
+                          cachefile=None, refresh=False):
+        """
+        Index of the activities of many members over time
+
+        The activities of all members are fetched concurrently. See
+        :class:`~.timeline.ActivityTimeline` for the possible queries.
+
+        Args:
+            mitglieder (:obj:`list`, optional): Members (objects with an
+                ``id`` attribute) or member ids. Defaults to all members of
+                the group of the user (see :meth:`search_all`).
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 8.
+            cachefile (:obj:`str`, optional): If given the index is loaded
+                from this file if it exists and contains the same members.
+                Without ``mitglieder`` any existing file is used. Otherwise
+                the index is built and saved to this file.
+            refresh (:obj:`bool`, optional): Build the index even if the
+                cache file exists. Defaults to :data:`False`.
+
+        Returns:
+            :class:`~.timeline.ActivityTimeline`: The index
+        """
+        ids = None if mitglieder is None else \
+            [getattr(x, 'id', x) for x in mitglieder]
+        if cachefile and not refresh and os.path.exists(cachefile):
+            timeline = ActivityTimeline.load(cachefile)
+            if ids is None or timeline.members == set(ids):
+                return timeline
+
+        if ids is None:
+            ids = [x.id for x in self.search_all(fields=['id'])]
+        report = run_concurrently(self.mgl_activities, ids, max_workers)
+        if report.failed:
+            raise report.failed[0].error
+        timeline = ActivityTimeline({x.item: x.result for x in report})
+        if cachefile:
+            timeline.save(cachefile)
+        return timeline
+
+    def ausbildungsmatrix(self, mitglieder=None, max_workers=8, **kwargs):
+        """
+        Completed trainings of many members as a member × Baustein matrix
+
+        The trainings of all members are fetched concurrently. See
+        :class:`~.reports.AusbildungsMatrix` for the possible queries.
+
+        Args:
+            mitglieder (:obj:`list`, optional): Members (objects with an
+                ``id`` attribute) or member ids. Defaults to all active
+                leaders.
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 8.
+            **kwargs: Further search keys for the default member list, e.g.
+                ``untergliederungId``. See :class:`~.search.SearchSchema`.
+
+        Returns:
+            :class:`~.reports.AusbildungsMatrix`: The matrix
+        """
+        if mitglieder is None:
+            search = {'mglStatusId': 'AKTIV',
+                      'taetigkeitId': LEITER_TAETIGKEITEN}
+            search.update(kwargs)
+            mitglieder = self.search(fields=['vorname', 'nachname'],
+                                     **search)
+        report = run_concurrently(
+            lambda x: self.mgl_ausbildungen(getattr(x, 'id', x)),
+            mitglieder, max_workers)
+        if report.failed:
+            raise report.failed[0].error
+        return AusbildungsMatrix(
+            {getattr(x.item, 'id', x.item): x.result for x in report},
+            mitglieder)
+
+    def fz_status(self, stichtag=None, gueltigkeit=GUELTIGKEIT, warnung=90,
+                  max_workers=8, ttl=300, refresh=False, **kwargs):
+        """
+        Status of the certificates of good conduct (|CGC|) of all active
+        leaders
+
+        All certificates are listed with :meth:`bescheinigungen` and the
+        details of those belonging to a leader are fetched concurrently. See
+        :func:`~.reports.fz_report`. The report is kept for ``ttl`` seconds
+        so that repeated calls with the same arguments send no requests.
+        Each call returns its own copy. At most :attr:`MAX_REPORTS` reports
+        are kept, the least recently used are dropped first.
+
+        Args:
+            stichtag (:class:`~datetime.date`, optional): Reference date.
+                Defaults to today.
+            gueltigkeit (:obj:`int`, optional): Validity in years after the
+                inspection. Defaults to :data:`~.reports.GUELTIGKEIT`.
+            warnung (:obj:`int`, optional): Days before the expiry from which
+                on a certificate is reported as ``laeuft_ab``. Defaults to 90.
+            max_workers (:obj:`int`, optional): Number of concurrent requests.
+                Defaults to 8.
+            ttl (:obj:`float`, optional): Seconds for which the report is
+                reused. Defaults to 300.
+            refresh (:obj:`bool`, optional): Build the report even if a
+                cached one exists. Defaults to :data:`False`.
+            **kwargs: Further search keys for the leaders, e.g.
+                ``untergliederungId``. See :class:`~.search.SearchSchema`.
+
+        Returns:
+            :class:`~.reports.FzReport`: One entry per leader, most urgent
+            first
+        """
+        key = ('fz_status', stichtag, gueltigkeit, warnung,
+               json.dumps(kwargs, sort_keys=True, default=str))
+        now = time.monotonic()
+        with self._reports_lock:
+            for old in [k for k, v in self._reports.items()
+                        if now - v[0] > ttl]:
+                del self._reports[old]
+            cached = self._reports.get(key)
+            if cached and not refresh:
+                self._reports.move_to_end(key)
+        # Stored reports are never modified, so they can be copied unlocked
+        if cached and not refresh:
+            return copy.deepcopy(cached[1])
+
+        search = {'mglStatusId': 'AKTIV',
+                  'taetigkeitId': LEITER_TAETIGKEITEN}
+        search.update(kwargs)
+        leiter = self.search(fields=['vorname', 'nachname', 'geburtsDatum'],
+                             **search)
+        namen = {(x.nachname or '').strip().lower() for x in leiter}
+        results = [x for x in self.bescheinigungen()
+                   if (x.empfNachname or '').strip().lower() in namen]
+        report = run_concurrently(lambda x: self.get_bescheinigung(x.id),
+                                  results, max_workers)
+        if report.failed:
+            raise report.failed[0].error
+        fz = fz_report(leiter, [(x.item, x.result) for x in report],
+                       stichtag, gueltigkeit, warnung)
+        stored = (time.monotonic(), copy.deepcopy(fz))
+        with self._reports_lock:
+            self._reports[key] = stored
+            self._reports.move_to_end(key)
+            while len(self._reports) > self.MAX_REPORTS:
+                self._reports.popitem(last=False)
+        return fz
 
 
 if __name__ == '__main__':
-    import os
     from configparser import ConfigParser
+    from .tools import tabulate2x
     # import cProfile, pstats, io
     # pr = cProfile.Profile(builtins=False, subcalls=False)
     # from .tools import make_csv, send_emails
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""
+Run the same operation for several |NAMI| accounts or groups at once.
+
+A Bezirk often has to collect data of several Stämme which are accessed with
+different credentials or group ids. A :class:`NaMiPool` holds one
+authenticated :class:`~pynami.nami.NaMi` session per account and runs
+operations on all of them concurrently. Each session keeps its own rate
+limit.
+
+Example:
+    .. code-block:: python
+        :caption: Count the members of three Stämme
+
+        accounts = {
+            'Weeg': {'username': '123', 'password': 'x'},
+            'Bergheim': {'username': '456', 'password': 'y'},
+            'Nachbarn': {'username': '123', 'password': 'x',
+                         'grpId': 131914, 'rate_limit': 2},
+        }
+        with NaMiPool(accounts, rate_limit=5) as pool:
+            for mgl in pool.gather('search_all'):
+                print(mgl._account, mgl.nachname)
+            print(pool.run('stats'))
+"""
+from collections import OrderedDict
+from collections.abc import Sequence
+
+from .nami import NaMi
+from .bulk import run_concurrently
+from .schemas.base import BaseModel
+
+
+class NaMiPool:
+    """
+    Pool of authenticated :class:`~pynami.nami.NaMi` sessions
+
+    Args:
+        accounts (:obj:`dict` or :obj:`list` of :obj:`dict`): Configuration of
+            each account as passed to :class:`~pynami.nami.NaMi`. A
+            :obj:`dict` maps account names to configurations. Otherwise the
+            name is taken from the ``name``, ``grpId`` or ``username`` key.
+            The optional keys ``grpId`` (group to work with instead of the
+            user's own group) and ``rate_limit`` are used by the pool itself.
+        rate_limit (:obj:`float`, optional): Default rate limit of each
+            account in requests per second. Defaults to no limit.
+        max_workers (:obj:`int`, optional): Number of accounts which are
+            processed at the same time. Defaults to 8.
+        **kwargs: Further arguments for all :class:`~pynami.nami.NaMi`
+            instances, e.g. an ``http_cache``
+    """
+    def __init__(self, accounts, rate_limit=None, max_workers=8, **kwargs):
+        if isinstance(accounts, dict):
+            accounts = [dict(config, name=name)
+                        for name, config in accounts.items()]
+        self.max_workers = max_workers
+        self.sessions = OrderedDict()
+        """:class:`~collections.OrderedDict`: :class:`~pynami.nami.NaMi`
+        instance of each account name"""
+        self._groups = {}
+        for config in accounts:
+            config = dict(config)
+            grpId = config.pop('grpId', None)
+            rate = config.pop('rate_limit', rate_limit)
+            name = config.pop('name', None) or grpId or config['username']
+            if name in self.sessions:
+                raise ValueError(f'Duplicate account name: {name}')
+            self.sessions[name] = NaMi(config, rate_limit=rate, **kwargs)
+            self._groups[name] = grpId
+
+    def __repr__(self):
+        return f'<NaMiPool({len(self)} accounts)>'
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __getitem__(self, name):
+        return self.sessions[name]
+
+    def __enter__(self):
+        report = self.auth()
+        if report.failed:
+            self.logout()
+            raise ValueError('Authentication failed for ' + ', '.join(
+                f'{x.item} ({x.error})' for x in report.failed))
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.logout()
+
+    def _auth(self, name):
+        nami = self.sessions[name]
+        nami.auth()
+        if self._groups[name] is not None:
+            nami.grpId = self._groups[name]
+        return nami.grpId
+
+    def auth(self):
+        """
+        Authenticate all accounts concurrently
+
+        Returns:
+            :class:`~.bulk.BulkReport`: One result per account name with the
+            group id of the account
+        """
+        return run_concurrently(self._auth, self.sessions, self.max_workers)
+
+    def logout(self):
+        """
+        Log out all accounts. Errors are ignored.
+
+        Returns:
+            :data:`None`
+        """
+        run_concurrently(lambda name: self.sessions[name].logout(),
+                         self.sessions, self.max_workers)
+
+    def run(self, operation, *args, **kwargs):
+        """
+        Run an operation for all accounts concurrently
+
+        Args:
+            operation (:obj:`str` or :obj:`callable`): Name of a method or
+                property of :class:`~pynami.nami.NaMi` or a function which
+                takes the :class:`~pynami.nami.NaMi` instance as its first
+                argument
+            *args: Further positional arguments for the operation
+            **kwargs: Keyword arguments for the operation
+
+        Returns:
+            :class:`~.bulk.BulkReport`: One result per account name in the
+            order of the accounts
+        """
+        def call(name):
+            nami = self.sessions[name]
+            if callable(operation):
+                return operation(nami, *args, **kwargs)
+            value = getattr(nami, operation)
+            return value(*args, **kwargs) if callable(value) else value
+
+        return run_concurrently(call, self.sessions, self.max_workers)
+
+    def gather(self, operation, *args, strict=True, **kwargs):
+        """
+        Run an operation for all accounts and merge the results into one list
+
+        Every returned data set gets the attributes ``_account`` (account
+        name) and ``_grpId`` (group id of the account) so its origin is
+        known. These attributes are not part of tabulated output or change
+        tracking.
+
+        Args:
+            operation (:obj:`str` or :obj:`callable`): See :meth:`run`
+            *args: Further positional arguments for the operation
+            strict (:obj:`bool`, optional): Raise the first error of any
+                account. Otherwise failed accounts are skipped. Defaults to
+                :data:`True`.
+            **kwargs: Keyword arguments for the operation
+
+        Returns:
+            list: The results of all accounts. Lists are concatenated.
+        """
+        report = self.run(operation, *args, **kwargs)
+        merged = []
+        for entry in report:
+            if not entry.ok:
+                if strict:
+                    raise entry.error
+                continue
+            result = entry.result
+            items = result if isinstance(result, Sequence) and \
+                not isinstance(result, (str, bytes)) else [result]
+            for item in items:
+                if isinstance(item, BaseModel):
+                    item._account = entry.item
+                    item._grpId = self.sessions[entry.item].grpId
+                merged.append(item)
+        return merged
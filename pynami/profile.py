@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Composite view of everything the |NAMI| knows about a single member.
+
+Profiles are created by :meth:`~pynami.nami.NaMi.profile` and
+:meth:`~pynami.nami.NaMi.profiles`.
+"""
+
+PROFILE_PARTS = ('mitglied', 'activities', 'ausbildungen', 'tags', 'history')
+""":obj:`tuple` of :obj:`str`: Parts of a :class:`Profile` which are fetched
+by default"""
+
+DETAIL_PARTS = {'activity_details': 'activities',
+                'ausbildung_details': 'ausbildungen'}
+"""dict: Optional parts of a :class:`Profile` which need one extra request
+per entry of the list part they belong to"""
+
+
+class Profile:
+    """
+    All data sets belonging to a member
+
+    Parts which were not requested are :data:`None`.
+
+    Args:
+        mglId (int): Member id (not |DPSG| Mitgliedsnummer)
+    """
+    def __init__(self, mglId):
+        self.mglId = mglId
+        """int: Member id (not |DPSG| Mitgliedsnummer)"""
+        self.mitglied = None
+        """:class:`~.schemas.mgl.Mitglied`: The member itself"""
+        self.activities = None
+        """:obj:`list` of :class:`~.schemas.activity.SearchActivity`: All
+        activities"""
+        self.ausbildungen = None
+        """:obj:`list` of :class:`~.schemas.training.SearchAusbildung`: All
+        trainings"""
+        self.tags = None
+        """:obj:`list` of :class:`~.schemas.tags.SearchTag`: All tags"""
+        self.history = None
+        """:obj:`list` of :class:`~.schemas.history.HistoryEntry`: Revision
+        history"""
+        self.activity_details = None
+        """:obj:`list` of :class:`~.schemas.activity.Activity`: Details for
+        each entry of :attr:`activities`"""
+        self.ausbildung_details = None
+        """:obj:`list` of :class:`~.schemas.training.Ausbildung`: Details for
+        each entry of :attr:`ausbildungen`"""
+
+    def __repr__(self):
+        if self.mitglied is not None:
+            return f'<Profile({self.mitglied.nachname}, ' + \
+                f'{self.mitglied.vorname})>'
+        return f'<Profile(Id: {self.mglId})>'
+
+
+def check_include(include):
+    """
+    Validate the requested profile parts
+
+    Detail parts imply the list part they belong to.
+
+    Args:
+        include (iterable): Names of the requested parts. :data:`None` selects
+            :data:`PROFILE_PARTS`.
+
+    Raises:
+        ValueError: For unknown part names
+
+    Returns:
+        :obj:`tuple` of :obj:`list`: The list parts and the detail parts
+    """
+    include = list(PROFILE_PARTS if include is None else include)
+    unknown = set(include) - set(PROFILE_PARTS) - set(DETAIL_PARTS)
+    if unknown:
+        raise ValueError(f'Unknown profile parts: {sorted(unknown)}')
+    details = [x for x in include if x in DETAIL_PARTS]
+    parts = [x for x in PROFILE_PARTS if x in include or
+             x in [DETAIL_PARTS[d] for d in details]]
+    return parts, details
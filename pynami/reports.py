@@ -0,0 +1,429 @@
+# -*- coding: utf-8 -*-
+"""
+Compliance reports about the leaders of a group.
+
+The |NAMI| only shows the trainings or certificates of good conduct of one
+member at a time. The reports in this module are built from data which is
+fetched concurrently for all members once and then answer all questions
+locally.
+
+Example:
+    .. code-block:: python
+        :caption: Active leaders who still need Baustein 2b
+
+        matrix = nami.ausbildungsmatrix()
+        for mglId in matrix.fehlend('Baustein 2b'):
+            print(matrix.namen.get(mglId, mglId))
+        matrix.export_xlsx('ausbildungen.xlsx')
+"""
+import csv
+import datetime
+
+# numpy is optional and takes a considerable time to import. It is therefore
+# imported inside of the functions which use it.
+
+LEITER_TAETIGKEITEN = [6]
+""":obj:`list` of :obj:`int`: Activity ids of leaders (``€ LeiterIn``)"""
+
+
+def _name(mgl):
+    """Display name of a member search result"""
+    vorname = getattr(mgl, 'vorname', None)
+    nachname = getattr(mgl, 'nachname', None)
+    if vorname or nachname:
+        return f'{nachname}, {vorname}'
+    return None
+
+
+class AusbildungsMatrix:
+    """
+    Dense member × Baustein matrix of completed trainings
+
+    If :mod:`numpy` is installed the matrix is a boolean array, otherwise
+    each member is a row of bits in an :obj:`int`. Both allow to check many
+    members for several Bausteine at once. The day of the latest completion
+    of each Baustein is stored as well.
+
+    Args:
+        ausbildungen (dict): Lists of
+            :class:`~.schemas.training.SearchAusbildung` per member id
+        mitglieder (:obj:`list`, optional): Members (objects with an ``id``
+            attribute) or member ids which form the rows. Members without
+            any training are included. Defaults to the keys of
+            ``ausbildungen``.
+    """
+    def __init__(self, ausbildungen, mitglieder=None):
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if mitglieder is None:
+            mitglieder = list(ausbildungen)
+        self.mitglieder = [getattr(x, 'id', x) for x in mitglieder]
+        """:obj:`list` of :obj:`int`: Member ids (rows)"""
+        self.namen = {x.id: _name(x) for x in mitglieder
+                      if _name(x) is not None}
+        """dict: Names of the members if members were given"""
+        self.bausteine = sorted({x.baustein for acts in ausbildungen.values()
+                                 for x in acts if x.baustein})
+        """:obj:`list` of :obj:`str`: Names of the Bausteine (columns)"""
+        self._rows = {mglId: i for i, mglId in enumerate(self.mitglieder)}
+        self._cols = {name: i for i, name in enumerate(self.bausteine)}
+
+        shape = (len(self.mitglieder), len(self.bausteine))
+        # Boolean array or one int of bits per row
+        if np is not None:
+            self.erledigt = np.zeros(shape, dtype=bool)
+            self._tage = np.zeros(shape, dtype=np.int32)
+        else:
+            self.erledigt = [0] * shape[0]
+            self._tage = [[0] * shape[1] for _ in range(shape[0])]
+
+        for mglId, acts in ausbildungen.items():
+            row = self._rows.get(mglId)
+            if row is None:
+                continue
+            for act in acts:
+                col = self._cols.get(act.baustein)
+                if col is None:
+                    continue
+                tag = act.vstgTag.toordinal() if act.vstgTag else 1
+                if np is not None:
+                    self.erledigt[row, col] = True
+                    self._tage[row, col] = max(self._tage[row, col], tag)
+                else:
+                    self.erledigt[row] |= 1 << col
+                    self._tage[row][col] = max(self._tage[row][col], tag)
+
+    def __repr__(self):
+        return f'<AusbildungsMatrix({len(self.mitglieder)} Mitglieder, ' + \
+            f'{len(self.bausteine)} Bausteine)>'
+
+    def baustein(self, name):
+        """
+        Full name of a Baustein
+
+        Args:
+            name (str): Full name or a unique part of it, e.g. ``2b``. The
+                case is ignored.
+
+        Raises:
+            KeyError: If more than one Baustein matches
+
+        Returns:
+            str: ``name`` itself if no member has completed a matching
+            Baustein
+        """
+        if name in self._cols:
+            return name
+        matches = [x for x in self.bausteine if name.lower() in x.lower()]
+        if len(matches) > 1:
+            raise KeyError(f'{name} matches {len(matches)} Bausteine')
+        return matches[0] if matches else name
+
+    def hat(self, mglId, baustein):
+        """
+        Check if a member has completed a Baustein
+
+        Args:
+            mglId (int): Member id (not |DPSG| Mitgliedsnummer)
+            baustein (str): See :meth:`baustein`
+
+        Returns:
+            bool
+        """
+        return self.datum(mglId, baustein) is not None
+
+    def datum(self, mglId, baustein):
+        """
+        Day of the latest completion of a Baustein
+
+        Args:
+            mglId (int): Member id (not |DPSG| Mitgliedsnummer)
+            baustein (str): See :meth:`baustein`
+
+        Returns:
+            :class:`~datetime.date`: :data:`None` if the member has not
+            completed the Baustein. Trainings without a date give
+            :attr:`datetime.date.min`.
+        """
+        row = self._rows[mglId]
+        col = self._cols.get(self.baustein(baustein))
+        if col is None:
+            return None
+        tag = int(self._tage[row][col])
+        return datetime.date.fromordinal(tag) if tag else None
+
+    def _complete(self, bausteine, mitglieder):
+        """Rows and whether they completed all of the given Bausteine"""
+        cols = [self._cols.get(self.baustein(x)) for x in bausteine]
+        rows = [self._rows[getattr(x, 'id', x)] for x in mitglieder] \
+            if mitglieder is not None else range(len(self.mitglieder))
+        if None in cols:
+            # Nobody has completed this Baustein
+            return rows, [False] * len(rows)
+        if isinstance(self.erledigt, list):
+            mask = sum(1 << col for col in set(cols))
+            return rows, [self.erledigt[row] & mask == mask for row in rows]
+        return rows, self.erledigt[list(rows)][:, cols].all(axis=1).tolist()
+
+    def fehlend(self, *bausteine, mitglieder=None):
+        """
+        Members who have not completed all of the given Bausteine
+
+        Args:
+            *bausteine (str): See :meth:`baustein`
+            mitglieder (:obj:`list`, optional): Only check these members or
+                member ids. Defaults to all rows.
+
+        Returns:
+            :obj:`list` of :obj:`int`: Member ids
+        """
+        rows, complete = self._complete(bausteine, mitglieder)
+        return [self.mitglieder[row] for row, ok in zip(rows, complete)
+                if not ok]
+
+    def vollstaendig(self, *bausteine, mitglieder=None):
+        """
+        Members who have completed all of the given Bausteine
+
+        The arguments are the same as for :meth:`fehlend`.
+
+        Returns:
+            :obj:`list` of :obj:`int`: Member ids
+        """
+        rows, complete = self._complete(bausteine, mitglieder)
+        return [self.mitglieder[row] for row, ok in zip(rows, complete) if ok]
+
+    def anzahl(self):
+        """
+        Number of members who completed each Baustein
+
+        Returns:
+            dict
+        """
+        if isinstance(self.erledigt, list):
+            return {name: sum(row >> col & 1 for row in self.erledigt)
+                    for name, col in self._cols.items()}
+        return dict(zip(self.bausteine,
+                        self.erledigt.sum(axis=0).tolist()))
+
+    def tabelle(self):
+        """
+        The matrix as rows for exporting
+
+        Returns:
+            :obj:`list` of :obj:`list`: A header row followed by one row per
+            member with the completion dates (empty if missing)
+        """
+        rows = [['id', 'name'] + self.bausteine]
+        for mglId in self.mitglieder:
+            row = self._rows[mglId]
+            rows.append([mglId, self.namen.get(mglId, '')] + [
+                datetime.date.fromordinal(int(tag)) if tag else None
+                for tag in self._tage[row]])
+        return rows
+
+    def export_csv(self, filename):
+        """
+        Write the matrix to a |CSV| file
+
+        Args:
+            filename (str): Target file
+
+        Returns:
+            :data:`None`
+        """
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            for row in self.tabelle():
+                writer.writerow(['' if x is None else
+                                 x.isoformat() if isinstance(x, datetime.date)
+                                 else x for x in row])
+
+    def export_xlsx(self, filename):
+        """
+        Write the matrix to an Excel file
+
+        Args:
+            filename (str): Target file
+
+        Returns:
+            :data:`None`
+        """
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Ausbildungen')
+        for row in self.tabelle():
+            ws.append(row)
+        wb.save(filename)
+
+
+GUELTIGKEIT = 5
+"""int: Number of years after the inspection until a |CGC| has to be
+inspected again"""
+
+
+def _date(value):
+    """Certificates use :class:`~datetime.datetime` for their dates"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+def _add_years(day, years):
+    """Same day ``years`` later. The 29th of February becomes the 28th."""
+    try:
+        return day.replace(year=day.year + years)
+    except ValueError:
+        return day.replace(year=day.year + years, day=28)
+
+
+def _person(nachname, vorname, geburtsdatum):
+    """Key for joining certificates and members"""
+    return ((nachname or '').strip().lower(), (vorname or '').strip().lower(),
+            _date(geburtsdatum))
+
+
+class FzStatus:
+    """
+    Status of the |CGC| of a single leader
+
+    Args:
+        mitglied (:class:`~.schemas.mgl.SearchMitglied`): The leader
+        bescheinigung (:class:`~.schemas.cogc.Bescheinigung`): Latest
+            inspected certificate. :data:`None` if there is none.
+        stichtag (:class:`~datetime.date`): Reference date
+        gueltigkeit (int): Validity in years after the inspection
+        warnung (int): Number of days before the expiry from which on the
+            status is ``laeuft_ab``
+    """
+    def __init__(self, mitglied, bescheinigung, stichtag, gueltigkeit,
+                 warnung):
+        self.mitglied = mitglied
+        """:class:`~.schemas.mgl.SearchMitglied`: The leader"""
+        self.bescheinigung = bescheinigung
+        """:class:`~.schemas.cogc.Bescheinigung`: Latest inspected
+        certificate"""
+        self.einsicht = _date(getattr(bescheinigung, 'datumEinsicht', None))
+        """:class:`~datetime.date`: Day of the inspection"""
+        self.ablauf = _add_years(self.einsicht, gueltigkeit) \
+            if self.einsicht else None
+        """:class:`~datetime.date`: Day on which the inspection expires"""
+        if self.ablauf is None:
+            self.status = 'fehlt'
+        elif self.ablauf < stichtag:
+            self.status = 'abgelaufen'
+        elif (self.ablauf - stichtag).days <= warnung:
+            self.status = 'laeuft_ab'
+        else:
+            self.status = 'gueltig'
+        """str: One of ``gueltig``, ``laeuft_ab``, ``abgelaufen`` and
+        ``fehlt``"""
+
+    def __repr__(self):
+        return f'<FzStatus({self.mitglied.id}, {self.status}, ' + \
+            f'{self.ablauf})>'
+
+
+class FzReport(list):
+    """
+    List of :class:`FzStatus`, one per leader, most urgent first
+
+    Args:
+        stichtag (:class:`~datetime.date`): Reference date
+    """
+    def __init__(self, stichtag, entries=()):
+        super().__init__(entries)
+        self.stichtag = stichtag
+        """:class:`~datetime.date`: Reference date"""
+
+    def __repr__(self):
+        counts = ', '.join(f'{k}: {v}' for k, v in self.anzahl().items())
+        return f'<FzReport({self.stichtag}, {counts})>'
+
+    def anzahl(self):
+        """
+        Number of leaders per status
+
+        Returns:
+            dict
+        """
+        counts = dict.fromkeys(['fehlt', 'abgelaufen', 'laeuft_ab',
+                                'gueltig'], 0)
+        for entry in self:
+            counts[entry.status] += 1
+        return counts
+
+    def mit_status(self, *status):
+        """
+        All leaders with one of the given status
+
+        Args:
+            *status (str): E.g. ``'fehlt', 'abgelaufen'``
+
+        Returns:
+            :obj:`list` of :class:`FzStatus`
+        """
+        return [x for x in self if x.status in status]
+
+    def tabelle(self):
+        """
+        The report as rows for exporting
+
+        Returns:
+            :obj:`list` of :obj:`dict`
+        """
+        return [{'id': x.mitglied.id, 'name': _name(x.mitglied),
+                 'status': x.status, 'einsicht': x.einsicht,
+                 'ablauf': x.ablauf} for x in self]
+
+
+_DRINGLICHKEIT = {'fehlt': 0, 'abgelaufen': 1, 'laeuft_ab': 2, 'gueltig': 3}
+
+
+def fz_report(leiter, bescheinigungen, stichtag=None,
+              gueltigkeit=GUELTIGKEIT, warnung=90):
+    """
+    Join certificates with leaders and compute the status of each leader
+
+    Certificates are assigned to members by last name, first name and birth
+    date. The certificate with the latest inspection counts.
+
+    Args:
+        leiter (:obj:`list` of :class:`~.schemas.mgl.SearchMitglied`):
+            Leaders with the attributes ``vorname``, ``nachname`` and
+            ``geburtsDatum``
+        bescheinigungen (:obj:`list` of :obj:`tuple`): Pairs of
+            :class:`~.schemas.cogc.SearchBescheinigung` and the corresponding
+            :class:`~.schemas.cogc.Bescheinigung`
+        stichtag (:class:`~datetime.date`, optional): Reference date.
+            Defaults to today.
+        gueltigkeit (:obj:`int`, optional): Validity in years. Defaults to
+            :data:`GUELTIGKEIT`.
+        warnung (:obj:`int`, optional): Days before the expiry from which on
+            a certificate is reported as ``laeuft_ab``. Defaults to 90.
+
+    Returns:
+        FzReport
+    """
+    stichtag = stichtag or datetime.date.today()
+    latest = {}
+    for result, detail in bescheinigungen:
+        einsicht = _date(detail.datumEinsicht)
+        if einsicht is None:
+            continue
+        key = _person(result.empfNachname, result.empfVorname,
+                      result.empfGebDatum)
+        if key not in latest or \
+                einsicht > _date(latest[key].datumEinsicht):
+            latest[key] = detail
+
+    report = FzReport(stichtag, (
+        FzStatus(mgl, latest.get(_person(mgl.nachname, mgl.vorname,
+                                         mgl.geburtsDatum)),
+                 stichtag, gueltigkeit, warnung) for mgl in leiter))
+    report.sort(key=lambda x: (_DRINGLICHKEIT[x.status],
+                               x.ablauf or datetime.date.min))
+    return report
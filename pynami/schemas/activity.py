@@ -4,7 +4,8 @@ Schemas for activities
 """
 from marshmallow import fields
 
-from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel
+from .base import BaseSchema, BaseSearchSchema, TrackedModel, \
+    BaseSearchModel, NamiDate, NamiDateTime
 
 
 class SearchActivity(BaseSearchModel):
@@ -44,16 +45,16 @@ class SearchActivitySchema(BaseSearchSchema):
     """
     __model__ = SearchActivity
 
-    entries_aktivBis = fields.Date(allow_none=True, attribute='aktivBis')
+    entries_aktivBis = NamiDate(allow_none=True, attribute='aktivBis')
     """:class:`~datetime.datetime`: End date"""
     entries_beitragsArt = fields.String(attribute='beitragsArt')
     """str: Fee type"""
     entries_caeaGroup = fields.String(attribute='caeaGroup')
     """str: Access rights for the group"""
-    entries_aktivVon = fields.Date(allow_none=True, attribute='aktivVon')
+    entries_aktivVon = NamiDate(allow_none=True, attribute='aktivVon')
     """:class:`~datetime.datetime`: Start date"""
-    entries_anlagedatum = fields.DateTime(allow_none=True,
-                                          attribute='anlageDatum')
+    entries_anlagedatum = NamiDateTime(allow_none=True,
+                                       attribute='anlageDatum')
     """:class:`~datetime.datetime`: Creation date"""
     entries_caeaGroupForGf = fields.String(attribute='caeaGroupForGf')
     """str: Access rights for sub group"""
@@ -67,7 +68,7 @@ class SearchActivitySchema(BaseSearchSchema):
     """str: Member"""
 
 
-class Activity(BaseModel):
+class Activity(TrackedModel):
     """
     Main class for activities directly obtained by their id.
 
@@ -112,9 +113,9 @@ class ActivitySchema(BaseSchema):
     """str: Tier or group association"""
     untergliederungId = fields.Integer(load_only=True)
     """int: tier or sub group id"""
-    aktivVon = fields.Date()
+    aktivVon = NamiDate()
     """:class:`~datetime.datetime`: Start date"""
-    aktivBis = fields.Date(allow_none=True)
+    aktivBis = NamiDate(allow_none=True)
     """:class:`~datetime.datetime`: End date"""
     beitragsArtId = fields.Integer(allow_none=True, dump_only=True)
     """int: Fee type"""
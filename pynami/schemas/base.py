@@ -2,8 +2,11 @@
 """
 This module contains some base classes
 """
+import datetime
+import functools
 from collections import OrderedDict
-from marshmallow import Schema, pre_load, fields, post_load
+from collections.abc import Sequence
+from marshmallow import Schema, pre_load, fields, post_load, EXCLUDE
 
 from ..util import validate_iban
 
@@ -87,8 +90,9 @@ class BaseModel:
             dict: All data entries which are not in the blacklist
         """
         return {k: v for k, v in vars(self).items() if v is not None
-                and v != '' and k not in (self._field_blacklist if not
-                field_blacklist else field_blacklist)}
+                and v != '' and not k.startswith('_') and k not in
+                (self._field_blacklist if not field_blacklist else
+                 field_blacklist)}
 
     def tabulate(self, elements=None):
         """
@@ -107,6 +111,85 @@ class BaseModel:
         return d
 
 
+def _snapshot(value):
+    """
+    Create a comparable copy of an attribute value
+
+    Nested models are converted to a :obj:`dict` of their public attributes so
+    that changes inside of them (e.g. the payment details of a Mitglied) are
+    detected as well.
+
+    Args:
+        value: Attribute value
+
+    Returns:
+        A copy of the value which can be compared with ``==``
+    """
+    if isinstance(value, BaseModel):
+        return {k: _snapshot(v) for k, v in vars(value).items()
+                if not k.startswith('_')}
+    if isinstance(value, (list, tuple)):
+        return [_snapshot(x) for x in value]
+    return value
+
+
+class TrackedModel(BaseModel):
+    """
+    Base class for all classes which can be written back to the |NAMI|.
+
+    Right after loading all attribute values are remembered. This way later
+    modifications can be detected and unchanged data sets do not have to be
+    sent to the |NAMI| at all.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.mark_clean()
+
+    def mark_clean(self):
+        """
+        Take the current attribute values as the new unmodified state.
+
+        Returns:
+            :data:`None`
+        """
+        object.__setattr__(self, '_original',
+                           {k: _snapshot(v) for k, v in vars(self).items()
+                            if not k.startswith('_')})
+
+    def diff(self):
+        """
+        Compare the current attribute values with those after loading.
+
+        Returns:
+            dict: Names of all modified attributes with a tuple of the old and
+            the new value. Nested models are represented as :obj:`dict`.
+            Objects that were unpickled from an older version without a
+            reference state report all their attributes as modified.
+        """
+        original = vars(self).get('_original', {})
+        changes = {}
+        for k, v in vars(self).items():
+            if k.startswith('_'):
+                continue
+            new = _snapshot(v)
+            if k not in original or original[k] != new:
+                changes[k] = (original.get(k), new)
+        for k in original.keys() - vars(self).keys():
+            changes[k] = (original[k], None)
+        return changes
+
+    @property
+    def changed(self):
+        """:obj:`set` of :obj:`str`: Names of all modified attributes"""
+        return set(self.diff())
+
+    @property
+    def is_dirty(self):
+        """bool: If any attribute has been modified since loading"""
+        return bool(self.diff())
+
+
 class BaseSearchModel(BaseModel):
     """
     Base class for all classes that are loaded from a :class:`BaseSearchSchema`
@@ -125,12 +208,73 @@ class BaseSearchModel(BaseModel):
         return self.representedClass.split(".")[-1]
 
 
+@functools.lru_cache(maxsize=8192)
+def parse_nami_datetime(value):
+    """
+    Parse a datetime string in the |NAMI| format ``'%Y-%m-%d %H:%M:%S'``.
+
+    The string is split at fixed positions which is much faster than
+    :meth:`~datetime.datetime.strptime`. Other ISO 8601 like strings (e.g.
+    a date without time) are parsed with
+    :meth:`~datetime.datetime.fromisoformat`. Results are memoised because
+    many rows share the same values (e.g. entry dates).
+
+    Args:
+        value (str): Datetime string
+
+    Raises:
+        ValueError: If the string cannot be parsed
+
+    Returns:
+        :class:`~datetime.datetime`: The parsed value
+    """
+    if len(value) != 19 or value[4] != '-' or value[7] != '-' or \
+            value[10] != ' ' or value[13] != ':' or value[16] != ':':
+        return datetime.datetime.fromisoformat(value)
+    return datetime.datetime(int(value[0:4]), int(value[5:7]),
+                             int(value[8:10]), int(value[11:13]),
+                             int(value[14:16]), int(value[17:19]))
+
+
+class NamiDateTime(fields.DateTime):
+    """
+    :class:`~marshmallow.fields.DateTime` field with a fast path for the
+    |NAMI| format (see :func:`parse_nami_datetime`).
+
+    Other formats are handled by the base class.
+    """
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, str):
+            try:
+                return parse_nami_datetime(value)
+            except ValueError:
+                pass
+        return super()._deserialize(value, attr, data, **kwargs)
+
+
+class NamiDate(fields.Date):
+    """
+    :class:`~marshmallow.fields.Date` field with a fast path for the |NAMI|
+    format (see :func:`parse_nami_datetime`).
+
+    Other formats are handled by the base class.
+    """
+    def _deserialize(self, value, attr, data, **kwargs):
+        if isinstance(value, str):
+            try:
+                return parse_nami_datetime(value).date()
+            except ValueError:
+                pass
+        return super()._deserialize(value, attr, data, **kwargs)
+
+
 class BaseSchema(Schema):
     """
     Base class for all Schemas in this module
 
     It handles the formatting of dates so that the fields in the derived
-    classes can be standard :class:`~marshmallow.fields.DateTime` field.
+    classes can be :class:`NamiDateTime` and :class:`NamiDate` fields without
+    further arguments.
 
     Note:
         This class can not be used on its own but only as a derived class.
@@ -150,6 +294,32 @@ class BaseSchema(Schema):
         part is only zeroes. However it can happen that the incoming value has
         time information as well."""
 
+    @classmethod
+    def projected(cls, attrs=None):
+        """
+        Get a schema instance which only loads some attributes.
+
+        All other fields of the incoming data are skipped, so neither their
+        values are decoded nor are they set on the created objects. The
+        fields of :class:`BaseSearchSchema` are always included. The
+        instances are cached per set of attributes.
+
+        Args:
+            attrs (:obj:`list` of :obj:`str`, optional): Attribute names of
+                the model class (e.g. ``'vorname'`` for
+                :class:`~.mgl.SearchMitglied`). If empty all fields are
+                loaded.
+
+        Raises:
+            ValueError: For attributes that are not defined in this schema
+
+        Returns:
+            BaseSchema: The schema instance
+        """
+        if not attrs:
+            return cls()
+        return _projected_schema(cls, frozenset(attrs))
+
     @pre_load
     def correctEmptySTrings(self, data, **kwargs):
         """
@@ -194,6 +364,29 @@ class BaseSchema(Schema):
         return self.__model__(**data)
 
 
+@functools.lru_cache(maxsize=128)
+def _projected_schema(cls, attrs):
+    """
+    Create a schema instance for :meth:`BaseSchema.projected`
+
+    Args:
+        cls (:std:term:`class`): Schema class
+        attrs (frozenset): Attribute names
+
+    Returns:
+        BaseSchema: The schema instance
+    """
+    declared = cls._declared_fields
+    by_attr = {(f.attribute or name): name for name, f in declared.items()}
+    unknown = attrs - by_attr.keys()
+    if unknown:
+        raise ValueError(f'{cls.__name__} has no fields for {sorted(unknown)}')
+    only = {by_attr[x] for x in attrs}
+    only |= {name for name in BaseSearchSchema._declared_fields
+             if name in declared}
+    return cls(only=only, unknown=EXCLUDE)
+
+
 class BaseSearchSchema(BaseSchema):
     """
     Base class for all schemas that describe search results.
@@ -210,3 +403,93 @@ class BaseSearchSchema(BaseSchema):
     :attr:`representedClass`."""
     representedClass = fields.String()
     """str: |NAMI| class structure"""
+
+
+class LazyList(Sequence):
+    """
+    Read-only list of search results which are only loaded on access.
+
+    The raw data rows are kept as they were received from the |NAMI|. Each
+    row is loaded into its model class the first time it is accessed.
+    Counting, slicing and reading single attributes of all rows (see
+    :meth:`column` and :meth:`ids`) work without creating any objects.
+
+    Example:
+        .. code-block:: python
+            :caption: Get the full data set of all Wölflinge without decoding
+                      the search results
+
+            results = nami.search(untergliederungId=1, lazy=True)
+            print(len(results))
+            mitglieder = [nami.mitglied(x) for x in results.ids()]
+
+    Args:
+        schema (:class:`BaseSchema`): Schema instance for loading a row
+        rows (list): Raw data rows
+    """
+    def __init__(self, schema, rows):
+        self._schema = schema
+        self._rows = rows
+        self._loaded = {}
+
+    def __repr__(self):
+        return f'<LazyList({len(self)} {self._schema.__model__.__name__}, ' + \
+            f'{len(self._loaded)} loaded)>'
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return LazyList(self._schema, self._rows[index])
+        if index < 0:
+            index += len(self._rows)
+        if not 0 <= index < len(self._rows):
+            raise IndexError('LazyList index out of range')
+        if index not in self._loaded:
+            self._loaded[index] = self._schema.load(dict(self._rows[index]))
+        return self._loaded[index]
+
+    @property
+    def rows(self):
+        """:obj:`list` of :obj:`dict`: The raw data rows"""
+        return self._rows
+
+    def column(self, attr):
+        """
+        Load a single attribute of all rows without creating the objects.
+
+        Args:
+            attr (str): Attribute name of the model class (e.g. ``'vorname'``
+                for :class:`~.mgl.SearchMitglied`)
+
+        Raises:
+            KeyError: If the schema has no field for this attribute
+
+        Returns:
+            list: The loaded values in the order of the rows
+        """
+        for name, field in self._schema.fields.items():
+            if (field.attribute or name) == attr:
+                break
+        else:
+            raise KeyError(attr)
+        key = field.data_key or name
+        empty_none = isinstance(field, (fields.DateTime, fields.Date,
+                                        fields.Email))
+        values = []
+        for row in self._rows:
+            value = row.get(key)
+            if empty_none and value == '':
+                value = None
+            values.append(field.deserialize(value, key, row))
+        return values
+
+    def ids(self):
+        """
+        Ids of all rows
+
+        Returns:
+            list: The raw ids
+        """
+        return [row['id'] for row in self._rows]
@@ -5,7 +5,8 @@ conduct.
 """
 from marshmallow import fields, pre_load
 
-from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel
+from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel, \
+    NamiDateTime
 from ..util import extract_url
 
 
@@ -61,7 +62,7 @@ class SearchBescheinigungSchema(BaseSearchSchema):
     """
     __model__ = SearchBescheinigung
 
-    entries_erstelltAm = fields.DateTime(attribute='erstelltAm')
+    entries_erstelltAm = NamiDateTime(attribute='erstelltAm')
     """:class:`~datetime.datetime`: Entry creation date"""
     entries_fzNummer = fields.String(attribute='fzNummer')
     """str: Number of the |CGC|"""
@@ -71,12 +72,12 @@ class SearchBescheinigungSchema(BaseSearchSchema):
     """str: Surname"""
     entries_empfVorname = fields.String(attribute='empfVorname')
     """str: First name"""
-    entries_empfGebDatum = fields.DateTime(attribute='empfGebDatum')
+    entries_empfGebDatum = NamiDateTime(attribute='empfGebDatum')
     """:class:`~datetime.datetime`: Birth date"""
-    entries_datumEinsicht = fields.DateTime(allow_none=True,
-                                            attribute='datumEinsicht')
+    entries_datumEinsicht = NamiDateTime(allow_none=True,
+                                         attribute='datumEinsicht')
     """:class:`~datetime.datetime`: Inspection date. May be empty."""
-    entries_fzDatum = fields.DateTime(attribute='fzDatum')
+    entries_fzDatum = NamiDateTime(attribute='fzDatum')
     """:class:`~datetime.datetime`: Date of the |CGC|"""
     entries_autor = fields.String(attribute='autor')
     """str: Person who did the inspection"""
@@ -121,19 +122,19 @@ class BescheinigungSchema(BaseSchema):
 
     id = fields.Integer()
     """int: Id of this certificate"""
-    fzDatum = fields.DateTime()
+    fzDatum = NamiDateTime()
     """:class:`~datetime.datetime`: Date of the |CGC|"""
     fzNummer = fields.String()
     """str: Number of the |CGC|"""
     empfaenger = fields.String()
     """str: Receiver"""
-    erstelltAm = fields.DateTime()
+    erstelltAm = NamiDateTime()
     """:class:`~datetime.datetime`: Entry creation date"""
     autor = fields.String()
     """str: Person who did the inspection"""
     download = fields.Url(relative=True)
     """str: Relative download |URL|"""
-    datumEinsicht = fields.DateTime(allow_none=True)
+    datumEinsicht = NamiDateTime(allow_none=True)
     """:class:`~datetime.datetime`: Inspection date. May be empty."""
 
     @pre_load
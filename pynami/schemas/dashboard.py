@@ -4,7 +4,8 @@ Schemas for dashboard functionalities
 """
 from marshmallow import fields
 
-from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel
+from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel, \
+    NamiDateTime
 
 
 class Notification(BaseSearchModel):
@@ -36,7 +37,7 @@ class NotificationSchema(BaseSearchSchema):
     """int: Object id"""
     entries_objectClass = fields.String(attribute='objectClass')
     """str: |NAMI| class"""
-    entries_entryDate = fields.DateTime(attribute='entryDate')
+    entries_entryDate = NamiDateTime(attribute='entryDate')
     """:class:`~datetime.datetime`: Date of the event"""
     entries_id = fields.Integer(attribute='id_')
     """int: Id of the event"""
@@ -4,7 +4,8 @@ This module contains classes for group admin (`Gruppierungsverwaltung`) stuff
 """
 from marshmallow import fields, pre_load
 
-from .base import BaseSchema, BaseModel, BaseSearchSchema, BaseSearchModel
+from .base import BaseSchema, BaseModel, BaseSearchSchema, BaseSearchModel, \
+    NamiDate, NamiDateTime
 from ..util import extract_url
 
 
@@ -64,7 +65,7 @@ class SearchInvoiceSchema(BaseSearchSchema):
 
     entries_rechnungsLauf = fields.Integer(attribute='rechnungsverlauf')
     """int: Internal invoice number"""
-    entries_reCreated = fields.DateTime(attribute='reCreated')
+    entries_reCreated = NamiDateTime(attribute='reCreated')
     """:class:`~datetime.datetime`: Creation date of the invoice"""
     entries_kontoOwnerId = fields.Integer(attribute='kontoOwnerId')
     """int: Id of the account owner"""
@@ -72,7 +73,7 @@ class SearchInvoiceSchema(BaseSearchSchema):
     """str: |NAMI| class"""
     entries_reNr = fields.String(attribute='reNr')
     """str: Official invoice number"""
-    entries_freigabeDatum = fields.DateTime(attribute='freigabeDatum')
+    entries_freigabeDatum = NamiDateTime(attribute='freigabeDatum')
     """:class:`~datetime.datetime`: """
     entries_rechnungsEmpfaenger = \
         fields.String(attribute='rechnungsEmpfaenger')
@@ -97,10 +98,10 @@ class SearchInvoiceSchema(BaseSearchSchema):
     """str: Netto amount including currency"""
     entries_kreditor = fields.String(attribute='kreditor')
     """str: May be empty"""
-    entries_reDatum = fields.Date(attribute='reDatum')
+    entries_reDatum = NamiDate(attribute='reDatum')
     """:class:`~datetime.datetime`: Date of the invoice"""
-    entries_einzugsDatum = fields.Date(allow_none=True,
-                                       attribute='einzugsDatum')
+    entries_einzugsDatum = NamiDate(allow_none=True,
+                                    attribute='einzugsDatum')
     """:class:`~datetime.datetime`: Date of money collection"""
     entries_displayName = fields.String(attribute='displayName')
     """str: Human-readable string describing the invoice"""
@@ -153,9 +154,9 @@ class InvoiceSchema(BaseSchema):
 
     id = fields.Integer()
     """int: |NAMI| id"""
-    reDatum = fields.Date()
+    reDatum = NamiDate()
     """:class:`~datetime.datetime`: Date of the invoice"""
-    reCreated = fields.DateTime()
+    reCreated = NamiDateTime()
     """:class:`~datetime.datetime`: Creation date of the invoice"""
     reNr = fields.String()
     """str: Official invoice number"""
@@ -163,7 +164,7 @@ class InvoiceSchema(BaseSchema):
     """str: If the invoice has been released"""
     debitor = fields.String()
     """str: Id of the debitor"""
-    freigabeDatum = fields.DateTime()
+    freigabeDatum = NamiDateTime()
     """:class:`~datetime.datetime`: When the invoice was released"""
     debitor_document_id = fields.Integer()
     """int: Some other internal id"""
@@ -173,7 +174,7 @@ class InvoiceSchema(BaseSchema):
     """str: Human-readable string describing the invoice"""
     debitorName = fields.String()
     """str: Debitor, e.g. a group"""
-    einzugsDatum = fields.Date(allow_none=True)
+    einzugsDatum = NamiDate(allow_none=True)
     """:class:`~datetime.datetime`: Date of money collection"""
     zahlungsweise = fields.String()
     """str: Way of payment (e.g. ``'Lastschrift'``)"""
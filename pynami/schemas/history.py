@@ -4,7 +4,8 @@ Schemas for history entries
 """
 from marshmallow import fields
 
-from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel
+from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel, \
+    NamiDateTime
 
 
 class HistoryEntry(BaseSearchModel):
@@ -54,7 +55,7 @@ class HistoryEntrySchema(BaseSearchSchema):
     """int: Object id (not the |NAMI| id for addressing the entry)"""
     entries_objectClass = fields.String(attribute='objectClass')
     """str: |NAMI| class"""
-    entries_entryDate = fields.DateTime(attribute='entryDate')
+    entries_entryDate = NamiDateTime(attribute='entryDate')
     """:class:`~datetime.datetime`: Date of the event"""
     entries_id = fields.Integer(attribute='id_')
     """int: |NAMI| id"""
@@ -109,7 +110,7 @@ class MitgliedHistorySchema(BaseSchema):
 
     id = fields.Integer()
     """int: |NAMI| id"""
-    entryDate = fields.DateTime()
+    entryDate = NamiDateTime()
     """:class:`~datetime.datetime`: Date of the event"""
     actor = fields.String()
     """str: Name of the person who created the change including the id"""
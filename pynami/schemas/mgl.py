@@ -2,11 +2,11 @@
 """
 Schemas for operations on members
 """
-import json
 from marshmallow import fields, pre_load, post_dump
 
-from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel
-from ..util import validate_iban
+from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel, \
+    TrackedModel, NamiDate, NamiDateTime
+from ..util import validate_iban, json_dumps
 
 
 class NamiKonto(BaseModel):
@@ -90,7 +90,7 @@ class NamiKontoSchema(BaseSchema):
         Returns:
             str: A :mod:`json` formatted string
         """
-        return json.dumps(data, separators=(',', ':'))
+        return json_dumps(data)
 
 
 class SearchMitglied(BaseSearchModel):
@@ -135,13 +135,13 @@ class SearchMitgliedSchema(BaseSearchSchema):
     """
     __model__ = SearchMitglied
 
-    entries_austrittsDatum = fields.Date(attribute='austrittsDatum',
-                                         allow_none=True)
+    entries_austrittsDatum = NamiDate(attribute='austrittsDatum',
+                                      allow_none=True)
     """:class:`~datetime.date`: Date of the end of membership"""
     entries_beitragsarten = fields.String(attribute='beitragsarten')
     """str: Fee type"""
-    entries_eintrittsdatum = fields.Date(attribute='eintrittsdatum',
-                                         allow_none=True)
+    entries_eintrittsdatum = NamiDate(attribute='eintrittsdatum',
+                                      allow_none=True)
     """:class:`~datetime.date`: Start of membership"""
     entries_email = fields.Email(attribute="email", allow_none=True)
     """str: Primary member email"""
@@ -157,7 +157,7 @@ class SearchMitgliedSchema(BaseSearchSchema):
     """int: Id of the first tier. This may be empty."""
     entries_fixBeitrag = fields.String(attribute="fixBeitrag", allow_none=True)
     """str: Defaults to ``null``."""
-    entries_geburtsDatum = fields.Date(attribute='geburtsDatum')
+    entries_geburtsDatum = NamiDate(attribute='geburtsDatum')
     """:class:`~datetime.date`: Birth date"""
     entries_genericField1 = fields.String(attribute="genericField1",
                                           allow_none=True)
@@ -176,7 +176,7 @@ class SearchMitgliedSchema(BaseSearchSchema):
     entries_kontoverbindung = fields.String(attribute='kontoverbindung')
     """str: Account details. For some reason this is not always transmitted and
     may therefore be empty."""
-    entries_lastUpdated = fields.DateTime(attribute='lastUpdated')
+    entries_lastUpdated = NamiDateTime(attribute='lastUpdated')
     """:class:`~datetime.datetime`: Date of the last update"""
     entries_mglType = fields.String(attribute='mglType')
     """str: Type of membership (e.g. ``'Mitglied'``)"""
@@ -227,7 +227,7 @@ class SearchMitgliedSchema(BaseSearchSchema):
     """str: Group id as a string"""
 
 
-class Mitglied(BaseModel):
+class Mitglied(TrackedModel):
     """
     Main class representing a |NAMI| Mitglied
 
@@ -247,17 +247,25 @@ class Mitglied(BaseModel):
     def __str__(self):
         return f'{self.vorname} {self.nachname}'
 
-    def update(self, nami):
+    def update(self, nami, force=False):
         """
         Writes the possibly changed values to the |NAMI|
 
+        If no attribute has been modified since loading (see
+        :meth:`~.base.TrackedModel.diff`) nothing is sent.
+
         Args:
             nami (:class:`~pynami.nami.NaMi`): Main class for communication
                 with the |NAMI|
+            force (:obj:`bool`, optional): Send the data set even if nothing
+                has changed. Defaults to :data:`False`.
 
         Returns:
-            Mitglied: The new Mitglied as it is returned by the |NAMI|
+            Mitglied: The new Mitglied as it is returned by the |NAMI| or this
+            object if there was nothing to update.
         """
+        if not force and not self.is_dirty:
+            return self
         userjson = MitgliedSchema().dump(self)
         return nami.mitglied(self.id, 'PUT', json=userjson)
 
@@ -268,13 +276,13 @@ class MitgliedSchema(BaseSchema):
     """
     __model__ = Mitglied
 
-    austrittsDatum = fields.Date(allow_none=True, load_only=True)
+    austrittsDatum = NamiDate(allow_none=True, load_only=True)
     """:class:`~datetime.date`: Date of the end of membership"""
     beitragsart = fields.String(allow_none=True)
     """str: Fee type"""
     beitragsartId = fields.Integer(allow_none=True)
     """int: Id of the fee type"""
-    eintrittsdatum = fields.Date()
+    eintrittsdatum = NamiDate()
     """:class:`~datetime.date`: Start of membership"""
     email = fields.Email(allow_none=True)
     """str: Primary member email"""
@@ -290,7 +298,7 @@ class MitgliedSchema(BaseSchema):
     """int: Id of the first tier. This may be empty."""
     fixBeitrag = fields.String(allow_none=True)
     """str: Defaults to ``null``."""
-    geburtsDatum = fields.Date()
+    geburtsDatum = NamiDate()
     """:class:`~datetime.date`: Birth date"""
     genericField1 = fields.String(allow_none=True)
     """str: Not sure why these even exist."""
@@ -326,7 +334,7 @@ class MitgliedSchema(BaseSchema):
     """str: Address country"""
     landId = fields.Integer()
     """int: Id of the address country"""
-    lastUpdated = fields.DateTime(load_only=True)
+    lastUpdated = NamiDateTime(load_only=True)
     """:class:`~datetime.datetime`: Date of the last update. This value is not
     dumped when updating a :class:`Mitglied`."""
     mglType = fields.String()
@@ -4,7 +4,8 @@ Schemas for trainings
 """
 from marshmallow import fields
 
-from .base import BaseSchema, BaseSearchSchema, BaseModel, BaseSearchModel
+from .base import BaseSchema, BaseSearchSchema, TrackedModel, \
+    BaseSearchModel, NamiDate
 
 
 class SearchAusbildung(BaseSearchModel):
@@ -44,7 +45,7 @@ class SearchAusbildungSchema(BaseSearchSchema):
     """
     __model__ = SearchAusbildung
 
-    entries_vstgTag = fields.Date(attribute='vstgTag')
+    entries_vstgTag = NamiDate(attribute='vstgTag')
     """:class:`~datetime.date`: Day of the training event"""
     entries_veranstalter = fields.String(attribute='veranstalter')
     """str: Who organized the event (e.g. a `Bezirk`)"""
@@ -58,7 +59,7 @@ class SearchAusbildungSchema(BaseSearchSchema):
     """str: Who absolved the training"""
 
 
-class Ausbildung(BaseModel):
+class Ausbildung(TrackedModel):
     """
     Main class for a training obtained directly from its id.
 
@@ -88,7 +89,7 @@ class AusbildungSchema(BaseSchema):
     """int: Id of the training"""
     mitglied = fields.String()
     """str: Who absolved the training"""
-    vstgTag = fields.Date()
+    vstgTag = NamiDate()
     """:class:`~datetime.date`: Day of the training event"""
     vstgName = fields.String()
     """str: Name of the event"""
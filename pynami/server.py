@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""
+Local |HTTP| service which shares one |NAMI| session between several tools.
+
+The service holds a single authenticated :class:`~pynami.nami.NaMi`
+instance. Read requests are answered from a cache, identical requests
+arriving at the same time are coalesced and cached entries are refreshed in
+the background before they expire. Changes of members are forwarded to the
+|NAMI|. This way authentication, caching and rate limiting happen in one
+place.
+
+All answers are |JSON| documents. Dates are given as ISO 8601 strings.
+
+======  ===========================  ==================================
+Method  Path                         Answer
+======  ===========================  ==================================
+GET     ``/mitglieder``              :meth:`~pynami.nami.NaMi.search_all`
+GET     ``/mitglieder/<id>``         :meth:`~pynami.nami.NaMi.mitglied`
+PUT     ``/mitglieder/<id>``         Changed member
+GET     ``/history``                 :meth:`~pynami.nami.NaMi.history`
+GET     ``/hierarchy``               :meth:`~pynami.nami.NaMi.hierarchy`
+GET     ``/lookups``                 Names of the lookup tables
+GET     ``/lookups/<name>``          Lookup table, see :data:`.export.LOOKUPS`
+======  ===========================  ==================================
+
+The list endpoints accept a ``fields`` query parameter with comma separated
+attribute names. Unknown attribute names are answered with ``400 Bad
+Request``. The body of a ``PUT`` request contains only the changed
+attributes in the format of the |NAMI| |API|.
+
+The service has no authentication of its own. It binds to ``127.0.0.1`` by
+default and should not be reachable from other machines.
+
+Example:
+    .. code-block:: bash
+
+        pynami serve --port 8080 --ttl 600
+        curl http://127.0.0.1:8080/mitglieder?fields=id,vorname,nachname
+"""
+import re
+import sys
+import time
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from .bulk import SingleFlight
+from .export import LOOKUPS, plain, record
+from .nami import NamiHTTPError
+from .schemas.history import HistoryEntrySchema
+from .schemas.mgl import MitgliedSchema, SearchMitgliedSchema
+from .util import json_loads, json_dumps, JSON_DECODE_ERRORS
+
+
+class NotFound(Exception):
+    """Raised for unknown paths"""
+    pass
+
+
+class BadRequest(Exception):
+    """Raised for invalid request parameters"""
+    pass
+
+
+SESSION_ERRORS = (NamiHTTPError,) + JSON_DECODE_ERRORS
+""":obj:`tuple`: Errors after which the session is authenticated again. An
+expired session is answered with an |HTTP| error or with the login page
+(which is not valid |JSON|)."""
+
+
+def _node(node):
+    """Nested representation of a :class:`~.hierarchy.HierarchyNode`"""
+    return {'id': node.id, 'descriptor': node.descriptor,
+            'level': node.level,
+            'children': [_node(x) for x in node.children]}
+
+
+class NamiProxy:
+    """
+    Cached and coalesced access to a :class:`~pynami.nami.NaMi` session
+
+    Args:
+        nami (:class:`~pynami.nami.NaMi`): Authenticated session
+        ttl (:obj:`float`, optional): Maximum age of cached answers in
+            seconds. Defaults to 300.
+        refresh (:obj:`float`, optional): Cached answers older than this are
+            renewed by a background thread. Defaults to 80 % of ``ttl``.
+            Answers which have not been asked for within ``ttl`` are dropped
+            instead.
+        maxsize (:obj:`int`, optional): Maximum number of cached answers.
+            The least recently used ones are dropped first. Defaults to 256.
+    """
+    def __init__(self, nami, ttl=300, refresh=None, maxsize=256):
+        self.nami = nami
+        self.ttl = ttl
+        self.refresh = 0.8 * ttl if refresh is None else refresh
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        # key -> (loaded, body, func, last read)
+        self._cache = OrderedDict()
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0
+        self._inflight = SingleFlight()
+        self._stop = threading.Event()
+        self._thread = None
+        # pattern, function, if fields are accepted, schema of the fields
+        self._routes = [
+            (re.compile(r'/mitglieder'), self._mitglieder, True,
+             SearchMitgliedSchema),
+            (re.compile(r'/mitglieder/(\d+)'), self._mitglied, False, None),
+            (re.compile(r'/history'), self._history, True,
+             HistoryEntrySchema),
+            (re.compile(r'/hierarchy'), self._hierarchy, False, None),
+            (re.compile(r'/lookups'), lambda: list(LOOKUPS), False, None),
+            (re.compile(r'/lookups/(\w+)'), self._lookup, True, None)]
+
+    def _mitglieder(self, fields=None):
+        return [record(x, fields) for x in
+                self.nami.search_all(lazy=True, fields=fields)]
+
+    def _mitglied(self, mglId):
+        return record(self.nami.mitglied(int(mglId)))
+
+    def _history(self, fields=None):
+        return [record(x, fields) for x in self.nami.history(fields=fields)]
+
+    def _hierarchy(self):
+        return [_node(x) for x in self.nami.hierarchy().roots]
+
+    def _lookup(self, name, fields=None):
+        if name not in LOOKUPS:
+            raise NotFound(name)
+        value = getattr(self.nami, name)
+        value = value() if callable(value) else value
+        return [record(x, fields) for x in value]
+
+    def _resolve(self, path, fields):
+        """Find the function answering a path"""
+        for pattern, func, projectable, schema in self._routes:
+            match = pattern.fullmatch(path.rstrip('/') or '/')
+            if match:
+                args = match.groups()
+                if fields and projectable:
+                    if schema is not None:
+                        try:
+                            schema.projected(fields)
+                        except ValueError as ex:
+                            raise BadRequest(str(ex))
+                    return lambda: func(*args, fields=fields)
+                return lambda: func(*args)
+        raise NotFound(path)
+
+    def get(self, path, fields=None):
+        """
+        Answer a read request
+
+        Args:
+            path (str): Request path, e.g. ``/mitglieder/12345``
+            fields (:obj:`list` of :obj:`str`, optional): Attribute names
+
+        Raises:
+            NotFound: For unknown paths
+            BadRequest: For unknown attribute names in ``fields``
+
+        Returns:
+            bytes: The |JSON| encoded answer
+        """
+        func = self._resolve(path, fields)
+        key = (path.rstrip('/'), tuple(fields or ()))
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._cache[key] = entry[:3] + (now,)
+                self._cache.move_to_end(key)
+                return entry[1]
+        return self._inflight.do(key, lambda: self._load(key, func, now))
+
+    def _call(self, func):
+        """
+        Call ``func`` and retry it once after authenticating again if the
+        session has expired. Only use this for requests which can safely be
+        sent twice.
+        """
+        generation = self._auth_generation
+        try:
+            return func()
+        except SESSION_ERRORS:
+            with self._auth_lock:
+                # Only the first of several failing threads authenticates
+                if self._auth_generation == generation:
+                    self.nami.auth()
+                    self._auth_generation += 1
+            return func()
+
+    def _load(self, key, func, read=None):
+        body = json_dumps(plain(self._call(func))).encode('utf-8')
+        with self._lock:
+            old = self._cache.get(key)
+            if read is None:
+                read = old[3] if old is not None else time.time()
+            self._cache[key] = (time.time(), body, func, read)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return body
+
+    def put_mitglied(self, mglId, changes):
+        """
+        Forward changes of a member to the |NAMI|
+
+        Args:
+            mglId (int): Member id (not |DPSG| Mitgliedsnummer)
+            changes (dict): Changed attributes in the format of the |NAMI|
+                |API|
+
+        Returns:
+            bytes: The |JSON| encoded member as returned by the |NAMI|
+        """
+        # Only the read is retried. The write may have been applied even if
+        # its answer is an error.
+        current = self._call(lambda: self.nami.mitglied(mglId))
+        data = MitgliedSchema().dump(current)
+        data.update(changes)
+        mgl = self.nami.mitglied(mglId, 'PUT', json=data)
+        self.invalidate('/mitglieder')
+        self.invalidate('/history')
+        return json_dumps(record(mgl)).encode('utf-8')
+
+    def invalidate(self, prefix=''):
+        """
+        Drop cached answers
+
+        Args:
+            prefix (:obj:`str`, optional): Only drop paths starting with this.
+                Defaults to all paths.
+
+        Returns:
+            :data:`None`
+        """
+        with self._lock:
+            for key in [k for k in self._cache if k[0].startswith(prefix)]:
+                del self._cache[key]
+
+    def _refresh_once(self):
+        """Drop unused answers and renew the others if they are due"""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, v in self._cache.items()
+                        if now - v[3] > self.ttl]:
+                del self._cache[key]
+            due = [(k, v[2]) for k, v in self._cache.items()
+                   if now - v[0] > self.refresh]
+        for key, func in due:
+            try:
+                self._inflight.do(key, lambda: self._load(key, func))
+            except Exception as ex:
+                print(f'Refreshing {key[0]} failed: {ex}', file=sys.stderr)
+
+    def _refresh_loop(self):
+        while not self._stop.wait(min(self.refresh, 60)):
+            self._refresh_once()
+
+    def start(self):
+        """Start the background refresh"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refresh_loop,
+                                            daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """
+    Request handler of the service. The :class:`NamiProxy` is taken from the
+    ``proxy`` attribute of the server.
+    """
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message):
+        self._send(status, json_dumps({'success': False,
+                                       'message': message}).encode('utf-8'))
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        fields = parse_qs(url.query).get('fields')
+        fields = [x for f in fields for x in f.split(',') if x] \
+            if fields else None
+        try:
+            self._send(200, self.server.proxy.get(url.path, fields))
+        except NotFound:
+            self._error(404, f'Unknown path: {url.path}')
+        except BadRequest as ex:
+            self._error(400, f'{ex}')
+        except Exception as ex:
+            self._error(502, f'{ex}')
+
+    def do_PUT(self):
+        match = re.fullmatch(r'/mitglieder/(\d+)/?', urlsplit(self.path).path)
+        if not match:
+            return self._error(405, 'Only members can be changed')
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            changes = json_loads(self.rfile.read(length))
+        except ValueError as ex:
+            return self._error(400, f'Invalid JSON: {ex}')
+        try:
+            self._send(200, self.server.proxy.put_mitglied(
+                int(match.group(1)), changes))
+        except Exception as ex:
+            self._error(502, f'{ex}')
+
+
+def serve(nami, host='127.0.0.1', port=8080, ttl=300, refresh=None,
+          maxsize=256):
+    """
+    Run the service until it is interrupted
+
+    Args:
+        nami (:class:`~pynami.nami.NaMi`): Authenticated session
+        host (:obj:`str`, optional): Address to bind to. Defaults to
+            ``127.0.0.1``.
+        port (:obj:`int`, optional): Port. Defaults to 8080.
+        ttl (:obj:`float`, optional): See :class:`NamiProxy`
+        refresh (:obj:`float`, optional): See :class:`NamiProxy`
+        maxsize (:obj:`int`, optional): See :class:`NamiProxy`
+
+    Returns:
+        :data:`None`
+    """
+    server = ThreadingHTTPServer((host, port), ProxyHandler)
+    server.proxy = NamiProxy(nami, ttl, refresh, maxsize)
+    server.proxy.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.proxy.stop()
+        server.server_close()
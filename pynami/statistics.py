@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+"""
+Group statistics computed locally from a member list.
+
+:attr:`~pynami.nami.NaMi.stats` only returns the few numbers the |NAMI|
+shows on its dashboard. :class:`GroupStatistics` computes further numbers
+(age per tier, gender, membership duration, joins and leaves per year, fee
+types) from a single snapshot of the member list, e.g. from
+:meth:`~pynami.nami.NaMi.search_all`. No further requests are needed.
+
+Example:
+    .. code-block:: python
+        :caption: Monthly report as an Excel file
+
+        stats = nami.statistics()
+        print(stats.geschlechter)
+        stats.export_xlsx('statistik.xlsx')
+"""
+import os
+import csv
+import datetime
+import threading
+from collections import Counter, OrderedDict
+
+from .stufenwechsel import alter_am
+
+STAT_FIELDS = ['geburtsDatum', 'geschlecht', 'eintrittsdatum',
+               'austrittsDatum', 'beitragsarten', 'stufe', 'status',
+               'version', 'lastUpdated']
+""":obj:`list` of :obj:`str`: Attributes of
+:class:`~.schemas.mgl.SearchMitglied` which are used for the statistics"""
+
+
+def _sorted(counter):
+    """Counter as :obj:`dict` sorted by its keys (missing values last)"""
+    return OrderedDict(sorted(counter.items(), key=lambda x: (
+        x[0] is None, x[0] if isinstance(x[0], int) else 0, f'{x[0]}')))
+
+
+class GroupStatistics:
+    """
+    Statistics of a member snapshot
+
+    Each figure is computed on first access and kept afterwards. Use
+    :meth:`for_snapshot` to reuse the figures of an unchanged snapshot.
+
+    Args:
+        mitglieder (:obj:`list` of :class:`~.schemas.mgl.SearchMitglied`):
+            Member snapshot with at least the attributes in
+            :data:`STAT_FIELDS`
+        stichtag (:class:`~datetime.date`, optional): Reference date for
+            ages and durations. Defaults to today.
+    """
+    _snapshots = OrderedDict()
+    _lock = threading.Lock()
+    maxsnapshots = 8
+    """int: Number of snapshots kept by :meth:`for_snapshot`"""
+
+    def __init__(self, mitglieder, stichtag=None):
+        self.mitglieder = list(mitglieder)
+        self.stichtag = stichtag or datetime.date.today()
+        self._results = {}
+
+    def __repr__(self):
+        return f'<GroupStatistics({len(self.mitglieder)} Mitglieder, ' + \
+            f'{self.stichtag})>'
+
+    @staticmethod
+    def fingerprint(mitglieder):
+        """
+        Identify a snapshot by the id and version of each member
+
+        Args:
+            mitglieder (:obj:`list` of :class:`~.schemas.mgl.SearchMitglied`):
+                Member snapshot
+
+        Returns:
+            int: Hash of the snapshot
+        """
+        return hash(frozenset((x.id, getattr(x, 'version', None),
+                               getattr(x, 'lastUpdated', None))
+                              for x in mitglieder))
+
+    @classmethod
+    def for_snapshot(cls, mitglieder, stichtag=None):
+        """
+        Get the statistics of a snapshot, reusing earlier results if the
+        members and their versions are unchanged
+
+        Args:
+            mitglieder (:obj:`list` of :class:`~.schemas.mgl.SearchMitglied`):
+                Member snapshot
+            stichtag (:class:`~datetime.date`, optional): Reference date.
+                Defaults to today.
+
+        Returns:
+            GroupStatistics
+        """
+        stichtag = stichtag or datetime.date.today()
+        key = (cls.fingerprint(mitglieder), stichtag)
+        with cls._lock:
+            stats = cls._snapshots.get(key)
+            if stats is None:
+                stats = cls._snapshots[key] = cls(mitglieder, stichtag)
+                while len(cls._snapshots) > cls.maxsnapshots:
+                    cls._snapshots.popitem(last=False)
+            else:
+                cls._snapshots.move_to_end(key)
+        return stats
+
+    def _cached(self, name, func):
+        if name not in self._results:
+            self._results[name] = func()
+        return self._results[name]
+
+    def _column(self, attr):
+        return [getattr(x, attr, None) for x in self.mitglieder]
+
+    @property
+    def alter(self):
+        """:obj:`list` of :obj:`int`: Age of each member (``-1`` if
+        unknown)"""
+        return self._cached('alter', lambda: alter_am(
+            self._column('geburtsDatum'), self.stichtag))
+
+    @property
+    def altersverteilung(self):
+        """dict: Number of members per age for each tier (``stufe``)"""
+        def compute():
+            result = {}
+            for stufe, alter in zip(self._column('stufe'), self.alter):
+                result.setdefault(stufe, Counter())[alter] += 1
+            return {k: _sorted(v) for k, v in result.items()}
+        return self._cached('altersverteilung', compute)
+
+    @property
+    def geschlechter(self):
+        """dict: Number of members per gender"""
+        return self._cached('geschlechter', lambda: _sorted(
+            Counter(self._column('geschlecht'))))
+
+    @property
+    def mitgliedsdauer(self):
+        """dict: Number of members per full years of membership"""
+        def compute():
+            eintritte = self._column('eintrittsdatum')
+            return _sorted(Counter(alter_am(eintritte, self.stichtag)))
+        return self._cached('mitgliedsdauer', compute)
+
+    @property
+    def eintritte(self):
+        """dict: Number of joins per year"""
+        return self._cached('eintritte', lambda: _sorted(Counter(
+            x.year for x in self._column('eintrittsdatum') if x)))
+
+    @property
+    def austritte(self):
+        """dict: Number of leaves per year"""
+        return self._cached('austritte', lambda: _sorted(Counter(
+            x.year for x in self._column('austrittsDatum') if x)))
+
+    @property
+    def beitragsarten(self):
+        """dict: Number of members per fee type"""
+        return self._cached('beitragsarten', lambda: _sorted(
+            Counter(self._column('beitragsarten'))))
+
+    @property
+    def status(self):
+        """dict: Number of members per membership status"""
+        return self._cached('status', lambda: _sorted(
+            Counter(self._column('status'))))
+
+    def tables(self):
+        """
+        All figures as tables for exporting
+
+        Returns:
+            :class:`~collections.OrderedDict`: Lists of rows (:obj:`dict`)
+            per table name
+        """
+        tables = OrderedDict()
+        tables['altersverteilung'] = [
+            {'stufe': stufe, 'alter': alter, 'anzahl': n}
+            for stufe, counts in self.altersverteilung.items()
+            for alter, n in counts.items()]
+        for name, key in (('geschlechter', 'geschlecht'),
+                          ('mitgliedsdauer', 'jahre'),
+                          ('eintritte', 'jahr'), ('austritte', 'jahr'),
+                          ('beitragsarten', 'beitragsart'),
+                          ('status', 'status')):
+            tables[name] = [{key: k, 'anzahl': n}
+                            for k, n in getattr(self, name).items()]
+        return tables
+
+    def export_csv(self, directory):
+        """
+        Write each table to a |CSV| file
+
+        Args:
+            directory (str): Target directory. It is created if necessary.
+
+        Returns:
+            :obj:`list` of :obj:`str`: The written files
+        """
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for name, rows in self.tables().items():
+            filename = os.path.join(directory, f'{name}.csv')
+            with open(filename, 'w', newline='', encoding='utf-8') as f:
+                if rows:
+                    w = csv.DictWriter(f, list(rows[0]))
+                    w.writeheader()
+                    w.writerows(rows)
+            files.append(filename)
+        return files
+
+    def export_xlsx(self, filename):
+        """
+        Write all tables to an Excel file with one worksheet per table
+
+        Args:
+            filename (str): Target file
+
+        Returns:
+            :class:`~openpyxl.workbook.workbook.Workbook`: The created
+            workbook
+        """
+        from openpyxl import Workbook
+
+        wb = Workbook()
+        wb.remove(wb.active)
+        for name, rows in self.tables().items():
+            ws = wb.create_sheet(name)
+            if rows:
+                ws.append(list(rows[0]))
+                for row in rows:
+                    ws.append(list(row.values()))
+        wb.save(filename)
+        return wb
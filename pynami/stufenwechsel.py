@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Planning of the yearly change of tiers (Stufenwechsel).
+
+Members move to the next tier when they reach its age limit. The
+candidates are computed from a member list (e.g. from
+:meth:`~pynami.nami.NaMi.search_all`) in a single pass over the birth dates.
+If :mod:`numpy` is installed the ages are computed vectorised, otherwise a
+plain loop is used.
+
+Example:
+    .. code-block:: python
+        :caption: All candidates for the Stufenwechsel after the summer camp
+
+        plan = nami.stufenwechsel(datetime.date(2024, 9, 1))
+        for (current, target), candidates in plan.items():
+            print(current.name, '->', target.name if target else '-')
+            for candidate in candidates:
+                print('   ', candidate)
+"""
+import datetime
+
+from .constants import UgId
+
+# numpy is optional and takes a considerable time to import. It is therefore
+# imported inside of the functions which use it.
+
+ALTERSGRENZEN = {UgId.WOE: 10,
+                 UgId.JUFFI: 13,
+                 UgId.PFADI: 16,
+                 UgId.ROVER: 21}
+"""dict: Age at the cut-off date from which a member of a tier is a candidate
+for the next tier"""
+
+NAECHSTE_STUFE = {UgId.WOE: UgId.JUFFI,
+                  UgId.JUFFI: UgId.PFADI,
+                  UgId.PFADI: UgId.ROVER,
+                  UgId.ROVER: None}
+"""dict: Next tier of each tier. Rovers leave the tiers (:data:`None`)."""
+
+STUFEN_NAMEN = {'wölfling': UgId.WOE,
+                'jungpfadfinder': UgId.JUFFI,
+                'pfadfinder': UgId.PFADI,
+                'rover': UgId.ROVER}
+"""dict: Tier of the ``untergliederung`` names used in activities"""
+
+
+class Kandidat:
+    """
+    A member who is due to change the tier
+
+    Args:
+        mitglied (:class:`~.schemas.mgl.SearchMitglied`): The member
+        stufe (:class:`~.constants.UgId`): Current tier
+        ziel (:class:`~.constants.UgId`): Next tier. :data:`None` for rovers
+            who leave the tiers.
+        alter (int): Age at the cut-off date
+    """
+    def __init__(self, mitglied, stufe, ziel, alter):
+        self.mitglied = mitglied
+        self.stufe = stufe
+        self.ziel = ziel
+        self.alter = alter
+
+    def __repr__(self):
+        return f'<Kandidat({self.mitglied.id}, {self.stufe.name} -> ' + \
+            f'{self.ziel.name if self.ziel else None})>'
+
+    def __str__(self):
+        return f'{self.mitglied.nachname}, {self.mitglied.vorname} ' + \
+            f'({self.alter} Jahre)'
+
+
+class StufenwechselPlan(dict):
+    """
+    Candidates grouped by current and next tier
+
+    The keys are tuples of the current and the next
+    :class:`~.constants.UgId`, the values lists of :class:`Kandidat`.
+
+    Args:
+        stichtag (:class:`~datetime.date`): Cut-off date
+    """
+    def __init__(self, stichtag):
+        super().__init__()
+        self.stichtag = stichtag
+        """:class:`~datetime.date`: Cut-off date"""
+
+    def __repr__(self):
+        return f'<StufenwechselPlan({self.stichtag}, ' + \
+            f'{len(self.kandidaten)} Kandidaten)>'
+
+    @property
+    def kandidaten(self):
+        """:obj:`list` of :class:`Kandidat`: All candidates"""
+        return [x for group in self.values() for x in group]
+
+
+def _as_date(value):
+    """Activities use :class:`~datetime.datetime` for their dates"""
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    return value
+
+
+def alter_am(geburtsdaten, stichtag):
+    """
+    Age in full years of many people at a cut-off date
+
+    The dates are encoded as numbers ``YYYYMMDD``. The age is then the
+    difference of these numbers divided by 10000 (rounded down).
+
+    Args:
+        geburtsdaten (:obj:`list` of :class:`~datetime.date`): Birth dates.
+            :data:`None` is allowed.
+        stichtag (:class:`~datetime.date`): Cut-off date
+
+    Returns:
+        :obj:`list` of :obj:`int`: The ages. ``-1`` for missing birth dates.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+    stichtag = stichtag.year * 10000 + stichtag.month * 100 + stichtag.day
+    codes = (-1 if b is None else b.year * 10000 + b.month * 100 + b.day
+             for b in geburtsdaten)
+    if np is None:
+        return [-1 if c < 0 else (stichtag - c) // 10000 for c in codes]
+
+    codes = np.fromiter(codes, dtype=np.int64, count=len(geburtsdaten))
+    return np.where(codes < 0, -1, (stichtag - codes) // 10000).tolist()
+
+
+def _aktuelle_stufe(activities, stichtag):
+    """Tier of the member activity which is active at the cut-off date"""
+    for act in activities:
+        bis = _as_date(act.aktivBis)
+        von = _as_date(act.aktivVon)
+        if (bis is None or bis >= stichtag) and \
+                (von is None or von <= stichtag) and \
+                'mitglied' in (act.taetigkeit or '').lower():
+            stufe = (act.untergliederung or '').split(' ')[0].lower()
+            if stufe in STUFEN_NAMEN:
+                return STUFEN_NAMEN[stufe]
+    return None
+
+
+def plan_stufenwechsel(mitglieder, stichtag=None, altersgrenzen=None,
+                       activities=None):
+    """
+    Compute all candidates for the change of tiers
+
+    Args:
+        mitglieder (:obj:`list` of :class:`~.schemas.mgl.SearchMitglied`):
+            Member snapshot. The attributes ``geburtsDatum`` and
+            ``ersteUntergliederungId`` are used.
+        stichtag (:class:`~datetime.date`, optional): Cut-off date. Defaults
+            to today.
+        altersgrenzen (:obj:`dict`, optional): Age limits per
+            :class:`~.constants.UgId`. Missing tiers are taken from
+            :data:`ALTERSGRENZEN`.
+        activities (:obj:`dict`, optional): Lists of
+            :class:`~.schemas.activity.SearchActivity` per member id. If a
+            member is listed here the current tier is taken from the active
+            member activity instead of ``ersteUntergliederungId``.
+
+    Returns:
+        StufenwechselPlan: The candidates grouped by current and next tier.
+        Within each group they are sorted by age (oldest first).
+    """
+    stichtag = stichtag or datetime.date.today()
+    grenzen = dict(ALTERSGRENZEN)
+    grenzen.update(altersgrenzen or {})
+
+    stufen = []
+    for mgl in mitglieder:
+        if activities is not None and mgl.id in activities:
+            stufe = _aktuelle_stufe(activities[mgl.id], stichtag)
+        else:
+            try:
+                stufe = UgId(getattr(mgl, 'ersteUntergliederungId', None))
+            except ValueError:
+                stufe = None
+        stufen.append(stufe)
+
+    plan = StufenwechselPlan(stichtag)
+    alter = alter_am([getattr(x, 'geburtsDatum', None) for x in mitglieder],
+                     stichtag)
+    for mgl, stufe, jahre in zip(mitglieder, stufen, alter):
+        if stufe in grenzen and jahre >= grenzen[stufe]:
+            ziel = NAECHSTE_STUFE.get(stufe)
+            plan.setdefault((stufe, ziel), []).append(
+                Kandidat(mgl, stufe, ziel, jahre))
+    for group in plan.values():
+        group.sort(key=lambda x: -x.alter)
+    return plan
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+"""
+Index of the activities of many members over time.
+
+Questions like "who was a leader of the Wölflinge on 1 January" need the
+activities of every member. :meth:`~pynami.nami.NaMi.activity_timeline`
+fetches them concurrently once and builds an :class:`ActivityTimeline`
+which answers point-in-time and range queries without further requests.
+Like the :class:`~.hierarchy.Hierarchy` the index can be stored on disk with
+the :mod:`pickle` module.
+
+For each combination of activity and tier the entries are kept sorted by
+their start and by their end date. The number of active entries at a date is
+the number started before minus the number ended before, so counts only need
+two binary searches.
+
+Example:
+    .. code-block:: python
+        :caption: Number of leaders per tier at the beginning of the year
+
+        timeline = nami.activity_timeline(cachefile='timeline.pickle')
+        for ug in timeline.untergliederungen:
+            print(ug, timeline.count(datetime.date(2024, 1, 1),
+                                     taetigkeit='€ LeiterIn',
+                                     untergliederung=ug))
+"""
+import pickle
+import datetime
+from bisect import bisect_left, bisect_right
+
+_OPEN_START = datetime.date.min.toordinal()
+_OPEN_END = datetime.date.max.toordinal()
+
+
+def _ordinal(value, default):
+    """Day number of a date. Activities may use datetimes as well."""
+    if value is None:
+        return default
+    if isinstance(value, datetime.datetime):
+        value = value.date()
+    return value.toordinal()
+
+
+class TimelineEntry:
+    """
+    A single activity of a member
+
+    Args:
+        mglId (int): Member id (not |DPSG| Mitgliedsnummer)
+        activity (:class:`~.schemas.activity.SearchActivity`): The activity
+    """
+    def __init__(self, mglId, activity):
+        self.mglId = mglId
+        """int: Member id"""
+        self.activity = activity
+        """:class:`~.schemas.activity.SearchActivity`: The activity"""
+        self.start = _ordinal(activity.aktivVon, _OPEN_START)
+        self.end = max(self.start, _ordinal(activity.aktivBis, _OPEN_END))
+
+    def __repr__(self):
+        return f'<TimelineEntry({self.mglId}, {self.activity})>'
+
+    @property
+    def taetigkeit(self):
+        """str: Kind of activity"""
+        return self.activity.taetigkeit
+
+    @property
+    def untergliederung(self):
+        """str: Tier or group association"""
+        return self.activity.untergliederung
+
+    def active(self, von, bis=None):
+        """
+        Check if the activity was held at a date or within a period
+
+        Args:
+            von (:class:`~datetime.date`): Date or start of the period
+            bis (:class:`~datetime.date`, optional): End of the period
+                (inclusive). Defaults to ``von``.
+
+        Returns:
+            bool
+        """
+        von = von.toordinal()
+        bis = von if bis is None else bis.toordinal()
+        return self.start <= bis and self.end >= von
+
+
+class _IntervalIndex:
+    """Entries sorted by their start and by their end day"""
+    def __init__(self, entries):
+        self.by_start = sorted(entries, key=lambda x: x.start)
+        self.starts = [x.start for x in self.by_start]
+        self.ends = sorted(x.end for x in entries)
+
+    def count(self, von, bis):
+        # Entries which ended before ``von`` also started before ``bis``
+        return bisect_right(self.starts, bis) - bisect_left(self.ends, von)
+
+    def entries(self, von, bis):
+        return [x for x in self.by_start[:bisect_right(self.starts, bis)]
+                if x.end >= von]
+
+
+class ActivityTimeline:
+    """
+    Interval index of the activities of many members
+
+    Args:
+        activities (dict): Lists of
+            :class:`~.schemas.activity.SearchActivity` per member id
+    """
+    def __init__(self, activities):
+        self.entries = [TimelineEntry(mglId, act)
+                        for mglId, acts in activities.items()
+                        for act in acts]
+        """:obj:`list` of :class:`TimelineEntry`: All activities"""
+        self.members = set(activities)
+        """:obj:`set` of :obj:`int`: Ids of all members in the index, also
+        those without any activity"""
+        self.created = datetime.datetime.now()
+        """:class:`~datetime.datetime`: Time when the index was built"""
+        self._indexes = {}
+
+    def __repr__(self):
+        return f'<ActivityTimeline({len(self)} Tätigkeiten, ' + \
+            f'{len(self.members)} Mitglieder)>'
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def taetigkeiten(self):
+        """:obj:`list` of :obj:`str`: All kinds of activities"""
+        return sorted({x.taetigkeit for x in self.entries if x.taetigkeit})
+
+    @property
+    def untergliederungen(self):
+        """:obj:`list` of :obj:`str`: All tiers"""
+        return sorted({x.untergliederung for x in self.entries
+                       if x.untergliederung})
+
+    def _index(self, taetigkeit, untergliederung):
+        """Index of one activity and tier, built on first use"""
+        key = (taetigkeit, untergliederung)
+        if key not in self._indexes:
+            self._indexes[key] = _IntervalIndex([
+                x for x in self.entries
+                if taetigkeit in (None, x.taetigkeit) and
+                untergliederung in (None, x.untergliederung)])
+        return self._indexes[key]
+
+    def _period(self, von, bis):
+        von = von.toordinal()
+        return von, von if bis is None else bis.toordinal()
+
+    def active(self, von, bis=None, taetigkeit=None, untergliederung=None):
+        """
+        All activities held at a date or at any time within a period
+
+        Args:
+            von (:class:`~datetime.date`): Date or start of the period
+            bis (:class:`~datetime.date`, optional): End of the period
+                (inclusive). Defaults to ``von``.
+            taetigkeit (:obj:`str`, optional): Only this kind of activity,
+                e.g. ``€ LeiterIn``
+            untergliederung (:obj:`str`, optional): Only this tier, e.g.
+                ``Wölfling``
+
+        Returns:
+            :obj:`list` of :class:`TimelineEntry`: Sorted by start date
+        """
+        return self._index(taetigkeit, untergliederung).entries(
+            *self._period(von, bis))
+
+    def count(self, von, bis=None, taetigkeit=None, untergliederung=None):
+        """
+        Number of activities held at a date or within a period
+
+        This does not iterate over the entries. The arguments are the same
+        as for :meth:`active`.
+
+        Returns:
+            int
+        """
+        return self._index(taetigkeit, untergliederung).count(
+            *self._period(von, bis))
+
+    def mitglieder(self, von, bis=None, taetigkeit=None,
+                   untergliederung=None):
+        """
+        Ids of all members holding an activity at a date or within a period
+
+        The arguments are the same as for :meth:`active`.
+
+        Returns:
+            :obj:`set` of :obj:`int`
+        """
+        return {x.mglId for x in self.active(von, bis, taetigkeit,
+                                             untergliederung)}
+
+    def history(self, mglId):
+        """
+        All activities of a member
+
+        Args:
+            mglId (int): Member id (not |DPSG| Mitgliedsnummer)
+
+        Returns:
+            :obj:`list` of :class:`TimelineEntry`: Sorted by start date
+        """
+        return sorted((x for x in self.entries if x.mglId == mglId),
+                      key=lambda x: x.start)
+
+    def save(self, filename):
+        """
+        Store the index on disk
+
+        Args:
+            filename (str): Path of the cache file
+
+        Returns:
+            :data:`None`
+        """
+        with open(filename, 'wb') as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Load an index which was saved with :meth:`save`
+
+        Args:
+            filename (str): Path of the cache file
+
+        Returns:
+            ActivityTimeline
+        """
+        with open(filename, 'rb') as f:
+            return pickle.load(f)
@@ -6,16 +6,11 @@ Some utility functions for user convenience
 import io
 import os
 import csv
-import webbrowser
 import datetime
-from tkinter import Tk
-from tkinter.filedialog import asksaveasfilename
 
-# Third party imports
-from tabulate import tabulate
-from openpyxl import Workbook
-from openpyxl.worksheet.table import Table, TableStyleInfo
-from openpyxl.utils import get_column_letter
+# The following modules are only needed for single functions and take a
+# considerable time to import. Therefore they are imported inside of these
+# functions: webbrowser, tkinter, tabulate, openpyxl
 
 
 def send_emails(mitglieder, to='', method='bcc', email1=True, email2=True,
@@ -41,6 +36,8 @@ def send_emails(mitglieder, to='', method='bcc', email1=True, email2=True,
     Returns:
         str: The mailto link
     """
+    import webbrowser
+
     recipients = []
     if email1:
         recipients += [mgl.email for mgl in mitglieder if mgl.email]
@@ -66,6 +63,8 @@ def tabulate2x(objs, elements=None):
     Returns:
         str: Nicely formatted tabulated output
     """
+    from tabulate import tabulate
+
     return tabulate([x.tabulate(elements=elements) for x in objs],
                     headers='keys')
 
@@ -127,6 +126,10 @@ def export_xlsx(data, attrs=None, includeheader=True, tableName='Tabelle1',
     Returns:
         :class:`~openpyxl.workbook.workbook.Workbook`: The created workbook.
     """
+    from openpyxl import Workbook
+    from openpyxl.worksheet.table import Table, TableStyleInfo
+    from openpyxl.utils import get_column_letter
+
     wb = Workbook()
     if not data:
         return wb
@@ -162,6 +165,8 @@ def export_xlsx(data, attrs=None, includeheader=True, tableName='Tabelle1',
     # Optional saving as file
     if write_to_file:
         if not filepath:
+            from tkinter import Tk
+            from tkinter.filedialog import asksaveasfilename
             Tk().withdraw()
             filepath = asksaveasfilename(filetypes=[('Excel files', '*.xlsx')],
                                          initialdir = os.getcwd(),
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Record and replay the |HTTP| traffic of a :class:`~pynami.nami.NaMi`
+session.
+
+A :class:`RecordingAdapter` passes all requests to the |NAMI| and writes each
+request/response pair to a cassette. A :class:`ReplayAdapter` answers the
+same requests from the cassette without any network access, optionally with
+a simulated latency. This makes it possible to benchmark decoding, exports
+and bulk operations reproducibly.
+
+Cassettes are gzip compressed files with one |JSON| object per line.
+Credentials and cookies are removed before writing with
+:func:`scrub_credentials`. Personal data can be removed with further scrub
+hooks like the ones created by :func:`scrub_fields`.
+
+Example:
+    .. code-block:: python
+        :caption: Record a session once and replay it later
+
+        with RecordingAdapter('search.jsonl.gz') as adapter:
+            with NaMi(config, adapter=adapter) as nami:
+                nami.search_all()
+
+        adapter = ReplayAdapter('search.jsonl.gz', latency=0.2)
+        with NaMi(config, adapter=adapter) as nami:
+            nami.search_all()
+"""
+import re
+import gzip
+import json
+import time
+import base64
+import threading
+from collections import defaultdict, deque
+from urllib.parse import parse_qsl, urlencode
+
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+
+SCRUBBED = '***'
+"""str: Replacement for removed text values"""
+
+SCRUBBED_DATE = '1970-01-01 00:00:00'
+"""str: Replacement for removed dates (in the |NAMI| format)"""
+
+SCRUBBED_EMAIL = 'scrubbed@example.com'
+"""str: Replacement for removed email addresses"""
+
+_nami_date = re.compile(r'\d{4}-\d{2}-\d{2}( \d{2}:\d{2}:\d{2})?')
+
+
+def _placeholder(value):
+    """
+    Replacement of the same type as ``value`` so that scrubbed responses
+    can still be loaded by the schemas
+    """
+    if isinstance(value, bool):
+        return False
+    if isinstance(value, (int, float)):
+        return 0
+    if isinstance(value, str):
+        if _nami_date.fullmatch(value):
+            return SCRUBBED_DATE[:len(value)]
+        if '@' in value:
+            return SCRUBBED_EMAIL
+        return SCRUBBED
+    return type(value)()
+
+
+def scrub_credentials(interaction):
+    """
+    Remove the password and all cookies from an interaction
+
+    This hook is always applied by :class:`RecordingAdapter`.
+
+    Args:
+        interaction (dict): Recorded request/response pair
+
+    Returns:
+        dict: The scrubbed interaction
+    """
+    body = interaction['request'].get('body')
+    if body and 'password=' in body:
+        interaction['request']['body'] = urlencode(
+            [(k, SCRUBBED if k == 'password' else v)
+             for k, v in parse_qsl(body, keep_blank_values=True)])
+    for part in ('request', 'response'):
+        headers = interaction[part]['headers']
+        for name in list(headers):
+            if name.lower() in ('cookie', 'set-cookie'):
+                del headers[name]
+    return interaction
+
+
+def scrub_fields(*names):
+    """
+    Create a scrub hook which replaces the values of |JSON| attributes in all
+    response bodies
+
+    The replacements keep the type of the values: dates become
+    :data:`SCRUBBED_DATE`, email addresses :data:`SCRUBBED_EMAIL`, other
+    texts :data:`SCRUBBED`, numbers ``0`` and booleans :data:`False`. Empty
+    values are kept.
+
+    Example:
+        .. code-block:: python
+
+            scrub = scrub_fields('entries_email', 'entries_telefon1',
+                                 'entries_geburtsDatum', 'email', 'strasse')
+            adapter = RecordingAdapter('cassette.jsonl.gz', scrub=[scrub])
+
+    Args:
+        *names (str): Attribute names as they appear in the responses, e.g.
+            ``entries_geburtsDatum`` in search results or ``geburtsDatum`` in
+            a single member
+
+    Returns:
+        callable: The scrub hook
+    """
+    names = set(names)
+
+    def scrub(value):
+        if isinstance(value, dict):
+            return {k: (_placeholder(v) if k in names and v not in (None, '')
+                        else scrub(v)) for k, v in value.items()}
+        if isinstance(value, list):
+            return [scrub(x) for x in value]
+        return value
+
+    def hook(interaction):
+        response = interaction['response']
+        if response.get('text'):
+            try:
+                data = json.loads(response['text'])
+            except ValueError:
+                return interaction
+            response['text'] = json.dumps(scrub(data), separators=(',', ':'))
+        return interaction
+
+    return hook
+
+
+def _request_key(method, url):
+    """Requests are matched by their method and |URL| including the query"""
+    return f'{method.upper()} {url}'
+
+
+class Cassette:
+    """
+    Ordered list of recorded request/response pairs
+
+    Args:
+        filename (str): Path of the cassette file
+    """
+    def __init__(self, filename):
+        self.filename = filename
+        self.interactions = []
+        """:obj:`list` of :obj:`dict`: Recorded request/response pairs"""
+
+    def __repr__(self):
+        return f'<Cassette({self.filename}, {len(self)} interactions)>'
+
+    def __len__(self):
+        return len(self.interactions)
+
+    @classmethod
+    def load(cls, filename):
+        """
+        Read a cassette from disk
+
+        Args:
+            filename (str): Path of the cassette file
+
+        Returns:
+            Cassette
+        """
+        cassette = cls(filename)
+        with gzip.open(filename, 'rt', encoding='utf-8') as f:
+            cassette.interactions = [json.loads(line) for line in f if line]
+        return cassette
+
+    def save(self):
+        """
+        Write the cassette to disk
+
+        Returns:
+            :data:`None`
+        """
+        with gzip.open(self.filename, 'wt', encoding='utf-8') as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, separators=(',', ':')) + '\n')
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport adapter which sends all requests and records them in a
+    :class:`Cassette`
+
+    The cassette is written when the adapter is closed, e.g. at the end of a
+    ``with`` block.
+
+    Args:
+        filename (str): Path of the cassette file
+        scrub (:obj:`list` of :obj:`callable`, optional): Hooks which take a
+            recorded interaction and return it without sensitive data.
+            :func:`scrub_credentials` is always applied first.
+    """
+    def __init__(self, filename, scrub=None, **kwargs):
+        super().__init__(**kwargs)
+        self.cassette = Cassette(filename)
+        self.scrub = [scrub_credentials] + list(scrub or [])
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.close()
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+        body = request.body
+        if isinstance(body, bytes):
+            body = body.decode('utf-8', errors='replace')
+        interaction = {
+            'request': {'method': request.method, 'url': request.url,
+                        'headers': dict(request.headers), 'body': body},
+            'response': {'status': response.status_code,
+                         'reason': response.reason,
+                         'headers': dict(response.headers),
+                         'elapsed': response.elapsed.total_seconds()}}
+        content = response.content
+        try:
+            interaction['response']['text'] = content.decode('utf-8')
+        except UnicodeDecodeError:
+            interaction['response']['base64'] = \
+                base64.b64encode(content).decode('ascii')
+        for hook in self.scrub:
+            interaction = hook(interaction)
+        with self._lock:
+            self.cassette.interactions.append(interaction)
+        return response
+
+    def close(self):
+        with self._lock:
+            self.cassette.save()
+        super().close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter which answers all requests from a :class:`Cassette`
+
+    Requests are matched by method and |URL|. If the same request was
+    recorded several times the answers are given in the recorded order; the
+    last one is repeated afterwards.
+
+    Args:
+        filename (str): Path of the cassette file
+        latency (:obj:`float` or :obj:`str`, optional): Simulated delay of
+            each answer in seconds. ``'recorded'`` uses the delays measured
+            while recording. Defaults to no delay.
+
+    Raises:
+        LookupError: When a request was not recorded
+    """
+    def __init__(self, filename, latency=None):
+        super().__init__()
+        self.cassette = Cassette.load(filename)
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._queues = defaultdict(deque)
+        for interaction in self.cassette.interactions:
+            request = interaction['request']
+            key = _request_key(request['method'], request['url'])
+            self._queues[key].append(interaction['response'])
+
+    def send(self, request, stream=False, timeout=None, verify=True,
+             cert=None, proxies=None):
+        key = _request_key(request.method, request.url)
+        with self._lock:
+            queue = self._queues.get(key)
+            if not queue:
+                raise LookupError(f'Request not recorded: {key}')
+            recorded = queue.popleft() if len(queue) > 1 else queue[0]
+
+        if self.latency == 'recorded':
+            time.sleep(recorded.get('elapsed', 0))
+        elif self.latency:
+            time.sleep(self.latency)
+
+        response = Response()
+        response.status_code = recorded['status']
+        response.reason = recorded.get('reason')
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response.headers.pop('Content-Encoding', None)
+        if 'base64' in recorded:
+            response._content = base64.b64decode(recorded['base64'])
+        else:
+            response._content = recorded.get('text', '').encode('utf-8')
+        response._content_consumed = True
+        response.headers['Content-Length'] = str(len(response._content))
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        pass
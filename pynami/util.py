@@ -4,20 +4,255 @@ Some utility functions that are used by other classes and methods from this #
 package but not directly connected to the |NAMI|.
 """
 import os
+import re
+import json
+import codecs
 import time
+import functools
 import tempfile as tf
-import subprocess as sp
 from html.parser import HTMLParser
-from tkinter.filedialog import asksaveasfilename
-from tkinter import Tk
 from marshmallow import ValidationError
-from schwifty import IBAN
+
+# Optional fast JSON libraries
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+JSON_DECODE_ERRORS = (json.JSONDecodeError,) if ujson is None else \
+    (json.JSONDecodeError, getattr(ujson, 'JSONDecodeError', ValueError))
+""":obj:`tuple`: Exceptions raised by :func:`json_loads` for invalid
+documents with any of the backends"""
+
+# The following modules are only needed for single functions and take a
+# considerable time to import (or are not installed at all on some systems).
+# Therefore they are imported inside of these functions: subprocess, tkinter,
+# schwifty
+
+
+def json_loads(data):
+    """
+    Decode a |JSON| document.
+
+    :mod:`orjson` or :mod:`ujson` are used if one of them is installed.
+    Otherwise the standard library :mod:`json` module is used. Raw
+    :obj:`bytes` are decoded directly without creating an intermediate
+    :obj:`str` where the backend supports this.
+
+    Args:
+        data (:obj:`bytes` or :obj:`str`): |JSON| document
+
+    Returns:
+        The decoded object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if ujson is not None:
+        return ujson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj):
+    """
+    Encode an object as a compact |JSON| string (no whitespace after
+    separators). See :func:`json_loads` for the used backends.
+
+    Args:
+        obj: Object to encode
+
+    Returns:
+        str: The |JSON| document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    if ujson is not None:
+        return ujson.dumps(obj, ensure_ascii=False,
+                           escape_forward_slashes=False)
+    return json.dumps(obj, separators=(',', ':'))
+
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+_number_chars = frozenset('0123456789.eE+-')
+
+
+def iter_envelope(source, stream_key='data', chunk_size=65536):
+    """
+    Parse a |JSON| object incrementally while it is being received.
+
+    The members of the top-level object are yielded as soon as they are
+    complete. The entries of the array stored under ``stream_key`` are
+    yielded one by one, so the whole document never needs to be in memory.
+    Each value is decoded with :meth:`json.JSONDecoder.raw_decode` as soon as
+    it is complete.
+
+    Args:
+        source: Iterable of :obj:`bytes` chunks, e.g. from
+            :meth:`requests.Response.iter_content`, or a binary file-like
+            object
+        stream_key (:obj:`str`, optional): Member whose array entries are
+            yielded separately. Defaults to ``'data'``.
+        chunk_size (:obj:`int`, optional): Number of bytes read at once from
+            a file-like object. Defaults to 64 KiB.
+
+    Raises:
+        ValueError: If the document is not a valid |JSON| object
+
+    Yields:
+        :obj:`tuple`: ``('member', key, value)`` for a member of the
+        top-level object and ``('item', stream_key, value)`` for each entry
+        of the streamed array
+    """
+    if hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), b'')
+    else:
+        chunks = iter(source)
+    return _scan_envelope(chunks, stream_key)
+
+
+class _Scanner:
+    """Buffer for :func:`_scan_envelope`"""
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def more(self):
+        """Read the next chunk. Returns :data:`False` at the end."""
+        if self.eof:
+            return False
+        chunk = next(self.chunks, None)
+        if chunk is None:
+            self.eof = True
+            self.buf += self.utf8.decode(b'', final=True)
+        elif not chunk:
+            return True
+        else:
+            if self.pos > 65536:
+                self.buf = self.buf[self.pos:]
+                self.pos = 0
+            self.buf += self.utf8.decode(chunk)
+        return True
+
+    def peek(self):
+        """Next character which is not whitespace"""
+        while True:
+            self.pos = _whitespace.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.more():
+                raise ValueError('Incomplete JSON document')
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError(f'Expected one of {chars!r} at position '
+                             f'{self.pos}, got {char!r}')
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Decode the next complete value"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.more():
+                    raise ValueError('Invalid JSON document')
+                continue
+            # A number may continue in the next chunk, e.g. "1" + ".5" or
+            # "2e" + "3". Only accept it once a character follows which
+            # cannot be part of it.
+            if isinstance(value, (int, float)) and \
+                    not isinstance(value, bool) and \
+                    (end == len(self.buf) or self.buf[end] in _number_chars) \
+                    and self.more():
+                continue
+            self.pos = end
+            return value
+
+
+def _scan_envelope(chunks, stream_key):
+    """Generator behind :func:`iter_envelope`"""
+    scanner = _Scanner(chunks)
+    scanner.expect('{')
+    if scanner.peek() == '}':
+        return
+    while True:
+        key = scanner.value()
+        scanner.expect(':')
+        if key == stream_key and scanner.peek() == '[':
+            scanner.pos += 1
+            if scanner.peek() == ']':
+                scanner.pos += 1
+            else:
+                while True:
+                    yield 'item', key, scanner.value()
+                    if scanner.expect(',]') == ']':
+                        break
+        else:
+            yield 'member', key, scanner.value()
+        if scanner.expect(',}') == '}':
+            return
+
+
+def iban_checksum_ok(iban):
+    """
+    Check the mod-97 checksum of an |IBAN| (ISO 7064) without any further
+    validation of the country specific format.
+
+    Args:
+        iban (str): |IBAN| in compact form (upper case, no spaces)
+
+    Returns:
+        bool: If the checksum is correct
+    """
+    if len(iban) < 5 or not iban.isalnum() or not iban.isascii():
+        return False
+    digits = ''.join(str(int(c, 36)) for c in iban[4:] + iban[:4])
+    return int(digits) % 97 == 1
+
+
+@functools.lru_cache(maxsize=4096)
+def _validate_iban_cached(iban):
+    """
+    Validate an |IBAN|. The result is memoised.
+
+    Args:
+        iban (str): |IBAN| in compact form
+
+    Returns:
+        :obj:`tuple`: The compact |IBAN| and :data:`None` or :data:`None` and
+        the error message
+    """
+    if not iban_checksum_ok(iban):
+        return None, f'Invalid IBAN checksum: {iban}'
+    if len(iban) == 22 and iban.startswith('DE') and iban[2:].isdigit():
+        return iban, None
+
+    from schwifty import IBAN
+
+    try:
+        return IBAN(iban).compact, None
+    except ValueError as e:
+        return None, str(e)
 
 
 def validate_iban(value):
     """
     Validate an |IBAN|
 
+    The mod-97 checksum is verified first and well-formed German |IBAN| are
+    accepted without further checks. All other values are checked with
+    :mod:`schwifty`. The results are memoised, so repeated values are cheap.
+
     Args:
         value (str): Value to check. Spaces are allowed.
 
@@ -28,12 +263,18 @@ def validate_iban(value):
         str: The |IBAN| in compact form.
 
     """
-    try:
-        if value != '':
-            return IBAN(value).compact
+    if value == '':
         return value
-    except ValueError as e:
-        raise ValidationError(str(e))
+    if not isinstance(value, str):
+        from schwifty import IBAN
+        try:
+            return IBAN(value).compact
+        except ValueError as e:
+            raise ValidationError(str(e))
+    compact, error = _validate_iban_cached(''.join(value.split()).upper())
+    if error is not None:
+        raise ValidationError(error)
+    return compact
 
 
 class ExtractHrefParser(HTMLParser):
@@ -92,8 +333,12 @@ def open_download_pdf(content, open_file=True, save_file=False, timeout=10,
             file. Defaults to 10 seconds.
         filename (:obj:`str`, optional): Full path to save file
     """
+    import subprocess as sp
+
     if save_file:
         if not filename:
+            from tkinter import Tk
+            from tkinter.filedialog import asksaveasfilename
             Tk().withdraw()
             filename = asksaveasfilename(filetypes=[('pdf files', '*.pdf')],
                                          initialdir = os.getcwd(),
@@ -111,3 +356,51 @@ def open_download_pdf(content, open_file=True, save_file=False, timeout=10,
                     tmpfile.write(content)
                 sp.Popen([tmpfile.name], shell=True)
                 time.sleep(timeout)
+
+
+def safe_filename(name):
+    """
+    Make a string usable as a file name.
+
+    Path separators and other characters which are not allowed in file names
+    on common systems are replaced with an underscore.
+
+    Args:
+        name: Any value that should become a file name
+
+    Returns:
+        str: The cleaned file name
+    """
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', f'{name}').strip('._') or '_'
+
+
+def save_stream(response, filename, chunk_size=65536):
+    """
+    Write the body of a streamed :class:`requests.Response` to a file.
+
+    The data is written in chunks to a temporary file next to the target
+    which is renamed when the download is complete. This way the content is
+    never held completely in memory and interrupted downloads do not leave
+    broken files behind.
+
+    Args:
+        response (:class:`requests.Response`): Response of a request with
+            ``stream=True``
+        filename (str): Full path of the target file
+        chunk_size (:obj:`int`, optional): Number of bytes per chunk
+
+    Returns:
+        int: Number of written bytes
+    """
+    size = 0
+    tmpname = filename + '.part'
+    try:
+        with open(tmpname, 'wb') as f:
+            for chunk in response.iter_content(chunk_size):
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(tmpname, filename)
+    finally:
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+    return size
@@ -21,4 +21,6 @@ setup(name='pynami',
       install_requires=['marshmallow', 'tabulate', 'sphinxcontrib-httpdomain',
                         'sphinx-rtd-theme', 'sphinx-jsonschema', 'schwifty',
                         'openpyxl'],
+      extras_require={'fast': ['orjson'], 'parquet': ['pyarrow']},
+      entry_points={'console_scripts': ['pynami = pynami.cli:main']},
       include_package_data=True)
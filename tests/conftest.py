@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Shared fixtures: synthetic |NAMI| responses without network access
+"""
+import io
+
+import pytest
+from requests.adapters import HTTPAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+
+class NamiServer(dict):
+    """Response bodies per path suffix and the requests received so far"""
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+
+@pytest.fixture
+def nami_server(monkeypatch):
+    """
+    Answer all requests of :class:`~requests.adapters.HTTPAdapter` with the
+    body registered for their path. The body is returned as an unread stream
+    like a real response. Other content types than |JSON| are registered as
+    a tuple ``(content_type, body)``.
+    """
+    bodies = NamiServer()
+
+    def send(adapter, request, stream=False, **kwargs):
+        bodies.requests.append(request)
+        path = request.path_url.split('?')[0]
+        for suffix, body in bodies.items():
+            if path.endswith(suffix):
+                break
+        else:
+            raise LookupError(request.url)
+        content_type = 'application/json'
+        if isinstance(body, tuple):
+            content_type, body = body
+        response = Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.headers = CaseInsensitiveDict({
+            'Content-Type': content_type,
+            'Content-Length': str(len(body))})
+        response.raw = io.BytesIO(body)
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, 'send', send)
+    return bodies
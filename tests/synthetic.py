@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic |NAMI| data shared by the tests and the benchmarks
+"""
+import json
+
+from marshmallow import fields
+
+from pynami.schemas.base import NamiDate, NamiDateTime
+from pynami.schemas.mgl import SearchMitgliedSchema
+
+
+def search_rows(n):
+    """Raw rows of a member search as sent by the |NAMI|"""
+    proto = {}
+    for name, field in SearchMitgliedSchema().fields.items():
+        if isinstance(field, NamiDateTime):
+            value = '2020-01-02 03:04:05'
+        elif isinstance(field, NamiDate):
+            value = '2010-05-06 00:00:00'
+        elif isinstance(field, fields.Integer):
+            value = 1
+        elif isinstance(field, fields.Email):
+            value = 'anna@example.org'
+        elif isinstance(field, fields.String):
+            value = 'x'
+        elif isinstance(field, fields.Boolean):
+            value = False
+        else:
+            value = None
+        proto[field.data_key or name] = value
+    return [dict(proto, id=i, descriptor=f'Mitglied {i}',
+                 entries_vorname=f'Vorname {i}', entries_id=i)
+            for i in range(n)]
+
+
+def envelope(data):
+    """Response body with the member order of the |NAMI|"""
+    return json.dumps({'success': True, 'data': data,
+                       'responseType': 'OK', 'message': None,
+                       'totalEntries': len(data)}).encode('utf-8')
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :class:`pynami.bulk.SingleFlight`
+"""
+import time
+import threading
+
+import pytest
+
+from pynami.bulk import SingleFlight
+
+WAITERS = 4
+
+
+def _coalesced(flight, func):
+    """Run ``func`` in several threads which all wait for the first call"""
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return func()
+
+    results = [None] * (WAITERS + 1)
+    errors = [None] * (WAITERS + 1)
+
+    def run(i):
+        try:
+            results[i] = flight.do('key', slow)
+        except Exception as ex:
+            errors[i] = ex
+
+    threads = [threading.Thread(target=run, args=(i,))
+               for i in range(WAITERS + 1)]
+    threads[0].start()
+    while not calls:
+        time.sleep(0.001)
+    for t in threads[1:]:
+        t.start()
+    while flight._calls['key'].waiters < WAITERS:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    return results, errors
+
+
+def test_distinct_copies():
+    results, errors = _coalesced(SingleFlight(), lambda: {'data': [1, 2]})
+    assert errors == [None] * (WAITERS + 1)
+    assert all(x == {'data': [1, 2]} for x in results)
+    assert len({id(x) for x in results}) == len(results)
+    assert len({id(x['data']) for x in results}) == len(results)
+    results[1]['data'].append(3)
+    assert results[2]['data'] == [1, 2]
+
+
+def test_errors_are_shared():
+    def fail():
+        raise KeyError('missing')
+
+    _, errors = _coalesced(SingleFlight(), fail)
+    assert all(isinstance(x, KeyError) for x in errors)
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+    for i in range(3):
+        assert flight.do('key', lambda: calls.append(i) or i) == i
+    assert calls == [0, 1, 2]
+    with pytest.raises(ZeroDivisionError):
+        flight.do('key', lambda: 1 / 0)
+    assert flight._calls == {}
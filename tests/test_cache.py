@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the caches of :mod:`pynami.cache`
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from pynami import cache as cache_module
+from pynami.cache import MitgliedCache, MemoryBackend, HTTPCache
+
+
+class FakeResponse:
+    def __init__(self, status_code, data=None, etag=None):
+        self.status_code = status_code
+        self.data = data
+        self.headers = {'ETag': etag} if etag else {}
+
+
+class FakeServer:
+    """Answers with 304 if the ETag matches"""
+    def __init__(self):
+        self.data = {'version': 1}
+        self.requests = []
+
+    def send(self, headers):
+        self.requests.append(headers)
+        etag = f'"{self.data["version"]}"'
+        if headers.get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, dict(self.data), etag)
+
+    def fetch(self, cache, urlkey, key='url'):
+        return cache.fetch(key, self.send, lambda r: r.data, urlkey)
+
+
+def _mgl(id_, version=1, updated='2024-01-01 00:00:00'):
+    return SimpleNamespace(id=id_, version=version, lastUpdated=updated)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'time', lambda: now[0])
+    return now
+
+
+def test_copies():
+    cache = MitgliedCache()
+    mgl = _mgl(1)
+    cache.put(mgl)
+    mgl.version = 2
+    cached = cache.get('1')
+    assert cached.version == 1
+    cached.version = 3
+    assert cache.get(1).version == 1
+
+
+def test_ttl(clock):
+    cache = MitgliedCache(ttl=60)
+    cache.put(_mgl(1))
+    clock[0] += 60
+    assert cache.get(1) is not None
+    clock[0] += 1
+    assert cache.get(1) is None
+    assert len(cache) == 0
+    assert cache.stats() == {'entries': 0, 'hits': 1, 'misses': 1,
+                             'hit_ratio': 0.5}
+
+
+def test_lru():
+    cache = MitgliedCache(maxsize=3)
+    for i in range(3):
+        cache.put(_mgl(i))
+    cache.get(0)
+    cache.put(_mgl(3))
+    assert cache.get(1) is None
+    assert [cache.get(i) is not None for i in (0, 2, 3)] == [True] * 3
+    assert len(cache) == 3
+
+
+def test_validate(clock):
+    cache = MitgliedCache(ttl=60)
+    for i in range(4):
+        cache.put(_mgl(i))
+    clock[0] += 50
+    listing = [_mgl(0), _mgl(1, version=2),
+               _mgl(2, updated='2024-02-01 00:00:00'), _mgl(9)]
+    assert cache.validate(listing) == 2
+    assert len(cache) == 2
+    clock[0] += 50
+    # validated entries are fresh again, the unlisted one expired
+    assert cache.get(0) is not None
+    assert cache.get(3) is None
+
+
+def test_save_and_load(tmp_path):
+    filename = str(tmp_path / 'mitglieder.cache')
+    cache = MitgliedCache(filename=filename)
+    cache.put(_mgl(5))
+    cache.save()
+    assert MitgliedCache(filename=filename).get(5).id == 5
+
+
+def test_memory_backend_lru():
+    backend = MemoryBackend(maxsize=2)
+    backend.set('a', 1)
+    backend.set('b', 2)
+    backend.get('a')
+    backend.set('c', 3)
+    assert len(backend) == 2
+    assert backend.get('b') is None
+    assert (backend.get('a'), backend.get('c')) == (1, 3)
+
+
+def test_http_cache_only_policies():
+    server = FakeServer()
+    cache = HTTPCache(policies={'BAUSTEIN': 60})
+    server.fetch(cache, 'GETMGL')
+    server.fetch(cache, 'GETMGL')
+    assert len(cache.backend) == 0
+    assert server.requests == [{}, {}]
+    server.fetch(cache, 'BAUSTEIN')
+    assert server.fetch(cache, 'BAUSTEIN') == {'version': 1}
+    assert len(server.requests) == 3
+    assert cache.stats() == {'hits': 1, 'revalidated': 0, 'misses': 3,
+                             'stores': 1}
+
+
+def test_http_cache_revalidation(clock):
+    server = FakeServer()
+    cache = HTTPCache(policies={'BAUSTEIN': 0})
+    server.fetch(cache, 'BAUSTEIN')
+    clock[0] += 1
+    assert server.fetch(cache, 'BAUSTEIN') == {'version': 1}
+    assert server.requests[-1] == {'If-None-Match': '"1"'}
+    assert cache.stats()['revalidated'] == 1
+
+    # a stale entry replaced by a full response is a miss
+    server.data = {'version': 2}
+    clock[0] += 1
+    assert server.fetch(cache, 'BAUSTEIN') == {'version': 2}
+    assert cache.stats() == {'hits': 0, 'revalidated': 1, 'misses': 2,
+                             'stores': 2}
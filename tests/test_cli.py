@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the command line interface (:mod:`pynami.cli`)
+"""
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from pynami import cli
+
+
+class FakeNaMi:
+    def __init__(self, config, rate_limit=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def history(self, **kwargs):
+        return [SimpleNamespace(id=1, vorname='Anna')]
+
+
+@pytest.mark.parametrize('argv', [
+    ['member', '--all', '--workers', '8', '-q', '--rate-limit', '2'],
+    ['-w', '8', '-q', '--rate-limit', '2', 'member', '--all'],
+    ['-w', '3', 'member', '--all', '-w', '8', '-q', '--rate-limit', '2'],
+    ['--quiet', 'invoices', 'download', 'pdf', '--workers', '8',
+     '--rate-limit', '2'],
+])
+def test_common_options(argv):
+    args = cli.build_parser().parse_args(argv)
+    assert (args.workers, args.quiet, args.rate_limit) == (8, True, 2.0)
+
+
+def test_default_options():
+    args = cli.build_parser().parse_args(['history'])
+    assert (args.workers, args.quiet, args.rate_limit) == (4, False, None)
+    assert args.config
+
+
+def test_parquet_without_pyarrow(monkeypatch, tmp_path, capsys):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    rows = [SimpleNamespace(id=1, vorname='Anna')]
+    with pytest.raises(ImportError, match=r'pynami\[parquet\]'):
+        cli.write_records(rows, 'parquet', str(tmp_path / 'x.parquet'))
+
+    monkeypatch.setattr(cli, 'read_config', lambda filename: {})
+    monkeypatch.setattr(cli, 'NaMi', FakeNaMi)
+    assert cli.main(['-q', 'history', '-o', str(tmp_path / 'x.parquet')]) \
+        == 1
+    assert 'pynami[parquet]' in capsys.readouterr().err
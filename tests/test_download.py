@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the batch downloads of :class:`pynami.nami.NaMi`
+"""
+from types import SimpleNamespace
+
+from pynami.nami import NaMi
+
+PDF = b'%PDF-1.4 invoice'
+INVOICES = [SimpleNamespace(id=1, reNr='R-1'),
+            SimpleNamespace(id=2, reNr='R-2')]
+
+
+def test_existing_files_are_not_requested(nami_server, tmp_path):
+    nami_server['/rechin-for-grpadmin/pdf'] = ('application/pdf', PDF)
+    (tmp_path / 'R-1.pdf').write_bytes(b'old')
+    nami = NaMi({'stammesnummer': 1})
+
+    report = nami.download_invoices(INVOICES, str(tmp_path))
+    assert [x.result['status'] for x in report] == ['skipped', 'downloaded']
+    assert len(nami_server.requests) == 1
+    assert (tmp_path / 'R-1.pdf').read_bytes() == b'old'
+    assert (tmp_path / 'R-2.pdf').read_bytes() == PDF
+
+
+def test_overwrite(nami_server, tmp_path):
+    nami_server['/rechin-for-grpadmin/pdf'] = ('application/pdf', PDF)
+    (tmp_path / 'R-1.pdf').write_bytes(b'old')
+    nami = NaMi({'stammesnummer': 1})
+
+    report = nami.download_invoices(INVOICES, str(tmp_path), overwrite=True)
+    assert [x.result['status'] for x in report] == ['downloaded'] * 2
+    assert len(nami_server.requests) == 2
+    assert (tmp_path / 'R-1.pdf').read_bytes() == PDF
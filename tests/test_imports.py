@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""
+Importing the library must not load the heavy optional dependencies and must
+stay fast.
+
+The time budget is generous so that slow CI machines do not fail the test.
+It catches new expensive imports at module level, the list of heavy modules
+catches the known optional dependencies. Set ``PYNAMI_IMPORT_BUDGET_MS`` to
+tighten or relax it.
+"""
+import os
+import sys
+import subprocess
+
+import pytest
+
+HEAVY = ['openpyxl', 'numpy', 'schwifty', 'tabulate', 'tkinter', 'pyarrow']
+IMPORT_BUDGET_MS = int(os.environ.get('PYNAMI_IMPORT_BUDGET_MS', 1000))
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _loaded(module):
+    code = f'import sys, {module}; ' + \
+        f'print(",".join(m for m in {HEAVY!r} if m in sys.modules))'
+    out = subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stdout
+    return [x for x in out.strip().split(',') if x]
+
+
+@pytest.mark.parametrize('module', ['pynami', 'pynami.nami', 'pynami.util',
+                                    'pynami.tools', 'pynami.cli'])
+def test_no_heavy_imports(module):
+    assert _loaded(module) == []
+
+
+def _import_time(module):
+    """Cumulative import time in milliseconds from ``python -X importtime``"""
+    err = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                          f'import {module}'], cwd=ROOT, check=True,
+                         capture_output=True, text=True).stderr
+    for line in err.splitlines():
+        # import time: self [us] | cumulative | imported package
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module and \
+                not fields[2].startswith('  '):
+            return int(fields[1]) / 1000
+    raise AssertionError(f'{module} missing in importtime output')
+
+
+def test_import_time():
+    # the best of three runs to ignore outliers caused by a cold disk cache
+    elapsed = min(_import_time('pynami.nami') for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS
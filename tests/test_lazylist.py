@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :class:`pynami.schemas.base.LazyList`
+"""
+import pytest
+
+from pynami.schemas.activity import SearchActivitySchema
+from pynami.schemas.base import LazyList
+
+
+def _rows(n):
+    return [{'id': i, 'descriptor': f'Tätigkeit {i}', 'representedClass': '',
+             'entries_taetigkeit': '€ LeiterIn',
+             'entries_untergliederung': 'Wölfling',
+             'entries_aktivVon': '2020-01-01 00:00:00',
+             'entries_aktivBis': ''} for i in range(n)]
+
+
+@pytest.fixture
+def lazy():
+    return LazyList(SearchActivitySchema(), _rows(50))
+
+
+def test_index(lazy):
+    assert lazy[0].id == 0
+    assert lazy[-1].id == 49
+    assert lazy[-50].id == 0
+    assert [x.id for x in lazy[10:13]] == [10, 11, 12]
+
+
+@pytest.mark.parametrize('index', [50, 60, -51, -60, -100])
+def test_index_out_of_range(lazy, index):
+    with pytest.raises(IndexError):
+        lazy[index]
+
+
+def test_iteration_stops(lazy):
+    assert len(list(lazy)) == 50
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the compliance reports (:mod:`pynami.reports`)
+"""
+import sys
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pynami.nami import NaMi
+from pynami.reports import AusbildungsMatrix
+from pynami.schemas.base import BaseModel
+
+AUSBILDUNGEN = {
+    1: [BaseModel(baustein='Baustein 1a', vstgTag=datetime.date(2019, 3, 2)),
+        BaseModel(baustein='Baustein 2b', vstgTag=datetime.date(2020, 5, 1)),
+        BaseModel(baustein='Baustein 2b', vstgTag=datetime.date(2022, 5, 1))],
+    2: [BaseModel(baustein='Baustein 1a', vstgTag=None)],
+    3: [BaseModel(baustein='Baustein 3b', vstgTag=datetime.date(2021, 1, 1))],
+    9: [BaseModel(baustein='Baustein 1b', vstgTag=datetime.date(2021, 1, 1))],
+}
+MITGLIEDER = [BaseModel(id=i, vorname=f'V{i}', nachname=f'N{i}')
+              for i in (1, 2, 3, 4)]
+
+
+class FakeNaMi(NaMi):
+    """Two leaders, one with an inspected certificate"""
+    def __init__(self):
+        super().__init__({'stammesnummer': 1})
+        self.requests = 0
+
+    def search(self, fields=None, **kwargs):
+        self.requests += 1
+        return [BaseModel(id=i, vorname=f'V{i}', nachname=f'N{i}',
+                          geburtsDatum=datetime.date(1990, 1, 1))
+                for i in range(2)]
+
+    def bescheinigungen(self, **kwargs):
+        return [BaseModel(id=10, empfNachname='N0', empfVorname='V0',
+                          empfGebDatum=datetime.datetime(1990, 1, 1))]
+
+    def get_bescheinigung(self, id_):
+        return BaseModel(id=id_,
+                         datumEinsicht=datetime.datetime(2020, 2, 29))
+
+
+def test_fz_status():
+    report = FakeNaMi().fz_status(datetime.date(2024, 6, 1))
+    assert [(x.mitglied.id, x.status) for x in report] == \
+        [(1, 'fehlt'), (0, 'gueltig')]
+    assert report[1].ablauf == datetime.date(2025, 2, 28)
+
+
+def test_fz_status_cache_returns_copies():
+    nami = FakeNaMi()
+    report = nami.fz_status(datetime.date(2024, 6, 1))
+    report.clear()
+    again = nami.fz_status(datetime.date(2024, 6, 1))
+    assert len(again) == 2
+    again[0].status = 'gueltig'
+    assert nami.fz_status(datetime.date(2024, 6, 1))[0].status == 'fehlt'
+    assert again.stichtag == datetime.date(2024, 6, 1)
+    assert nami.requests == 1
+
+
+def test_fz_status_cache_is_bounded():
+    nami = FakeNaMi()
+    for day in range(1, 30):
+        nami.fz_status(datetime.date(2024, 6, day))
+    assert len(nami._reports) == nami.MAX_REPORTS
+    nami.fz_status(datetime.date(2024, 6, 1), ttl=0)
+    assert len(nami._reports) == 1
+
+
+def test_fz_status_cache_is_lru():
+    nami = FakeNaMi()
+    days = [datetime.date(2024, 6, day) for day in range(1, 18)]
+    for day in days[:16]:
+        nami.fz_status(day)
+    nami.fz_status(days[0])
+    nami.fz_status(days[16])
+    assert nami.requests == 17
+    nami.fz_status(days[0])
+    assert nami.requests == 17
+    nami.fz_status(days[1])
+    assert nami.requests == 18
+
+
+def test_fz_status_concurrent():
+    nami = FakeNaMi()
+    days = [datetime.date(2024, 6, day % 20 + 1) for day in range(200)]
+    with ThreadPoolExecutor(8) as pool:
+        reports = list(pool.map(nami.fz_status, days))
+    assert all(len(x) == 2 for x in reports)
+    assert len(nami._reports) == nami.MAX_REPORTS
+
+
+@pytest.fixture(params=['numpy', 'bits'])
+def matrix(request, monkeypatch):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+    else:
+        monkeypatch.setitem(sys.modules, 'numpy', None)
+    matrix = AusbildungsMatrix(AUSBILDUNGEN, MITGLIEDER)
+    assert isinstance(matrix.erledigt, list) == (request.param == 'bits')
+    return matrix
+
+
+def _answers(matrix):
+    queries = [('Baustein 1a',), ('Baustein 1a', '2b'), ('3b',), (),
+               ('Baustein 9',)]
+    return ([matrix.fehlend(*q) for q in queries],
+            [matrix.vollstaendig(*q) for q in queries],
+            matrix.fehlend('1a', mitglieder=[MITGLIEDER[2], 1]),
+            [[matrix.hat(m, b) for b in matrix.bausteine]
+             for m in matrix.mitglieder],
+            matrix.anzahl(), matrix.tabelle())
+
+
+def test_matrix(matrix):
+    assert matrix.bausteine == ['Baustein 1a', 'Baustein 1b', 'Baustein 2b',
+                                'Baustein 3b']
+    assert matrix.fehlend('1a') == [3, 4]
+    assert matrix.vollstaendig('1a', '2b') == [1]
+    assert matrix.fehlend('Baustein 9') == [1, 2, 3, 4]
+    assert matrix.datum(1, '2b') == datetime.date(2022, 5, 1)
+    assert matrix.datum(2, '1a') == datetime.date.min
+    assert matrix.datum(4, '1a') is None
+    assert matrix.anzahl() == {'Baustein 1a': 2, 'Baustein 1b': 0,
+                               'Baustein 2b': 1, 'Baustein 3b': 1}
+    assert matrix.tabelle()[1][:3] == [1, 'N1, V1',
+                                       datetime.date(2019, 3, 2)]
+
+
+def test_matrix_backends_agree(monkeypatch):
+    pytest.importorskip('numpy')
+    dense = AusbildungsMatrix(AUSBILDUNGEN, MITGLIEDER)
+    monkeypatch.setitem(sys.modules, 'numpy', None)
+    bits = AusbildungsMatrix(AUSBILDUNGEN, MITGLIEDER)
+    assert isinstance(bits.erledigt, list)
+    assert not isinstance(dense.erledigt, list)
+    assert _answers(dense) == _answers(bits)
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Baustein 2b', 'Baustein 2b'), ('2b', 'Baustein 2b'),
+    ('baustein 3B', 'Baustein 3b'), ('Baustein 5', 'Baustein 5')])
+def test_baustein(name, expected):
+    assert AusbildungsMatrix(AUSBILDUNGEN).baustein(name) == expected
+
+
+def test_baustein_ambiguous():
+    with pytest.raises(KeyError, match='2 Bausteine'):
+        AusbildungsMatrix(AUSBILDUNGEN).baustein('1')
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the schema base classes (:mod:`pynami.schemas.base`)
+"""
+import datetime
+
+import pytest
+from marshmallow import ValidationError
+
+from pynami.schemas.base import parse_nami_datetime, NamiDateTime
+from pynami.schemas.activity import SearchActivitySchema
+from pynami.schemas.mgl import SearchMitgliedSchema
+
+from synthetic import search_rows
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2020-01-02 03:04:05', datetime.datetime(2020, 1, 2, 3, 4, 5)),
+    ('1999-12-31 23:59:59', datetime.datetime(1999, 12, 31, 23, 59, 59)),
+    ('2020-01-02', datetime.datetime(2020, 1, 2)),
+    ('2020-01-02T03:04:05', datetime.datetime(2020, 1, 2, 3, 4, 5)),
+])
+def test_parse_nami_datetime(value, expected):
+    assert parse_nami_datetime(value) == expected
+
+
+@pytest.mark.parametrize('value', ['2020-13-02 03:04:05', '02.01.2020',
+                                   '2020-01-02 03:04:xx', ''])
+def test_parse_nami_datetime_invalid(value):
+    with pytest.raises(ValueError):
+        parse_nami_datetime(value)
+
+
+def test_parse_nami_datetime_memoised():
+    parse_nami_datetime.cache_clear()
+    for _ in range(4):
+        parse_nami_datetime('2021-06-07 00:00:00')
+    info = parse_nami_datetime.cache_info()
+    assert (info.hits, info.misses) == (3, 1)
+
+
+def test_date_fields():
+    row = {'id': 1, 'descriptor': 'Tätigkeit', 'representedClass': '',
+           'entries_aktivVon': '2020-01-02 03:04:05',
+           'entries_aktivBis': '2021-02-03'}
+    act = SearchActivitySchema().load(row)
+    assert act.aktivVon == datetime.date(2020, 1, 2)
+    assert act.aktivBis == datetime.date(2021, 2, 3)
+    assert NamiDateTime().deserialize('2020-01-02 03:04:05') == \
+        datetime.datetime(2020, 1, 2, 3, 4, 5)
+    with pytest.raises(ValidationError):
+        SearchActivitySchema().load(dict(row, entries_aktivVon='morgen'))
+
+
+def test_projected_fields():
+    schema = SearchMitgliedSchema.projected(['vorname', 'geburtsDatum'])
+    assert set(schema.fields) == {'entries_vorname', 'entries_geburtsDatum',
+                                  'id', 'descriptor', 'representedClass'}
+    mgl = schema.load(search_rows(1)[0])
+    assert mgl.vorname == 'Vorname 0'
+    assert mgl.geburtsDatum == datetime.date(2010, 5, 6)
+    assert not hasattr(mgl, 'nachname')
+
+
+def test_projected_cached():
+    assert SearchMitgliedSchema.projected(['vorname', 'nachname']) is \
+        SearchMitgliedSchema.projected(['nachname', 'vorname'])
+    assert set(SearchMitgliedSchema.projected().fields) == \
+        set(SearchMitgliedSchema().fields)
+
+
+def test_projected_unknown():
+    with pytest.raises(ValueError, match='vornam'):
+        SearchMitgliedSchema.projected(['vornam'])
+    # names of the raw data are no attributes
+    with pytest.raises(ValueError):
+        SearchMitgliedSchema.projected(['entries_vorname'])
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the caching proxy (:mod:`pynami.server`)
+"""
+import json
+import time
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from pynami.nami import NamiHTTPError, NamiResponseSuccessError
+from pynami.schemas.base import BaseModel
+from pynami.server import NamiProxy, ProxyHandler, BadRequest
+
+
+class FakeNaMi:
+    """Counts requests and fails while the session is expired"""
+    def __init__(self):
+        self.requests = 0
+        self.puts = 0
+        self.logins = 0
+        self.expired = False
+        self.histories = 0
+        self.error = None
+
+    def auth(self):
+        self.logins += 1
+        self.expired = False
+
+    def mitglied(self, mglId, method='GET', **kwargs):
+        self.requests += 1
+        if method == 'PUT':
+            self.puts += 1
+        if self.expired:
+            raise NamiHTTPError('HTTP Error. Status Code: 401')
+        if self.error is not None:
+            raise self.error
+        return BaseModel(id=mglId, vorname='Anna')
+
+    def history(self, fields=None):
+        self.histories += 1
+        return [BaseModel(id=1)]
+
+    def search_all(self, **kwargs):
+        self.requests += 1
+        return [BaseModel(id=1, vorname='Anna')]
+
+
+@pytest.fixture
+def server():
+    """The service on a free port, answering with a :class:`FakeNaMi`"""
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), ProxyHandler)
+    httpd.proxy = NamiProxy(FakeNaMi())
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_reauthenticates_expired_session():
+    nami = FakeNaMi()
+    proxy = NamiProxy(nami)
+    nami.expired = True
+    assert b'Anna' in proxy.get('/mitglieder/1')
+    assert nami.logins == 1
+
+
+def test_nami_errors_are_not_retried():
+    nami = FakeNaMi()
+    proxy = NamiProxy(nami)
+    nami.error = NamiResponseSuccessError('Keine Berechtigung')
+    with pytest.raises(NamiResponseSuccessError):
+        proxy.get('/mitglieder/1')
+    assert (nami.logins, nami.requests) == (0, 1)
+
+
+def test_unknown_fields():
+    nami = FakeNaMi()
+    proxy = NamiProxy(nami)
+    with pytest.raises(BadRequest, match='nachnahme'):
+        proxy.get('/mitglieder', ['vorname', 'nachnahme'])
+    with pytest.raises(BadRequest):
+        proxy.get('/history', ['vorname'])
+    assert (nami.logins, nami.requests, nami.histories) == (0, 0, 0)
+    assert b'Anna' in proxy.get('/mitglieder', ['vorname'])
+
+
+def test_bad_request(server):
+    port = server.server_address[1]
+    for _ in range(3):
+        with pytest.raises(HTTPError) as info:
+            urlopen(f'http://127.0.0.1:{port}/mitglieder?fields=x,vorname')
+        assert info.value.code == 400
+        assert 'x' in json.loads(info.value.read())['message']
+    nami = server.proxy.nami
+    assert (nami.logins, nami.requests) == (0, 0)
+
+
+def test_put_is_not_retried():
+    nami = FakeNaMi()
+    proxy = NamiProxy(nami)
+    original = nami.mitglied
+
+    def expire_on_put(mglId, method='GET', **kwargs):
+        nami.expired = method == 'PUT'
+        return original(mglId, method, **kwargs)
+
+    nami.mitglied = expire_on_put
+    with pytest.raises(NamiHTTPError):
+        proxy.put_mitglied(1, {'vorname': 'Berta'})
+    assert (nami.puts, nami.logins) == (1, 0)
+
+
+def test_cache_is_bounded():
+    nami = FakeNaMi()
+    proxy = NamiProxy(nami, maxsize=3)
+    for mglId in range(10):
+        proxy.get(f'/mitglieder/{mglId}')
+    assert len(proxy._cache) == 3
+    proxy.get('/mitglieder/9')
+    assert nami.requests == 10
+
+
+def test_unused_answers_are_dropped():
+    nami = FakeNaMi()
+    proxy = NamiProxy(nami, ttl=0.05, refresh=0.01)
+    proxy.get('/mitglieder/1')
+    time.sleep(0.1)
+    proxy._refresh_once()
+    assert len(proxy._cache) == 0
+    assert nami.requests == 1
+
+
+def test_put_invalidates_history():
+    nami = FakeNaMi()
+    proxy = NamiProxy(nami)
+    proxy.get('/history')
+    proxy.put_mitglied(1, {'vorname': 'Berta'})
+    proxy.get('/history')
+    assert nami.histories == 2
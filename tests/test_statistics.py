@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :class:`pynami.statistics.GroupStatistics`
+"""
+import os
+import csv
+import datetime
+from collections import OrderedDict
+from types import SimpleNamespace
+
+import pytest
+
+from pynami.statistics import GroupStatistics
+
+STICHTAG = datetime.date(2024, 6, 1)
+
+
+def _mgl(id_, geburt, stufe, geschlecht='weiblich', version=1):
+    return SimpleNamespace(
+        id=id_, version=version, lastUpdated=None,
+        geburtsDatum=geburt, stufe=stufe, geschlecht=geschlecht,
+        eintrittsdatum=datetime.date(2020, 3, 1), austrittsDatum=None,
+        beitragsarten='Voller Beitrag', status='AKTIV')
+
+
+MITGLIEDER = [
+    _mgl(1, datetime.date(2016, 6, 1), 'Wölfling'),
+    _mgl(2, datetime.date(2016, 6, 2), 'Wölfling', 'männlich'),
+    _mgl(3, datetime.date(2015, 1, 1), 'Wölfling'),
+    _mgl(4, datetime.date(2011, 12, 31), 'Jungpfadfinder', 'männlich'),
+    _mgl(5, None, None, None),
+]
+
+
+@pytest.fixture
+def snapshots(monkeypatch):
+    monkeypatch.setattr(GroupStatistics, '_snapshots', OrderedDict())
+    return GroupStatistics._snapshots
+
+
+def test_distributions():
+    stats = GroupStatistics(MITGLIEDER, STICHTAG)
+    assert stats.alter == [8, 7, 9, 12, -1]
+    assert stats.altersverteilung == {'Wölfling': {7: 1, 8: 1, 9: 1},
+                                      'Jungpfadfinder': {12: 1},
+                                      None: {-1: 1}}
+    assert list(stats.altersverteilung['Wölfling']) == [7, 8, 9]
+    assert stats.geschlechter == {'männlich': 2, 'weiblich': 2, None: 1}
+    assert list(stats.geschlechter)[-1] is None
+    assert stats.mitgliedsdauer == {4: 5}
+    assert stats.eintritte == {2020: 5}
+    assert stats.austritte == {}
+
+
+def test_for_snapshot(snapshots):
+    stats = GroupStatistics.for_snapshot(MITGLIEDER, STICHTAG)
+    copies = [SimpleNamespace(**vars(x)) for x in reversed(MITGLIEDER)]
+    assert GroupStatistics.for_snapshot(copies, STICHTAG) is stats
+
+    changed = MITGLIEDER[:-1] + [_mgl(5, None, None, None, version=2)]
+    assert GroupStatistics.for_snapshot(changed, STICHTAG) is not stats
+    assert GroupStatistics.for_snapshot(
+        MITGLIEDER, datetime.date(2025, 1, 1)) is not stats
+
+    for i in range(20):
+        GroupStatistics.for_snapshot(MITGLIEDER[:1], STICHTAG +
+                                     datetime.timedelta(days=i))
+    assert len(snapshots) == GroupStatistics.maxsnapshots == 8
+    assert GroupStatistics.for_snapshot(MITGLIEDER, STICHTAG) is not stats
+
+
+def test_export_csv(tmp_path):
+    stats = GroupStatistics(MITGLIEDER, STICHTAG)
+    files = stats.export_csv(str(tmp_path / 'statistik'))
+    assert [os.path.basename(x) for x in files] == [
+        'altersverteilung.csv', 'geschlechter.csv', 'mitgliedsdauer.csv',
+        'eintritte.csv', 'austritte.csv', 'beitragsarten.csv', 'status.csv']
+    with open(files[0], newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert rows[0] == {'stufe': 'Wölfling', 'alter': '7', 'anzahl': '1'}
+    assert len(rows) == 5
+    with open(files[4], encoding='utf-8') as f:
+        assert f.read() == ''
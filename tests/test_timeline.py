@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the activity index (:mod:`pynami.timeline`)
+"""
+import datetime
+
+from pynami.nami import NaMi
+from pynami.schemas.base import BaseModel
+
+
+class FakeNaMi(NaMi):
+    """Every member has one leader activity in 2020"""
+    def __init__(self):
+        super().__init__({'stammesnummer': 1})
+        self.requests = []
+
+    def mgl_activities(self, mgl):
+        self.requests.append(mgl)
+        return [BaseModel(id=mgl, taetigkeit='€ LeiterIn',
+                          untergliederung='Wölfling',
+                          aktivVon=datetime.date(2020, 1, 1),
+                          aktivBis=datetime.date(2020, 12, 31))]
+
+
+def test_queries():
+    timeline = FakeNaMi().activity_timeline([1, 2, 3])
+    assert timeline.count(datetime.date(2020, 6, 1)) == 3
+    assert timeline.count(datetime.date(2021, 6, 1)) == 0
+    assert timeline.mitglieder(datetime.date(2019, 1, 1),
+                               datetime.date(2020, 1, 1)) == {1, 2, 3}
+
+
+def test_cachefile_with_other_members(tmp_path):
+    cachefile = str(tmp_path / 'timeline.pickle')
+    nami = FakeNaMi()
+    nami.activity_timeline([1, 2], cachefile=cachefile)
+    assert nami.activity_timeline([2, 1], cachefile=cachefile).members == \
+        {1, 2}
+    assert nami.requests == [1, 2]
+
+    timeline = nami.activity_timeline([1, 2, 3], cachefile=cachefile)
+    assert timeline.members == {1, 2, 3}
+    assert timeline.count(datetime.date(2020, 6, 1)) == 3
+    assert nami.activity_timeline(cachefile=cachefile).members == {1, 2, 3}
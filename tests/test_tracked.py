@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the change tracking of :class:`pynami.schemas.base.TrackedModel`
+"""
+import json
+import datetime
+
+import pytest
+
+from pynami.nami import NaMi
+from pynami.schemas.mgl import MitgliedSchema
+from pynami.schemas.activity import ActivitySchema
+from pynami.schemas.training import AusbildungSchema
+
+from synthetic import envelope
+
+MITGLIED = {'id': 5, 'vorname': 'Anna', 'nachname': 'Muster',
+            'eintrittsdatum': '2015-01-01 00:00:00',
+            'kontoverbindung': {'id': 7, 'kontoinhaber': 'Anna Muster',
+                                'iban': 'DE89370400440532013000',
+                                'zahlungsKonditionId': 1}}
+ACTIVITY = {'id': 3, 'taetigkeit': '€ LeiterIn', 'untergliederung': 'Wölfling',
+            'aktivVon': '2020-01-01 00:00:00', 'aktivBis': None}
+AUSBILDUNG = {'id': 4, 'baustein': 'Baustein 1a', 'bausteinId': 1,
+              'vstgTag': '2019-03-02 00:00:00', 'vstgName': 'Kurs'}
+
+
+@pytest.fixture
+def nami():
+    return NaMi({'stammesnummer': 1})
+
+
+@pytest.fixture
+def mitglied(nami_server):
+    nami_server['/gruppierung/gruppierung/1/5'] = envelope(MITGLIED)
+    return MitgliedSchema().load(dict(MITGLIED))
+
+
+def test_clean_updates_send_nothing(nami, mitglied, nami_server):
+    activity = ActivitySchema().load(dict(ACTIVITY))
+    ausbildung = AusbildungSchema().load(dict(AUSBILDUNG))
+
+    assert mitglied.update(nami) is mitglied
+    assert nami.update_activity(5, activity) is activity
+    assert nami.update_ausbildung(5, ausbildung) is ausbildung
+    assert nami_server.requests == []
+
+
+def test_nested_change(mitglied):
+    assert mitglied.diff() == {}
+    mitglied.kontoverbindung.kontoinhaber = 'Berta Muster'
+    old, new = mitglied.diff()['kontoverbindung']
+    assert old['kontoinhaber'] == 'Anna Muster'
+    assert new['kontoinhaber'] == 'Berta Muster'
+    assert mitglied.changed == {'kontoverbindung'}
+
+
+def test_dirty_update_sends(nami, mitglied, nami_server):
+    mitglied.nachname = 'Beispiel'
+    mitglied.update(nami)
+    request, = nami_server.requests
+    assert request.method == 'PUT'
+    assert json.loads(request.body)['nachname'] == 'Beispiel'
+
+
+def test_force_sends(nami, mitglied, nami_server):
+    updated = mitglied.update(nami, force=True)
+    assert [x.method for x in nami_server.requests] == ['PUT']
+    assert updated is not mitglied
+    assert updated.eintrittsdatum == datetime.date(2015, 1, 1)
+
+
+def test_force_activity_and_training(nami, nami_server):
+    nami_server['/mitglied/5/3'] = envelope(ACTIVITY)
+    nami_server['/mitglied/5/4'] = envelope(AUSBILDUNG)
+    nami.update_activity(5, ActivitySchema().load(dict(ACTIVITY)), force=True)
+    nami.update_ausbildung(5, AusbildungSchema().load(dict(AUSBILDUNG)),
+                           force=True)
+    assert [x.method for x in nami_server.requests] == ['PUT', 'PUT']
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for recording and replaying sessions (:mod:`pynami.transport`)
+"""
+import datetime
+
+import pytest
+
+from pynami.nami import NaMi
+from pynami.transport import RecordingAdapter, ReplayAdapter, \
+    scrub_fields, SCRUBBED, SCRUBBED_DATE, SCRUBBED_EMAIL
+
+from synthetic import search_rows, envelope
+
+SEARCH = '/filtered-for-navigation/gruppierung/gruppierung/1/flist'
+
+
+def test_record_scrub_replay(nami_server, tmp_path):
+    nami_server[SEARCH] = envelope(search_rows(3))
+    cassette = str(tmp_path / 'search.jsonl.gz')
+    scrub = scrub_fields('entries_geburtsDatum', 'entries_email',
+                         'entries_nachname', 'entries_mitgliedsNummer',
+                         'entries_wiederverwendenFlag')
+
+    with RecordingAdapter(cassette, scrub=[scrub]) as adapter:
+        recorded = NaMi({'stammesnummer': 1}, adapter=adapter).search_all()
+    assert recorded[0].geburtsDatum == datetime.date(2010, 5, 6)
+
+    nami_server.clear()
+    nami = NaMi({'stammesnummer': 1}, adapter=ReplayAdapter(cassette))
+    replayed = nami.search_all()
+    assert [x.id for x in replayed] == [0, 1, 2]
+    assert replayed[0].vorname == 'Vorname 0'
+    assert replayed[0].geburtsDatum == \
+        datetime.datetime.fromisoformat(SCRUBBED_DATE).date()
+    assert replayed[0].email == SCRUBBED_EMAIL
+    assert replayed[0].nachname == SCRUBBED
+    assert replayed[0].mitgliedsNummer == 0
+    assert replayed[0].wiederverwendenFlag is False
+
+
+@pytest.mark.parametrize('options', [{'lazy': True}, {'stream': True}])
+def test_lazy_and_streamed_search(nami_server, tmp_path, options):
+    nami_server[SEARCH] = envelope(search_rows(5))
+    cassette = str(tmp_path / 'search.jsonl.gz')
+
+    with RecordingAdapter(cassette) as adapter:
+        nami = NaMi({'stammesnummer': 1}, adapter=adapter)
+        recorded = [x.id for x in nami.search_all(**options)]
+    assert recorded == [0, 1, 2, 3, 4]
+
+    nami_server.clear()
+    nami = NaMi({'stammesnummer': 1}, adapter=ReplayAdapter(cassette))
+    assert [x.id for x in nami.search_all(**options)] == recorded
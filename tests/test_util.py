@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for :mod:`pynami.util`
+"""
+import io
+import sys
+import json
+
+import pytest
+from marshmallow import ValidationError
+
+from pynami.util import iter_envelope, validate_iban, _validate_iban_cached
+
+DOCUMENTS = [
+    {'data': [2.5]},
+    {'success': True, 'data': [], 'score': 1.5},
+    {'success': True, 'data': [1, -2, 3.25, -4.5e3, 6E-2, 0, 10, True,
+                               False, None],
+     'responseType': 'OK', 'totalEntries': 123456},
+    {'data': [{'id': 17, 'name': 'Wölfling ÄÖÜ €', 'nested': {'x': [1.0]}},
+              {'id': 18, 'name': 'Rover', 'nested': {}}],
+     'message': None, 'ratio': -0.125},
+]
+
+
+def _expected(document):
+    events = []
+    for key, value in document.items():
+        if key == 'data':
+            events.extend(('item', key, x) for x in value)
+        else:
+            events.append(('member', key, value))
+    return events
+
+
+@pytest.mark.parametrize('document', DOCUMENTS)
+@pytest.mark.parametrize('chunk_size', range(1, 9))
+def test_chunk_boundaries(document, chunk_size):
+    body = json.dumps(document, ensure_ascii=False).encode('utf-8')
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)]
+    assert list(iter_envelope(chunks)) == _expected(document)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 65536])
+def test_file_object(chunk_size):
+    document = DOCUMENTS[2]
+    body = io.BytesIO(json.dumps(document).encode('utf-8'))
+    assert list(iter_envelope(body, chunk_size=chunk_size)) == \
+        _expected(document)
+
+
+@pytest.mark.parametrize('body', [b'{"data": [1, 2', b'{"data": [1.]}',
+                                  b'[1, 2]'])
+def test_invalid(body):
+    with pytest.raises(ValueError):
+        list(iter_envelope([body]))
+
+
+@pytest.fixture
+def iban_cache():
+    _validate_iban_cached.cache_clear()
+    yield _validate_iban_cached
+    _validate_iban_cached.cache_clear()
+
+
+def test_iban_fast_path(iban_cache, monkeypatch):
+    # German IBAN with a correct checksum never need schwifty
+    monkeypatch.setitem(sys.modules, 'schwifty', None)
+    assert validate_iban('de89 3704 0044 0532 0130 00') == \
+        'DE89370400440532013000'
+    with pytest.raises(ValidationError, match='checksum'):
+        validate_iban('DE88370400440532013000')
+    with pytest.raises(ImportError):
+        validate_iban('GB82WEST12345698765432')
+
+
+@pytest.mark.parametrize('iban', ['DE89370400440532013000',
+                                  'GB82 WEST 1234 5698 7654 32',
+                                  'FR1420041010050500013M02606'])
+def test_iban_paths_agree(iban_cache, iban):
+    from schwifty import IBAN
+    assert validate_iban(iban) == IBAN(iban).compact
+
+
+def test_iban_generic_path(iban_cache, monkeypatch):
+    # correct checksum but too short for Germany, so schwifty decides
+    with pytest.raises(ValidationError):
+        validate_iban('DE41370400440532013')
+    iban_cache.cache_clear()
+    monkeypatch.setitem(sys.modules, 'schwifty', None)
+    with pytest.raises(ImportError):
+        validate_iban('DE41370400440532013')
+
+
+def test_iban_memoised(iban_cache):
+    for _ in range(3):
+        validate_iban('DE89370400440532013000')
+    assert iban_cache.cache_info().hits == 2
+    assert iban_cache.cache_info().misses == 1